@@ -0,0 +1,71 @@
+"""
+Measure the event loop latency while a large configuration file is lazily loaded, with a regular loader called on
+the event loop and with `Configurations.aget_config`.
+
+The file is TOML, parsed in Python code: the executor thread releases the GIL regularly, so the event loop keeps
+running. A parser that holds the GIL for the whole parse (e.g. the C JSON decoder) still stalls the loop.
+
+Usage: python -m benchmarks.bench_async_latency [entries]
+"""
+import asyncio
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gemtoolsconfig import Configurations, AsyncConfigurationLoader, preset_file_loader
+
+TICK = 0.001
+
+
+async def measure(load) -> float:
+    """
+    Run a load while a ticker measures the worst delay of the event loop.
+    """
+    worst = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal worst
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            worst = max(worst, time.perf_counter() - start - TICK)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK * 10)
+    await load()
+    running = False
+    await task
+    return worst
+
+
+async def main(entries: int = 50_000):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        lines = (f'[section{index}]\nname = "value{index}"\nenabled = true\n' for index in range(entries))
+        (directory / 'config.toml').write_text(''.join(lines))
+
+        Configurations.clear()
+        Configurations.add_loader(preset_file_loader(directory))
+
+        async def blocking_load():
+            Configurations.get_config()
+
+        print(f'blocking get_config: worst loop delay {await measure(blocking_load) * 1000:.1f} ms')
+
+        Configurations.clear()
+        Configurations.add_loader(AsyncConfigurationLoader.from_loader(preset_file_loader(directory)))
+
+        async def async_load():
+            await Configurations.aget_config()
+
+        print(f'aget_config:         worst loop delay {await measure(async_load) * 1000:.1f} ms')
+    finally:
+        Configurations.clear()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    asyncio.run(main(*(int(argument) for argument in sys.argv[1:])))
@@ -0,0 +1,41 @@
+"""
+Compare the parsing time of each installed backend, per format, on the same generated configuration.
+
+The gemtoolsio backend is the parser used before the backend registry. Each backend parses the UTF-8 bytes of the
+document, as the file handler does; the best of the runs is reported.
+
+Usage: python -m benchmarks.bench_backends [size_kb] [runs]
+"""
+import sys
+import time
+
+from gemtoolsconfig.backends import GEMTOOLSIO, get_backends, get_parser
+
+from . import generators
+
+
+def measure(parser, data: bytes, runs: int) -> float:
+    """
+    Parse the document `runs` times and return the best duration, in seconds.
+    """
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        parser(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(size_kb: int = 512, runs: int = 5):
+    config = generators.sized(size_kb * 1024)
+    for file_format in ('.json', '.toml', '.yaml'):
+        data = generators.dumps(config, file_format).encode()
+        print(f'{file_format} ({len(data) / 1024:.0f} KB)')
+        names = get_backends(file_format)
+        timings = {name: measure(get_parser(file_format, {file_format: name}), data, runs) for name in names}
+        for name, elapsed in timings.items():
+            print(f'  {name:<12} {elapsed * 1000:10.2f} ms {timings[GEMTOOLSIO] / elapsed:8.1f}x')
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,79 @@
+"""
+Compare binding configurations to dataclasses with the cached converters of `bind` and with a naive recursive
+binding, that inspects the schema on every call.
+
+Usage: python -m benchmarks.bench_binding [servers] [binds]
+"""
+import dataclasses
+import sys
+import time
+import typing
+from typing import NamedTuple, Optional
+
+from gemtoolsconfig import bind
+
+
+class Server(NamedTuple):
+    host: str
+    port: int = 80
+    weight: float = 1.0
+
+
+@dataclasses.dataclass(frozen=True)
+class Debug:
+    __slots__ = ('enabled', 'level')
+    enabled: bool
+    level: str
+
+
+@dataclasses.dataclass(frozen=True)
+class Settings:
+    name: str
+    debug: Debug
+    servers: list[Server]
+    limits: dict[str, int]
+    owner: Optional[str] = None
+
+
+def naive_bind(value, schema):
+    """
+    Bind a value by inspecting its schema each time.
+    """
+    origin = typing.get_origin(schema)
+    if origin is typing.Union:
+        if value is None:
+            return None
+        schema = [argument for argument in typing.get_args(schema) if argument is not type(None)][0]
+        return naive_bind(value, schema)
+    if origin is list:
+        return [naive_bind(item, typing.get_args(schema)[0]) for item in value]
+    if origin is dict:
+        return {key: naive_bind(item, typing.get_args(schema)[1]) for key, item in value.items()}
+    if dataclasses.is_dataclass(schema) or hasattr(schema, '_fields'):
+        hints = typing.get_type_hints(schema)
+        names = [field.name for field in dataclasses.fields(schema)] if dataclasses.is_dataclass(schema) \
+            else schema._fields
+        return schema(**{name: naive_bind(value[name], hints[name]) for name in names if name in value})
+    if not isinstance(value, schema):
+        raise TypeError(f'Expected {schema.__name__}, got {value!r}')
+    return value
+
+
+def main(server_count: int = 100, bind_count: int = 1000):
+    config = {
+        'name': 'app',
+        'debug': {'enabled': True, 'level': 'info'},
+        'servers': [{'host': f'server{index}', 'port': 8000 + index, 'weight': 0.5} for index in range(server_count)],
+        'limits': {f'limit{index}': index for index in range(20)},
+    }
+    assert naive_bind(config, Settings) == bind(config, Settings)
+    for label, function in (('naive', naive_bind), ('cached converters', bind)):
+        start = time.perf_counter()
+        for _ in range(bind_count):
+            function(config, Settings)
+        elapsed = time.perf_counter() - start
+        print(f'{label:<18} {elapsed / bind_count * 1e6:10.1f} us per bind ({server_count} servers)')
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
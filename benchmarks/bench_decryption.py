@@ -0,0 +1,53 @@
+"""
+Measure a decrypt-heavy startup: lazy loading many encrypted configuration files, unloading them and loading them
+again, with and without a `DecryptionCache`.
+
+Usage: python -m benchmarks.bench_decryption [files] [rounds]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cryptography.fernet import Fernet
+
+from gemtoolsconfig import Configurations, DecryptionCache, preset_file_loader
+
+
+def generate(directory: Path, file_count: int) -> Path:
+    """
+    Write encrypted TOML files and their key.
+    """
+    key = Fernet.generate_key()
+    cipher = Fernet(key)
+    for index in range(file_count):
+        lines = [f'[section{section}]\nname = "value{section}"\nenabled = true\n' for section in range(100)]
+        (directory / f'tenant{index}.toml').write_bytes(cipher.encrypt(''.join(lines).encode()))
+    key_file = directory / 'config.key'
+    key_file.write_bytes(key)
+    return key_file
+
+
+def main(file_count: int = 100, rounds: int = 5):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        key_file = generate(directory, file_count)
+        names = [f'tenant{index}' for index in range(file_count)]
+        for label, decryption_cache in (('no cache', None), ('cache', DecryptionCache(file_count))):
+            Configurations.clear()
+            Configurations.add_loader(preset_file_loader(directory, key_file, decryption_cache=decryption_cache))
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for name in names:
+                    Configurations.get_config(name)
+                for name in names:
+                    Configurations.unload(name)
+            print(f'{label:<9} {time.perf_counter() - start:.3f}s ({file_count} files x {rounds} rounds)')
+    finally:
+        Configurations.clear()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
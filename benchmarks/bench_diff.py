@@ -0,0 +1,81 @@
+"""
+Compare the structural diff of a reloaded configuration, where one value changed, with a naive diff that walks every
+key in Python, and measure the notification of path subscribers.
+
+The reloaded configuration is parsed again, so it shares no object with the previous one. The frozen variant
+is measured without hashes, then with the hashes of both configurations computed: the subtrees that differ are then
+rejected by their hashes.
+
+Usage: python -m benchmarks.bench_diff [size_mb] [subscribers]
+"""
+import json
+import sys
+import time
+from collections.abc import Mapping
+
+from gemtoolsconfig import Configurations, diff_configurations, freeze
+
+from . import generators
+
+
+def naive_diff(old, new, prefix=(), result=None) -> list:
+    """
+    Walk every key of both configurations and return the changed, added and removed paths.
+    """
+    result = [] if result is None else result
+    for key in old.keys() | new.keys():
+        if key not in old or key not in new:
+            result.append(prefix + (key,))
+        elif isinstance(old[key], Mapping) and isinstance(new[key], Mapping):
+            naive_diff(old[key], new[key], prefix + (key,), result)
+        elif old[key] != new[key]:
+            result.append(prefix + (key,))
+    return result
+
+
+def timed(function, *arguments) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = function(*arguments)
+    return time.perf_counter() - start, result
+
+
+def main(size_mb: int = 20, subscribers: int = 100):
+    config = generators.sized(size_mb * 1024 * 1024)
+    text = json.dumps(config)
+    reloaded = json.loads(text)
+    sections = list(reloaded)
+    section = reloaded[sections[len(sections) // 2]]
+    section[next(iter(section))] = 'changed'
+    print(f'{len(sections)} sections, one changed value')
+
+    elapsed, paths = timed(naive_diff, config, reloaded)
+    print(f'naive diff            {elapsed * 1000:9.1f} ms  {paths}')
+    elapsed, diff = timed(diff_configurations, config, reloaded)
+    print(f'diff_configurations   {elapsed * 1000:9.1f} ms  {diff.changed}')
+
+    frozen, frozen_reloaded = freeze(config), freeze(reloaded)
+    elapsed, diff = timed(diff_configurations, frozen, frozen_reloaded)
+    print(f'frozen                {elapsed * 1000:9.1f} ms  {diff.changed}')
+    hash(frozen)
+    hash(frozen_reloaded)
+    elapsed, diff = timed(diff_configurations, frozen, frozen_reloaded)
+    print(f'frozen, hashed        {elapsed * 1000:9.1f} ms  {diff.changed}')
+
+    Configurations.clear()
+    calls = []
+    for index in range(subscribers):
+        name = sections[index * len(sections) // subscribers]
+        Configurations.subscribe('config', f'{name}.{next(iter(config[name]))}',
+                                 lambda *arguments: calls.append(arguments))
+    Configurations.subscribe('config', sections[len(sections) // 2], lambda *arguments: calls.append(arguments))
+    copy = json.loads(text)
+    Configurations.add_config(config)
+    elapsed, _ = timed(Configurations.add_config, copy, 'config', True)
+    print(f'add_config, {subscribers} subscribers, no change  {elapsed * 1000:9.3f} ms, {len(calls)} calls')
+    elapsed, _ = timed(Configurations.add_config, reloaded, 'config', True)
+    print(f'add_config, {subscribers} subscribers, one change {elapsed * 1000:9.3f} ms, {len(calls)} calls')
+    Configurations.clear()
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,56 @@
+"""
+Measure the size of the registry and the hit rate of a multi-tenant service that lazily loads one configuration per
+tenant, without eviction and with eviction policies.
+
+Usage: python -m benchmarks.bench_eviction [tenants] [requests]
+
+The requests follow a Zipf-like distribution: a few tenants are much more active than the others.
+"""
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gemtoolsconfig import Configurations, EvictionPolicy, preset_file_loader
+from gemtoolsconfig.cache import estimate_size
+
+from . import generators
+
+
+def main(tenant_count: int = 5000, request_count: int = 50_000):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        for index in range(tenant_count):
+            generators.write_config(directory, f'tenant{index}', generators.sized(8 * 1024), '.json')
+        weights = [1 / (rank + 1) for rank in range(tenant_count)]
+        requests = random.Random(0).choices([f'tenant{index}' for index in range(tenant_count)], weights,
+                                            k=request_count)
+        tenant_size = estimate_size(preset_file_loader(directory).lazy_load('tenant0'))
+
+        for label, policy in (('no eviction', None),
+                              ('max_entries=500', EvictionPolicy(max_entries=500)),
+                              ('max_bytes=16MB', EvictionPolicy(max_bytes=16 * 1024 * 1024)),
+                              ('ttl=0.5s', EvictionPolicy(ttl=0.5))):
+            Configurations.clear()
+            Configurations.add_loader(preset_file_loader(directory))
+            Configurations.set_eviction_policy(policy)
+            start = time.perf_counter()
+            for name in requests:
+                Configurations.get_config(name)
+            elapsed = time.perf_counter() - start
+            entries = len(Configurations.configurations)
+            line = f'{label:<16} {elapsed:6.2f}s, {entries:5} entries (~{entries * tenant_size / 1024 / 1024:6.1f} MB)'
+            if policy is not None:
+                statistics = policy.statistics()
+                hit_rate = statistics['hits'] / (statistics['hits'] + statistics['misses'])
+                line += f', hit rate {hit_rate:.1%}, {statistics["evictions"]} evictions'
+            print(line)
+    finally:
+        Configurations.clear()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
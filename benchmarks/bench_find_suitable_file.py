@@ -0,0 +1,45 @@
+"""
+Compare the indexed `_find_suitable_file` with a linear scan of `os.listdir` on a large configuration directory.
+
+Usage: python -m benchmarks.bench_find_suitable_file [files] [lookups]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gemtoolsconfig.handlers import _find_suitable_file
+
+
+def linear_find(directory: Path, config_name: str) -> str:
+    """
+    The lookup without index: one listdir and a scan of every file name.
+    """
+    for filename in os.listdir(directory):
+        if filename == config_name or filename.split('.')[0] == config_name:
+            return filename
+    raise FileNotFoundError(config_name)
+
+
+def main(file_count: int = 10_000, lookups: int = 1_000):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        for index in range(file_count):
+            (directory / f'config{index}.toml').touch()
+        os.utime(directory, (time.time() - 60, time.time() - 60))
+        names = [f'config{index * (file_count // lookups)}' for index in range(lookups)]
+
+        for label, find in (('linear', linear_find), ('indexed', _find_suitable_file)):
+            start = time.perf_counter()
+            for name in names:
+                find(directory, name)
+            elapsed = time.perf_counter() - start
+            print(f'{label:<8} {elapsed / lookups * 1e6:10.1f} us/lookup ({file_count} files)')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,53 @@
+"""
+Compare `FrozenConfiguration` with plain dictionaries: memory of many loaded configurations and the time of a deep
+key lookup.
+
+Usage: python -m benchmarks.bench_frozen [configurations] [lookups]
+"""
+import json
+import sys
+import timeit
+import tracemalloc
+
+from gemtoolsconfig.frozen import freeze
+
+
+def generate(index: int) -> str:
+    """
+    A tenant configuration with nested sections.
+    """
+    data = {
+        'tenant': index,
+        'database': {'pool': {'size': 10, 'timeout': 30}, 'host': f'db{index}.local'},
+        'features': {f'feature{feature}': {'enabled': True, 'weight': feature} for feature in range(50)},
+    }
+    return json.dumps(data)
+
+
+def measure_memory(build) -> int:
+    tracemalloc.start()
+    items = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return size
+
+
+def main(count: int = 1_000, lookups: int = 1_000_000):
+    sources = [generate(index) for index in range(count)]
+
+    plain_size = measure_memory(lambda: [json.loads(source) for source in sources])
+    frozen_size = measure_memory(lambda: [freeze(json.loads(source)) for source in sources])
+    print(f'memory plain  {plain_size / 1024 / 1024:8.2f} MiB ({count} configurations)')
+    print(f'memory frozen {frozen_size / 1024 / 1024:8.2f} MiB ({count} configurations)')
+
+    plain = json.loads(sources[0])
+    frozen = freeze(plain)
+    nested = timeit.timeit(lambda: plain['database']['pool']['timeout'], number=lookups)
+    dotted = timeit.timeit(lambda: frozen.get('database.pool.timeout'), number=lookups)
+    print(f'lookup plain  nested indexing {nested / lookups * 1e9:6.1f} ns')
+    print(f'lookup frozen dotted get      {dotted / lookups * 1e9:6.1f} ns')
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
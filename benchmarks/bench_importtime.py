@@ -0,0 +1,51 @@
+"""
+Measure the time of `import gemtoolsconfig` and of a `quick_setup()` on a tiny configuration, in fresh interpreters.
+
+Each run starts a new interpreter, so no module is imported beforehand. The median of the runs is reported, with the
+number of modules imported by the package.
+
+Usage: python -m benchmarks.bench_importtime [runs]
+"""
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPT = '''
+import json, sys, time
+before = len(sys.modules)
+start = time.perf_counter()
+import gemtoolsconfig
+imported = time.perf_counter()
+modules = len(sys.modules) - before
+gemtoolsconfig.quick_setup(sys.argv[1])
+print(json.dumps([imported - start, time.perf_counter() - imported, modules]))
+'''
+
+
+def run(directory: Path) -> list:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    output = subprocess.run([sys.executable, '-c', SCRIPT, str(directory)], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main(runs: int = 20):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        (directory / 'config.toml').write_text('[debug]\nenabled = true\n')
+        results = [run(directory) for _ in range(runs)]
+        import_time = statistics.median(result[0] for result in results)
+        setup_time = statistics.median(result[1] for result in results)
+        print(f'import gemtoolsconfig {import_time * 1000:8.1f} ms, {results[0][2]} modules')
+        print(f'quick_setup()         {setup_time * 1000:8.1f} ms')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,83 @@
+"""
+Measure the memory and the load time of many near-duplicate tenant configurations, without and with an intern table.
+
+Usage: python -m benchmarks.bench_interning [tenants] [size]
+
+Each tenant file holds the same defaults and feature list of about `size` bytes, and a few values of its own: its
+name, its identifier and one overridden value in one of the sections of the defaults.
+"""
+import copy
+import gc
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from gemtoolsconfig import Configurations, InternTable, preset_file_loader
+
+from . import generators
+
+
+def tenant(defaults: dict, index: int) -> dict:
+    data = copy.deepcopy(defaults)
+    sections = data['sections']
+    section = sections[f'section{index % len(sections)}']
+    section[next(iter(section))] = f'tenant{index}'
+    data['name'] = f'tenant{index}'
+    data['id'] = index
+    return data
+
+
+def load(directory: Path, names: list[str], table: InternTable = None) -> float:
+    Configurations.clear()
+    Configurations.add_loader(preset_file_loader(directory))
+    Configurations.set_intern_table(table)
+    gc.collect()
+    start = time.perf_counter()
+    for name in names:
+        Configurations.get_config(name)
+    return time.perf_counter() - start
+
+
+def measure(directory: Path, names: list[str], interned: bool) -> tuple[float, int, InternTable]:
+    """
+    Load the tenants once to time them, then once more to measure the memory they retain, with tracemalloc.
+    """
+    elapsed = load(directory, names, InternTable() if interned else None)
+    table = InternTable() if interned else None
+    tracemalloc.start()
+    load(directory, names, table)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, retained, table
+
+
+def main(tenant_count: int = 1000, size: int = 32 * 1024):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        defaults = {
+            'sections': generators.sized(size),
+            'features': [f'feature{index}' for index in range(100)],
+        }
+        names = [f'tenant{index}' for index in range(tenant_count)]
+        for index, name in enumerate(names):
+            generators.write_config(directory, name, tenant(defaults, index), '.json')
+
+        elapsed, retained, _ = measure(directory, names, False)
+        print(f'{tenant_count} tenants of ~{size // 1024} KB')
+        print(f'plain       {elapsed:6.2f}s, {retained / 1024 / 1024:7.1f} MB retained')
+        elapsed, retained, table = measure(directory, names, True)
+        statistics = table.statistics()
+        print(f'interned    {elapsed:6.2f}s, {retained / 1024 / 1024:7.1f} MB retained, '
+              f'{statistics["entries"]} entries, {statistics["hits"]} hits, '
+              f'{statistics["saved_bytes"] / 1024 / 1024:.1f} MB saved')
+    finally:
+        Configurations.clear()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
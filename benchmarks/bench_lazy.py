@@ -0,0 +1,68 @@
+"""
+Compare the time to the first key and the peak RSS of loading a large JSON file eagerly and lazily.
+
+The first key read is a section at the middle of the file, then one of its values. Each load runs in a fresh
+process, so the peak RSS of a load is not hidden by the previous steps.
+
+Usage: python -m benchmarks.bench_lazy [size_mb]
+"""
+import multiprocessing
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gemtoolsconfig.handlers import KEY_RESULT, get_file_handler
+
+from . import generators
+
+
+def generate(directory: Path, size_mb: int) -> tuple[Path, int]:
+    """
+    Write the large JSON file and return its path and its number of sections.
+    """
+    data = generators.sized(size_mb * 1024 * 1024)
+    return generators.write_config(directory, 'large', data, '.json'), len(data)
+
+
+def measure(directory: Path, lazy: bool, section: str) -> tuple[float, float, float]:
+    """
+    Load the file once, read one value, and return the time to the first key, the time to read every value again
+    and the growth of the peak RSS, in MB.
+    """
+    handler = get_file_handler(directory, lazy=lazy)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    config = handler({'path': 'large.json'})[KEY_RESULT]
+    next(iter(config[section].values()))
+    first_key = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    for values in config.values():
+        for _ in values.values():
+            pass
+    full_walk = time.perf_counter() - start
+    return first_key, full_walk, (after - before) / 1024
+
+
+def main(size_mb: int = 50):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(1) as pool:
+            path, sections = pool.apply(generate, (directory, size_mb))
+        section = f'section{sections // 2}'
+        print(f'{path.name}: {path.stat().st_size / 1024 / 1024:.1f} MB, {sections} sections, reading "{section}"')
+        for label, lazy in (('eager', False), ('lazy', True)):
+            with context.Pool(1) as pool:
+                first_key, full_walk, peak = pool.apply(measure, (directory, lazy, section))
+            print(f'{label:<6} first key {first_key * 1000:9.1f} ms, full walk {full_walk * 1000:9.1f} ms, '
+                  f'{peak:8.1f} MB peak RSS growth')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,48 @@
+"""
+Compare the serial lazy loading of many configuration files with `Configurations.load_many` in thread and process
+modes.
+
+Usage: python -m benchmarks.bench_load_many [files] [workers]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gemtoolsconfig import Configurations, preset_file_loader
+
+
+def generate(directory: Path, file_count: int):
+    """
+    Write YAML tenant files with a few hundred keys each.
+    """
+    for index in range(file_count):
+        lines = [f'tenant: {index}', 'features:']
+        lines += [f'  feature{feature}: {{enabled: true, weight: {feature}}}' for feature in range(300)]
+        (directory / f'tenant{index}.yaml').write_text('\n'.join(lines))
+
+
+def main(file_count: int = 400, workers: int = 8):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        generate(directory, file_count)
+        names = [f'tenant{index}' for index in range(file_count)]
+
+        def run(label: str, load):
+            Configurations.clear()
+            Configurations.add_loader(preset_file_loader(directory))
+            start = time.perf_counter()
+            load()
+            print(f'{label:<8} {time.perf_counter() - start:.3f}s')
+
+        run('serial', lambda: [Configurations.get_config(name) for name in names])
+        run('thread', lambda: Configurations.load_many(names, workers=workers))
+        run('process', lambda: Configurations.load_many(names, workers=workers, mode='process'))
+    finally:
+        Configurations.clear()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""
+Compare the peak RSS and the latency of loading a large JSON file through gemtoolsio and through a memory map.
+
+The file is generated and each load runs in a fresh process, so the peak RSS of a load is not hidden by the previous
+steps (on Linux, a new process starts with the peak RSS of its parent).
+
+Usage: python -m benchmarks.bench_mapped [size_mb]
+"""
+import multiprocessing
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gemtoolsconfig.handlers import get_file_handler
+
+from . import generators
+
+
+def generate(directory: Path, size_mb: int) -> Path:
+    """
+    Write the large JSON file.
+    """
+    return generators.write_config(directory, 'large', generators.sized(size_mb * 1024 * 1024), '.json')
+
+
+def measure(directory: Path, memory_map: bool) -> tuple[float, float]:
+    """
+    Load the file once and return the duration and the growth of the peak RSS, in MB.
+    """
+    handler = get_file_handler(directory, memory_map=memory_map)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    handler({'path': 'large.json'})
+    elapsed = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, (after - before) / 1024
+
+
+def main(size_mb: int = 50):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(1) as pool:
+            path = pool.apply(generate, (directory, size_mb))
+        print(f'{path.name}: {path.stat().st_size / 1024 / 1024:.1f} MB')
+        for label, memory_map in (('gemtoolsio', False), ('memory map', True)):
+            with context.Pool(1) as pool:
+                elapsed, peak = pool.apply(measure, (directory, memory_map))
+            print(f'{label:<12} {elapsed * 1000:10.1f} ms {peak:10.1f} MB peak RSS growth')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,51 @@
+"""
+Compare the incremental re-merge of `ConfigurationMerger` after a small change of one layer with a full merge of
+every layer.
+
+Usage: python -m benchmarks.bench_merge [sections] [keys]
+"""
+import sys
+import time
+
+from gemtoolsconfig.merge import ConfigurationMerger
+
+LAYERS = ['base', 'env', 'host']
+
+
+def generate(layer: str, sections: int, keys: int) -> dict:
+    """
+    A large layer: every section defines some keys, each layer overrides a part of them.
+    """
+    step = LAYERS.index(layer) + 1
+    return {
+        f'section{section}': {f'key{key}': f'{layer}-{key}' for key in range(0, keys, step)}
+        for section in range(sections)
+    }
+
+
+def main(sections: int = 1_000, keys: int = 100):
+    layers = {layer: generate(layer, sections, keys) for layer in LAYERS}
+    merger = ConfigurationMerger(LAYERS)
+    for layer in LAYERS:
+        merger.set_layer(layer, layers[layer])
+
+    changed = {**layers['host'], 'section10': {**layers['host']['section10'], 'key0': 'changed'}}
+
+    start = time.perf_counter()
+    merger.set_layer('host', changed)
+    incremental = time.perf_counter() - start
+
+    full_merger = ConfigurationMerger(LAYERS)
+    for layer in LAYERS:
+        full_merger._layers[layer] = changed if layer == 'host' else layers[layer]
+    start = time.perf_counter()
+    full_merger.merge()
+    full = time.perf_counter() - start
+
+    assert merger.result == full_merger.result
+    print(f'full merge         {full * 1000:8.2f} ms ({sections} sections x {keys} keys x {len(LAYERS)} layers)')
+    print(f'incremental merge  {incremental * 1000:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
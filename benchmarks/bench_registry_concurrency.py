@@ -0,0 +1,53 @@
+"""
+Stress the lazy loading path of `Configurations` with many threads asking for the same configurations at once, and
+check that each configuration is parsed exactly once.
+
+Usage: python -m benchmarks.bench_registry_concurrency [threads] [names]
+"""
+import sys
+import threading
+import time
+from collections import Counter
+
+from gemtoolsconfig import Configurations, ConfigurationLoaderBuilder
+from gemtoolsconfig.handlers import KEY_RESULT
+
+PARSE_TIME = 0.01
+
+
+def main(thread_count: int = 64, name_count: int = 8):
+    parses = Counter()
+
+    def parse(params: dict) -> dict:
+        parses[params['name']] += 1
+        time.sleep(PARSE_TIME)
+        params[KEY_RESULT] = {'name': params['name']}
+        return params
+
+    Configurations.clear()
+    Configurations.add_loader(ConfigurationLoaderBuilder().add_loading_handler(parse).build())
+    names = [f'config{index}' for index in range(name_count)]
+    barrier = threading.Barrier(thread_count)
+
+    def target(index: int):
+        barrier.wait()
+        for offset in range(name_count):
+            Configurations.get_config(names[(index + offset) % name_count])
+        for _ in range(10_000):
+            Configurations.get_config(names[index % name_count])
+
+    threads = [threading.Thread(target=target, args=(index,)) for index in range(thread_count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f'{thread_count} threads, {name_count} names, {elapsed:.3f}s')
+    print(f'parses per name: {dict(parses)}')
+    assert all(count == 1 for count in parses.values()), 'a configuration was parsed more than once'
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
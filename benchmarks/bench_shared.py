@@ -0,0 +1,97 @@
+"""
+Compare the private memory of forked workers that read regular configurations with workers that read the same
+configurations from a shared memory segment.
+
+Usage: python -m benchmarks.bench_shared [workers] [size_mb]
+
+The configurations are loaded in the parent, then each worker either walks every value ("walk"), or reads a few
+values of each configuration ("lookup"), like a server that reads its settings while handling requests. The private
+memory of a worker (Private_Clean + Private_Dirty of
+/proc/self/smaps_rollup) counts the pages it no longer shares with the parent: walking regular objects writes their
+reference counts, so their pages are copied.
+"""
+import gc
+import os
+import sys
+import time
+from collections.abc import Mapping, Sequence
+
+from gemtoolsconfig import Configurations
+
+from . import generators
+
+
+def private_memory() -> int:
+    """
+    The private memory of this process, in bytes.
+    """
+    total = 0
+    with open('/proc/self/smaps_rollup') as file:
+        for line in file:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+def walk(item) -> int:
+    if isinstance(item, Mapping):
+        return sum(walk(value) for value in item.values())
+    if isinstance(item, Sequence) and not isinstance(item, str):
+        return sum(walk(value) for value in item)
+    return 1
+
+
+def lookup(item) -> int:
+    return sum(1 for key in list(item)[::100] for _ in item[key].values())
+
+
+def run(read, workers: int, names: list[str]) -> float:
+    """
+    Fork the workers, let each one read the configurations, and return their mean private memory.
+    """
+    gc.freeze()
+    pipes = []
+    for _ in range(workers):
+        output, write = os.pipe()
+        if os.fork() == 0:
+            os.close(output)
+            before = private_memory()
+            for name in names:
+                read(Configurations.get_config(name))
+            os.write(write, str(private_memory() - before).encode())
+            os._exit(0)  # NOQA
+        os.close(write)
+        pipes.append(output)
+    growths = []
+    for output in pipes:
+        growths.append(int(os.read(output, 64)))
+        os.close(output)
+        os.wait()
+    gc.unfreeze()
+    return sum(growths) / len(growths)
+
+
+def main(workers: int = 32, size_mb: int = 16):
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print('This benchmark requires /proc/self/smaps_rollup (Linux).')
+        return
+    names = [f'service{index}' for index in range(8)]
+    for name in names:
+        Configurations.add_config(generators.sized(size_mb * 1024 * 1024 // len(names)), name)
+
+    for mode in ('regular', 'shared'):
+        if mode == 'shared':
+            start = time.perf_counter()
+            segment = Configurations.share()
+            print(f'share {size_mb} MB of configurations: {time.perf_counter() - start:.3f}s, '
+                  f'{segment.size / 1024 / 1024:.1f} MB segment')
+        for pattern, read in (('walk', walk), ('lookup', lookup)):
+            start = time.perf_counter()
+            growth = run(read, workers, names)
+            print(f'{mode:<8} {pattern:<7} {workers} workers: {growth / 1024 / 1024:8.1f} MB private per worker, '
+                  f'{growth * workers / 1024 / 1024:8.1f} MB in total, {time.perf_counter() - start:.2f}s')
+    Configurations.clear()
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,47 @@
+"""
+Compare the startup cost of lazy loading configurations from TOML and YAML files with loading them from a compiled
+snapshot.
+
+Usage: python -m benchmarks.bench_snapshot [files] [loaded]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gemtoolsconfig import compile_snapshot, preset_file_loader, preset_snapshot_loader
+
+from . import generators
+
+
+def main(file_count: int = 100, loaded_count: int = 20):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        for file_format in ('.toml', '.yaml'):
+            source = directory / file_format[1:]
+            source.mkdir()
+            for index in range(file_count):
+                generators.write_config(source, f'service{index}', generators.sized(64 * 1024), file_format)
+            snapshot = directory / f'{file_format[1:]}.snapshot'
+
+            start = time.perf_counter()
+            compile_snapshot(source, snapshot)
+            print(f'{file_format} compile {file_count} files: {time.perf_counter() - start:.3f}s, '
+                  f'{snapshot.stat().st_size / 1024 / 1024:.1f} MB snapshot')
+
+            names = [f'service{index}' for index in range(0, file_count, file_count // loaded_count)]
+            for label, create in (('files', lambda: preset_file_loader(source)),
+                                  ('snapshot', lambda: preset_snapshot_loader(snapshot))):
+                start = time.perf_counter()
+                loader = create()
+                for name in names:
+                    loader.lazy_load(name)
+                elapsed = time.perf_counter() - start
+                print(f'{file_format} {label:<9} {len(names)} of {file_count}: {elapsed * 1000:8.1f} ms')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
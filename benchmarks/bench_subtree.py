@@ -0,0 +1,56 @@
+"""
+Compare the latency and the peak Python memory of loading one subtree of a large JSON file with the full load of the
+file.
+
+Usage: python -m benchmarks.bench_subtree [size_mb]
+"""
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from gemtoolsconfig.handlers import get_file_handler
+
+from . import generators
+
+
+def measure(handler, params: dict) -> tuple[float, int]:
+    """
+    Run a handler twice and return its duration, measured without tracing, and its peak of traced memory.
+    """
+    start = time.perf_counter()
+    handler(dict(params))
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    handler(dict(params))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(size_mb: int = 50):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        data = {
+            'routing': {region: generators.sized(size_mb * 1024 * 1024 // 4) for region in ('us', 'apac', 'eu')},
+            'features': generators.sized(size_mb * 1024 * 1024 // 4),
+        }
+        data['routing']['eu'] = generators.nested(2, 8)
+        path = generators.write_config(directory, 'routing', data, '.json')
+        del data
+        print(f'{path.name}: {path.stat().st_size / 1024 / 1024:.1f} MB')
+
+        handler = get_file_handler(directory)
+        for label, params in (('full load', {'path': path.name}),
+                              ('subtree routing.eu', {'path': path.name, 'subtree': 'routing.eu'}),
+                              ('subtree features', {'path': path.name, 'subtree': 'features'})):
+            elapsed, peak = measure(handler, params)
+            print(f'{label:<20} {elapsed * 1000:10.1f} ms {peak / 1024 / 1024:10.1f} MB peak')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,94 @@
+"""
+Measure the first request of forked workers, with lazily loaded configurations and with configurations warmed up
+before the fork, and the memory the workers share with their parent.
+
+Usage: python -m benchmarks.bench_warmup [workers] [files]
+
+Each worker reads every configuration once (its first request), then runs a full garbage collection, as a
+long-running worker eventually does. The memory comes from /proc/self/smaps_rollup: the shared part is still backed
+by the pages of the parent, the private part was copied or allocated by the worker.
+"""
+import gc
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gemtoolsconfig import Configurations, preset_file_loader
+
+from . import generators
+
+
+def memory() -> tuple[int, int]:
+    """
+    The shared and the private memory of this process, in bytes.
+    """
+    shared = private = 0
+    with open('/proc/self/smaps_rollup') as file:
+        for line in file:
+            field, value = line.split()[:2]
+            if field in ('Shared_Clean:', 'Shared_Dirty:'):
+                shared += int(value) * 1024
+            elif field in ('Private_Clean:', 'Private_Dirty:'):
+                private += int(value) * 1024
+    return shared, private
+
+
+def run(workers: int, names: list[str]) -> tuple[list[float], list[int], list[int]]:
+    """
+    Fork the workers one after the other, and return their first request latencies and their memory.
+    """
+    latencies, shared, private = [], [], []
+    for _ in range(workers):
+        output, write = os.pipe()
+        if os.fork() == 0:
+            os.close(output)
+            start = time.perf_counter()
+            for name in names:
+                Configurations.get_config(name)
+            latency = time.perf_counter() - start
+            gc.collect()
+            os.write(write, ' '.join(str(value) for value in (latency, *memory())).encode())
+            os._exit(0)  # NOQA
+        os.close(write)
+        with os.fdopen(output) as file:
+            latency, shared_memory, private_memory = file.read().split()
+        os.wait()
+        latencies.append(float(latency))
+        shared.append(int(shared_memory))
+        private.append(int(private_memory))
+    return latencies, shared, private
+
+
+def main(workers: int = 8, file_count: int = 50):
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print('This benchmark requires /proc/self/smaps_rollup (Linux).')
+        return
+    directory = Path(tempfile.mkdtemp())
+    try:
+        for index in range(file_count):
+            generators.write_config(directory, f'service{index}', generators.sized(64 * 1024), '.toml')
+        names = [f'service{index}' for index in range(file_count)]
+
+        for label, warmup, freeze_gc in (('lazy', False, False), ('warmup', True, False),
+                                         ('warmup+freeze', True, True)):
+            Configurations.clear()
+            Configurations.add_loader(preset_file_loader(directory))
+            if warmup:
+                Configurations.warmup(freeze_gc=freeze_gc)
+            latencies, shared, private = run(workers, names)
+            gc.unfreeze()
+            print(f'{label:<14} first request: median {statistics.median(latencies) * 1000:8.2f} ms, '
+                  f'max {max(latencies) * 1000:8.2f} ms; per worker after gc: '
+                  f'{statistics.mean(shared) / 1024 / 1024:6.1f} MB shared, '
+                  f'{statistics.mean(private) / 1024 / 1024:6.1f} MB private')
+    finally:
+        Configurations.clear()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,137 @@
+"""
+Synthetic configuration generators for the benchmarks: nested data of a given shape or size, written in any of the
+supported formats, alone or as a directory of many files.
+"""
+import configparser
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+FORMATS = ['.toml', '.yaml', '.json', '.ini']
+
+SIZES = {
+    'small': 2 * 1024,
+    'medium': 512 * 1024,
+    'large': 8 * 1024 * 1024,
+    'huge': 50 * 1024 * 1024,
+}
+"""
+The approximate serialized sizes of the generated files, in bytes.
+"""
+
+_LEAVES_PER_SECTION = 20
+
+_BYTES_PER_LEAF = 24
+
+
+def leaves(count: int, seed: int = 0) -> dict:
+    """
+    Get a flat dictionary of scalar values of every type shared by the formats.
+    """
+    values = {}
+    for index in range(count):
+        kind = (seed + index) % 4
+        if kind == 0:
+            values[f'name{index}'] = f'value{seed}_{index}'
+        elif kind == 1:
+            values[f'count{index}'] = seed * 1000 + index
+        elif kind == 2:
+            values[f'enabled{index}'] = index % 2 == 0
+        else:
+            values[f'ratio{index}'] = index / 7
+    return values
+
+
+def nested(depth: int, width: int, leaf_count: int = 4) -> dict:
+    """
+    Get a tree of `depth` levels of `width` sections, each section holding `leaf_count` scalar values. A deep tree
+    has a large depth and a small width, a wide tree the opposite.
+    """
+    if depth <= 0:
+        return leaves(leaf_count)
+    return {f'section{index}': nested(depth - 1, width, leaf_count) for index in range(width)} | leaves(leaf_count)
+
+
+def sized(size: int) -> dict:
+    """
+    Get a two-level configuration whose serialized size is about `size` bytes.
+    """
+    sections = max(1, size // (_LEAVES_PER_SECTION * _BYTES_PER_LEAF))
+    return {f'section{index}': leaves(_LEAVES_PER_SECTION, index) for index in range(sections)}
+
+
+def _toml_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, str):
+        return json.dumps(value)
+    return repr(value)
+
+
+def _dump_toml(data: dict, prefix: str, output: io.StringIO):
+    tables = []
+    for key, value in data.items():
+        if isinstance(value, dict):
+            tables.append((key, value))
+        else:
+            output.write(f'{key} = {_toml_value(value)}\n')
+    for key, value in tables:
+        path = f'{prefix}.{key}' if prefix else key
+        output.write(f'\n[{path}]\n')
+        _dump_toml(value, path, output)
+
+
+def dumps(data: dict, file_format: str) -> str:
+    """
+    Serialize a configuration in one of FORMATS. INI files only hold sections of scalar values, so the deeper levels
+    are flattened into dotted section names.
+    """
+    if file_format == '.json':
+        return json.dumps(data, indent=1)
+    if file_format == '.toml':
+        output = io.StringIO()
+        _dump_toml(data, '', output)
+        return output.getvalue()
+    if file_format == '.yaml':
+        import yaml
+        return yaml.safe_dump(data, sort_keys=False)
+    if file_format == '.ini':
+        parser = configparser.ConfigParser(interpolation=None)
+        pending = [('', data)]
+        while pending:
+            prefix, section = pending.pop(0)
+            scalars = {key: str(value) for key, value in section.items() if not isinstance(value, dict)}
+            if scalars:
+                parser[prefix or 'root'] = scalars
+            pending += [(f'{prefix}.{key}' if prefix else key, value)
+                        for key, value in section.items() if isinstance(value, dict)]
+        output = io.StringIO()
+        parser.write(output)
+        return output.getvalue()
+    raise ValueError(f'Unknown format "{file_format}", expected one of {FORMATS}.')
+
+
+def write_config(directory: Path, name: str, data: dict, file_format: str, key: bytes = None) -> Path:
+    """
+    Write a configuration file, encrypted with a Fernet key if one is given.
+    """
+    path = directory / f'{name}{file_format}'
+    content = dumps(data, file_format).encode()
+    if key is not None:
+        from cryptography.fernet import Fernet
+        content = Fernet(key).encrypt(content)
+    path.write_bytes(content)
+    return path
+
+
+def populate(directory: Path, file_count: int, file_format: str = '.toml', data: dict = None) -> list[str]:
+    """
+    Write `file_count` small configuration files in a directory and return their configuration names.
+    """
+    data = leaves(8) if data is None else data
+    content = dumps(data, file_format)
+    names = [f'config{index}' for index in range(file_count)]
+    for name in names:
+        (directory / f'{name}{file_format}').write_text(content)
+    return names
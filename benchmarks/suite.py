@@ -0,0 +1,275 @@
+"""
+The benchmark suite: time the loading, lazy loading, lookup and registry operations on synthetic configurations, save
+the results to JSON and compare them with the results of another commit.
+
+Usage: python -m benchmarks.suite [--full] [--filter TEXT] [--output FILE] [--compare BASELINE] [--threshold RATIO]
+
+Each case is named after its benchmark and parameters (e.g. "parse/.yaml/medium"). The quick profile skips the
+large files and the largest directories; --full runs them too (up to 50 MB files and 10k files per directory).
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from gemtoolsconfig import Configurations, ConfigurationLoaderBuilder, EvictionPolicy, HandlerStatistics, \
+    Instrumentation, preset_file_loader, preset_source_loader
+from gemtoolsconfig.handlers import KEY_RESULT, _find_suitable_file, get_argument_getter
+
+from . import generators
+
+BenchmarkSetup = Callable[..., Callable[[], Any]]
+"""
+A benchmark setup takes a fresh working directory and the parameters of the case, prepares the files and the
+registry, and returns the function to time.
+"""
+
+BENCHMARKS: dict[str, BenchmarkSetup] = {}
+
+FULL_ONLY = {'large', 'huge', 10_000}
+"""
+The parameter values only run by the full profile.
+"""
+
+REPEAT = 5
+
+ENCRYPTED = 'encrypted'
+
+
+def benchmark(name: str, **grid: list) -> Callable[[BenchmarkSetup], BenchmarkSetup]:
+    """
+    Register a benchmark setup once per combination of its parameter values.
+    """
+
+    def decorator(setup: BenchmarkSetup) -> BenchmarkSetup:
+        for values in itertools.product(*grid.values()):
+            case_name = '/'.join([name, *(str(value) for value in values)])
+            BENCHMARKS[case_name] = partial(setup, **dict(zip(grid, values)))
+        return setup
+
+    return decorator
+
+
+def settle(directory: Path):
+    """
+    Age the modification time of a directory, so its file index is not considered racy and is not rebuilt.
+    """
+    past = time.time() - 60
+    os.utime(directory, (past, past))
+
+
+@benchmark('parse', file_format=generators.FORMATS + [ENCRYPTED], size=list(generators.SIZES))
+def bench_parse(directory: Path, file_format: str, size: str) -> Callable[[], Any]:
+    key_file = None
+    key = None
+    if file_format == ENCRYPTED:
+        from cryptography.fernet import Fernet
+        key = Fernet.generate_key()
+        key_file = directory / 'config.key'
+        key_file.write_bytes(key)
+    path = generators.write_config(directory, 'config', generators.sized(generators.SIZES[size]),
+                                   '.toml' if key else file_format, key)
+    loader = preset_file_loader(directory, key_file)
+    return partial(loader.load, path=path.name)
+
+
+@benchmark('shape', file_format=['.json', '.toml'], shape=['deep', 'wide'])
+def bench_shape(directory: Path, file_format: str, shape: str) -> Callable[[], Any]:
+    data = generators.nested(10, 2) if shape == 'deep' else generators.nested(2, 32)
+    path = generators.write_config(directory, 'config', data, file_format)
+    loader = preset_file_loader(directory)
+    return partial(loader.load, path=path.name)
+
+
+@benchmark('load_source', file_format=generators.FORMATS)
+def bench_load_source(directory: Path, file_format: str) -> Callable[[], Any]:
+    text = generators.dumps(generators.sized(generators.SIZES['small']), file_format)
+    loader = preset_source_loader()
+    return partial(loader.load, text=text, format=file_format)
+
+
+@benchmark('pipeline', handlers=[1, 2, 5])
+def bench_pipeline(directory: Path, handlers: int) -> Callable[[], Any]:
+    get_text = get_argument_getter('text')
+    get_format = get_argument_getter('format', '.json', ['.json', '.toml'])
+    result = generators.leaves(8)
+
+    def handler(params: dict) -> dict:
+        params[KEY_RESULT] = (get_text(params), get_format(params)) and result
+        return params
+
+    builder = ConfigurationLoaderBuilder()
+    for _ in range(handlers):
+        builder.add_loading_handler(handler)
+    loader = builder.build()
+    return partial(loader.load, text='{}', format='.json')
+
+
+@benchmark('lazy_load', files=[10, 1_000, 10_000])
+def bench_lazy_load(directory: Path, files: int) -> Callable[[], Any]:
+    names = itertools.cycle(generators.populate(directory, files))
+    settle(directory)
+    loader = preset_file_loader(directory)
+    return lambda: loader.lazy_load(next(names))
+
+
+@benchmark('find_suitable_file', files=[10, 1_000, 10_000])
+def bench_find_suitable_file(directory: Path, files: int) -> Callable[[], Any]:
+    names = itertools.cycle(generators.populate(directory, files))
+    settle(directory)
+    return lambda: _find_suitable_file(directory, next(names))
+
+
+@benchmark('get_config', path=['hit', 'hit_eviction', 'miss', 'miss_cold'])
+def bench_get_config(directory: Path, path: str) -> Callable[[], Any]:
+    generators.populate(directory, 10)
+    settle(directory)
+    Configurations.add_loader(preset_file_loader(directory))
+    if path == 'hit_eviction':
+        Configurations.set_eviction_policy(EvictionPolicy(max_entries=100, ttl=3600))
+    if path.startswith('hit'):
+        Configurations.get_config('config0')
+        return partial(Configurations.get_config, 'config0')
+    if path == 'miss':
+        return partial(Configurations.try_get_config, 'missing')
+
+    def miss_cold():
+        Configurations.missing.clear()
+        return Configurations.try_get_config('missing')
+
+    return miss_cold
+
+
+@benchmark('instrumentation', mode=['disabled', 'statistics'])
+def bench_instrumentation(directory: Path, mode: str) -> Callable[[], Any]:
+    names = itertools.cycle(generators.populate(directory, 10, '.json'))
+    settle(directory)
+    loader = preset_file_loader(directory)
+    if mode == 'statistics':
+        loader.instrumentation = Instrumentation(post_hooks=[HandlerStatistics()])
+    return lambda: loader.lazy_load(next(names))
+
+
+@benchmark('registry', operation=['add_unload', 'is_loaded', 'get_loader'])
+def bench_registry(directory: Path, operation: str) -> Callable[[], Any]:
+    Configurations.add_loader(preset_source_loader())
+    item = generators.leaves(8)
+    if operation == 'is_loaded':
+        Configurations.add_config(item, 'config')
+        return partial(Configurations.is_configuration_loaded, 'config')
+    if operation == 'get_loader':
+        return Configurations.get_loader
+
+    def add_unload():
+        Configurations.add_config(item, 'config')
+        Configurations.unload('config')
+
+    return add_unload
+
+
+def run_case(setup: BenchmarkSetup) -> dict:
+    """
+    Time a benchmark case in a fresh working directory and registry.
+    """
+    directory = Path(tempfile.mkdtemp(prefix='gemtoolsbench'))
+    Configurations.clear()
+    try:
+        function = setup(directory)
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        timings = [elapsed / number for elapsed in timer.repeat(REPEAT, number)]
+    finally:
+        Configurations.clear()
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        'number': number,
+        'repeat': REPEAT,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'stdev': statistics.stdev(timings),
+    }
+
+
+def metadata() -> dict:
+    """
+    Describe the commit and the machine the results come from.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        commit = ''
+    return {
+        'commit': commit.strip() or None,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Print the median time ratio of each case to the baseline and return the cases slower than the threshold.
+    """
+    regressions = []
+    for case_name, result in results.items():
+        reference = baseline.get(case_name)
+        if reference is None:
+            continue
+        ratio = result['median'] / reference['median']
+        flag = ''
+        if ratio > threshold:
+            flag = '  REGRESSION'
+            regressions.append(case_name)
+        print(f'{case_name:<40} {ratio:6.2f}x{flag}')
+    return regressions
+
+
+def main(arguments: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--full', action='store_true', help='also run the large files and directories')
+    parser.add_argument('--filter', default='', help='only run the cases whose name contains this text')
+    parser.add_argument('--output', help='the JSON file where the results are saved')
+    parser.add_argument('--compare', help='a JSON file of previous results to compare with')
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help='the median time ratio above which a case is a regression (default: 1.10)')
+    options = parser.parse_args(arguments)
+
+    results = {}
+    for case_name, setup in BENCHMARKS.items():
+        if options.filter not in case_name:
+            continue
+        if not options.full and FULL_ONLY.intersection(setup.keywords.values()):
+            continue
+        try:
+            results[case_name] = run_case(setup)
+        except ImportError as error:
+            print(f'{case_name:<40} skipped: {error}')
+            continue
+        print(f'{case_name:<40} {results[case_name]["median"] * 1e6:12.2f} us')
+
+    if options.output:
+        Path(options.output).write_text(json.dumps({'metadata': metadata(), 'results': results}, indent=2))
+    if options.compare:
+        baseline = json.loads(Path(options.compare).read_text())['results']
+        print(f'\nMedian time ratio to {options.compare}:')
+        if compare(results, baseline, options.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
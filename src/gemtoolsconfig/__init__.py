@@ -1,8 +1,22 @@
+from .aio import AsyncConfigurationLoader, AsyncConfigurationLoaderBuilder
+from .backends import register_backend, get_backends, get_parser, GEMTOOLSIO_BACKENDS
+from .binding import bind, get_converter
+from .cache import FileCache, NegativeCache, DecryptionCache, EvictionPolicy
 from .configurations import Configurations
+from .diff import ConfigurationDiff, ChangeCallback, diff_configurations
 from .exceptions import ConfigurationLoaderFoundError, ConfigurationNotFoundError, ConfigurationHandlerError, \
-    ArgumentError, ConfigurationLoaderNotFoundError, ConfigurationLoadingError
+    ArgumentError, ConfigurationLoaderNotFoundError, ConfigurationLoadingError, ConfigurationBulkLoadingError, \
+    ConfigurationBindingError
+from .frozen import FrozenConfiguration, freeze, thaw
+from .instrumentation import Instrumentation, HandlerEvent, HandlerStatistics, get_logging_hook, write_prometheus
+from .interning import InternTable
+from .lazy import LazyConfiguration, LazyList
 from .loader import ConfigurationLoader, LoadingHandler, LazyHandler, ConfigurationLoaderBuilder, ConfigurationItem
-from .presets import preset_source_loader, preset_file_loader
+from .merge import ConfigurationMerger, get_merge_handler
+from .presets import preset_source_loader, preset_file_loader, preset_snapshot_loader
+from .reload import ConfigurationWatcher
+from .shared import SharedConfiguration, SharedList, SharedSegment
+from .snapshot import SnapshotReader, compile_snapshot
 
 
 def quick_setup(directory: str = None) -> ConfigurationItem:
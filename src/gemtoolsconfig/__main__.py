@@ -0,0 +1,33 @@
+import argparse
+import sys
+
+from .snapshot import DEFAULT_SNAPSHOT_PATH, compile_snapshot
+
+
+def main(arguments: list[str] = None) -> int:
+    """
+    The command line interface of gemtoolsconfig.
+
+    :param arguments: The command line arguments. Defaults to sys.argv.
+    :type arguments: list[str], optional
+    :return: The exit code.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(prog='python -m gemtoolsconfig')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compile_parser = commands.add_parser('compile', help='compile the configurations of a directory into a snapshot')
+    compile_parser.add_argument('directory', help='the directory of the configuration files')
+    compile_parser.add_argument('-o', '--output', default=DEFAULT_SNAPSHOT_PATH,
+                                help=f'the path of the snapshot file (default: {DEFAULT_SNAPSHOT_PATH})')
+    compile_parser.add_argument('-k', '--key-file', help='the file containing the encryption key of the files')
+
+    options = parser.parse_args(arguments)
+    if options.command == 'compile':
+        names = compile_snapshot(options.directory, options.output, options.key_file)
+        print(f'Compiled {len(names)} configuration(s) into "{options.output}".')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, TYPE_CHECKING, Union
+
+from .exceptions import critical, ArgumentError, ConfigurationHandlerError
+from .handlers import KEY_RESULT
+from .instrumentation import Instrumentation
+from .loader import ConfigurationItem, ConfigurationLoader, ConfigurationLoaderBuilder, NameLister, \
+    validate_parameters
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+AsyncHandler = Callable[[dict], Union[dict, Awaitable[dict]]]
+"""
+An async handler is either a coroutine function that takes and returns the parameters dictionary, or a regular
+loading or lazy handler. Regular handlers are run in an executor, so their blocking work (file reading, decryption,
+parsing) does not stall the event loop.
+"""
+
+
+async def _run_handlers(handlers: list[AsyncHandler], parameters: dict, executor: Executor = None) -> dict:
+    """
+    Run a chain of handlers. Coroutine handlers are awaited, consecutive regular handlers are run together in a
+    single executor job.
+
+    :param handlers: The handlers to run.
+    :type handlers: list[AsyncHandler]
+    :param parameters: The parameters given to the first handler.
+    :type parameters: dict
+    :param executor: The executor of the regular handlers. Defaults to the executor of the event loop.
+    :type executor: Executor, optional
+    :return: The parameters returned by the last handler.
+    :rtype: dict
+    """
+    import inspect
+    blocking = []
+    for handler in handlers:
+        if not inspect.iscoroutinefunction(handler):
+            blocking.append(handler)
+            continue
+        if blocking:
+            parameters = await _run_in_executor(blocking, parameters, executor)
+            blocking = []
+        parameters = await handler(parameters)
+    if blocking:
+        parameters = await _run_in_executor(blocking, parameters, executor)
+    return parameters
+
+
+async def _run_in_executor(handlers: list[AsyncHandler], parameters: dict, executor: Executor = None) -> dict:
+    """
+    Run a chain of regular handlers in an executor.
+
+    :param handlers: The regular handlers to run.
+    :type handlers: list[AsyncHandler]
+    :param parameters: The parameters given to the first handler.
+    :type parameters: dict
+    :param executor: The executor. Defaults to the executor of the event loop.
+    :type executor: Executor, optional
+    :return: The parameters returned by the last handler.
+    :rtype: dict
+    """
+
+    def run() -> dict:
+        result = parameters
+        for handler in handlers:
+            result = handler(result)
+        return result
+
+    import asyncio
+    return await asyncio.get_running_loop().run_in_executor(executor, run)
+
+
+class AsyncConfigurationLoader:
+    """
+    The asyncio counterpart of `ConfigurationLoader`. It accepts coroutine handlers and runs the regular ones in an
+    executor. It does not support instrumentation.
+
+    Its configurations are loaded by `Configurations.aget_config` and `Configurations.aload_config`: the synchronous
+    methods of `Configurations` raise an ArgumentError for an async loader.
+    """
+
+    def __init__(self,
+                 lazy_handlers: list[AsyncHandler],
+                 loading_handlers: list[AsyncHandler],
+                 executor: Executor = None,
+                 frozen: bool = False,
+                 name_lister: NameLister = None
+                 ):
+        """
+        AsyncConfigurationLoader constructor.
+
+        :param lazy_handlers: List of lazy handlers.
+        :type lazy_handlers: list[AsyncHandler]
+        :param loading_handlers: List of loading handlers.
+        :type loading_handlers: list[AsyncHandler]
+        :param executor: The executor of the regular handlers. Defaults to the executor of the event loop.
+        :type executor: Executor, optional
+        :param frozen: Whether the loaded configurations are immutable `FrozenConfiguration` items.
+        :type frozen: bool
+        :param name_lister: The function that lists the configurations of the loader. Defaults to None, the loader
+                            cannot list its configurations.
+        :type name_lister: NameLister, optional
+        """
+        self._loading_handlers = loading_handlers
+        self._lazy_handlers = lazy_handlers
+        self._executor = executor
+        self._frozen = frozen
+        self._name_lister = name_lister
+
+    @classmethod
+    def from_loader(cls, loader: ConfigurationLoader, executor: Executor = None) -> AsyncConfigurationLoader:
+        """
+        Create an async loader with the handlers of a regular loader.
+
+        :param loader: The regular loader.
+        :type loader: ConfigurationLoader
+        :param executor: The executor of the regular handlers. Defaults to the executor of the event loop.
+        :type executor: Executor, optional
+        :return: A new `AsyncConfigurationLoader` instance.
+        :rtype: AsyncConfigurationLoader
+        :raises ArgumentError: If the loader has an instrumentation.
+        """
+        if loader.instrumentation is not None:
+            critical('An AsyncConfigurationLoader does not support instrumentation.', ArgumentError)
+        return cls(list(loader._lazy_handlers), list(loader._loading_handlers), executor, loader._frozen,  # NOQA
+                   loader._name_lister)  # NOQA
+
+    async def load(self, **parameters: Any) -> ConfigurationItem:
+        """
+        Load configuration.
+
+        :param parameters: Configuration parameters.
+        :type parameters: dict
+        :return: ConfigurationItem object.
+        :rtype: ConfigurationItem
+        :raises ConfigurationHandlerError: If the loader is not configured correctly.
+        """
+        return (await self.load_parameters(**parameters))[KEY_RESULT]
+
+    async def load_parameters(self, **parameters: Any) -> dict:
+        """
+        Load configuration and return every parameter produced by the loading handlers.
+
+        :param parameters: Configuration parameters.
+        :type parameters: dict
+        :return: The parameters, with the configuration under the KEY_RESULT key.
+        :rtype: dict
+        :raises ConfigurationHandlerError: If the loader is not configured correctly.
+        """
+        parameters = await _run_handlers(self._loading_handlers, parameters, self._executor)
+        return validate_parameters(parameters, self._frozen)
+
+    async def lazy_load(self, name: str) -> ConfigurationItem:
+        """
+        Lazy load configuration.
+
+        :param name: Configuration name.
+        :type name: str
+        :return: ConfigurationItem object.
+        :rtype: ConfigurationItem
+        """
+        return await self.load(**(await self.lazy_parameters(name)))
+
+    async def lazy_parameters(self, name: str) -> dict:
+        """
+        Run the lazy handlers only, to get the loading parameters of a configuration from its name.
+
+        :param name: Configuration name.
+        :type name: str
+        :return: The parameters to pass to `load`.
+        :rtype: dict
+        """
+        return await _run_handlers(self._lazy_handlers, {'name': name}, self._executor)
+
+    def list_names(self) -> list[str]:
+        """
+        List the names of the configurations this loader can lazy load.
+
+        :return: The configuration names.
+        :rtype: list[str]
+        :raises ConfigurationHandlerError: If the loader has no name lister.
+        """
+        if self._name_lister is None:
+            critical('This loader cannot list its configurations: it has no name lister.', ConfigurationHandlerError)
+        return self._name_lister()
+
+
+class AsyncConfigurationLoaderBuilder(ConfigurationLoaderBuilder):
+    """
+    A builder class for constructing an `AsyncConfigurationLoader` instance.
+    """
+
+    def __init__(self, executor: Executor = None):
+        """
+        Initializes a new instance of the `AsyncConfigurationLoaderBuilder` class.
+
+        :param executor: The executor of the regular handlers. Defaults to the executor of the event loop.
+        :type executor: Executor, optional
+        """
+        super().__init__()
+        self._executor = executor
+
+    def build(self) -> AsyncConfigurationLoader:
+        """
+        Builds a new `AsyncConfigurationLoader` instance based on the current state of the builder. The handlers
+        added to the builder afterwards do not change the built loader.
+
+        :return: A new `AsyncConfigurationLoader` instance.
+        """
+        return AsyncConfigurationLoader(
+            list(self._lazy_handlers),
+            list(self._loading_handlers),
+            self._executor,
+            self._frozen,
+            self._name_lister
+        )
+
+    def set_instrumentation(self, instrumentation: Instrumentation) -> AsyncConfigurationLoaderBuilder:
+        """
+        Instrumentation is not supported by `AsyncConfigurationLoader`.
+
+        :param instrumentation: None.
+        :type instrumentation: Instrumentation
+        :return: The `AsyncConfigurationLoaderBuilder` instance, to allow method chaining.
+        :raises ArgumentError: If the instrumentation is not None.
+        """
+        if instrumentation is not None:
+            critical('An AsyncConfigurationLoader does not support instrumentation.', ArgumentError)
+        return self
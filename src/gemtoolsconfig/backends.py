@@ -0,0 +1,291 @@
+import importlib
+import threading
+from typing import Any, Callable, Union
+
+from .exceptions import critical, ArgumentError
+
+Parser = Callable[[Union[str, bytes, memoryview]], Any]
+"""
+A parser takes the text of a configuration, as a string or as UTF-8 bytes (or a memoryview of them), and returns the
+configuration data.
+"""
+
+ParserFactory = Callable[[str], Parser]
+"""
+A parser factory takes a file format (e.g. ".toml"), imports its parsing library and returns the parser of the
+format. It raises an ImportError when the library is not installed.
+"""
+
+GEMTOOLSIO = 'gemtoolsio'
+"""
+The name of the backend that parses through gemtoolsio. It parses every format gemtoolsio knows, after the other
+backends of the format.
+"""
+
+GEMTOOLSIO_BACKENDS = {'.json': GEMTOOLSIO, '.toml': GEMTOOLSIO, '.yaml': GEMTOOLSIO, '.yml': GEMTOOLSIO}
+"""
+The backends that parse every format with gemtoolsio, and let it read the files, as before the parsing backends
+(e.g. `preset_file_loader(directory, backends=GEMTOOLSIO_BACKENDS)`).
+"""
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+_factories: dict[str, dict[str, ParserFactory]] = {}
+
+_parsers: dict[tuple[str, Any], Parser] = {}
+
+_lock = threading.Lock()
+
+
+def _text(data: Union[str, bytes, memoryview]) -> str:
+    return data if isinstance(data, str) else str(data, 'utf-8')
+
+
+def _bytes(data: Union[str, bytes, memoryview]) -> Union[str, bytes]:
+    return data if isinstance(data, (str, bytes)) else bytes(data)
+
+
+def _get_orjson_parser(file_format: str) -> Parser:
+    import json
+    import orjson
+    loads = orjson.loads
+
+    def parse(data: Union[str, bytes, memoryview]) -> Any:
+        try:
+            return loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN, Infinity and the integers that do not fit in 64 bits, which json accepts.
+            return json.loads(_bytes(data))
+
+    return parse
+
+
+def _get_ujson_parser(file_format: str) -> Parser:
+    import json
+    import ujson
+
+    def parse(data: Union[str, bytes, memoryview]) -> Any:
+        data = _bytes(data)
+        try:
+            return ujson.loads(data)
+        except (ValueError, OverflowError):
+            return json.loads(data)
+
+    return parse
+
+
+def _get_json_parser(file_format: str) -> Parser:
+    import json
+
+    def parse(data: Union[str, bytes, memoryview]) -> Any:
+        return json.loads(_bytes(data))
+
+    return parse
+
+
+def _get_toml_parser_factory(module_name: str) -> ParserFactory:
+    def get_toml_parser(file_format: str) -> Parser:
+        loads = importlib.import_module(module_name).loads
+
+        def parse(data: Union[str, bytes, memoryview]) -> Any:
+            return loads(_text(data))
+
+        return parse
+
+    return get_toml_parser
+
+
+def _get_yaml_parser_factory(loader_name: str) -> ParserFactory:
+    def get_yaml_parser(file_format: str) -> Parser:
+        import yaml
+        loader = getattr(yaml, loader_name, None)
+        if loader is None:
+            raise ImportError(f'PyYAML is installed without {loader_name}.')
+
+        def parse(data: Union[str, bytes, memoryview]) -> Any:
+            return yaml.load(_bytes(data), Loader=loader)
+
+        return parse
+
+    return get_yaml_parser
+
+
+def _get_gemtoolsio_parser(file_format: str) -> Parser:
+    from gemtoolsio import load_string
+
+    def parse(data: Union[str, bytes, memoryview]) -> Any:
+        return load_string(_text(data), file_format)
+
+    parse.gemtoolsio = True
+    return parse
+
+
+def register_backend(name: str, formats: list[str], factory: ParserFactory, preferred: bool = False):
+    """
+    Register a parsing backend. The backends of a format are tried in their registration order, the preferred ones
+    first; the first installed one parses the files of the format.
+
+    :param name: The name of the backend, used to select it (see `get_parser`).
+    :type name: str
+    :param formats: The file formats parsed by the backend (e.g. [".yaml", ".yml"]).
+    :type formats: list[str]
+    :param factory: The factory of the parser of a format.
+    :type factory: ParserFactory
+    :param preferred: Whether to try the backend before the backends already registered. Defaults to False.
+    :type preferred: bool, optional
+    :return: None
+    """
+    with _lock:
+        for file_format in formats:
+            # The factories of a format are replaced, not changed, so they can be iterated without the lock.
+            factories = dict(_factories.get(file_format.lower(), {}))
+            factories.pop(name, None)
+            if preferred:
+                factories = {name: factory, **factories}
+            else:
+                factories[name] = factory
+            _factories[file_format.lower()] = factories
+        _parsers.clear()
+
+
+def get_backends(file_format: str) -> list[str]:
+    """
+    Get the names of the installed backends of a format, by preference. Each backend is imported to check it.
+
+    :param file_format: The file format (e.g. ".toml").
+    :type file_format: str
+    :return: The names of the backends, GEMTOOLSIO last.
+    :rtype: list[str]
+    """
+    names = []
+    for name, factory in _factories.get(file_format.lower(), {}).items():
+        try:
+            factory(file_format)
+        except ImportError:
+            continue
+        names.append(name)
+    return names + [GEMTOOLSIO]
+
+
+def _get_factory(file_format: str, backend: str) -> ParserFactory:
+    """
+    Get the parser factory of a backend.
+
+    :param file_format: The file format.
+    :type file_format: str
+    :param backend: The name of the backend.
+    :type backend: str
+    :return: The parser factory.
+    :rtype: ParserFactory
+    :raises ArgumentError: If the backend is unknown for the format.
+    """
+    if backend == GEMTOOLSIO:
+        return _get_gemtoolsio_parser
+    factories = _factories.get(file_format.lower(), {})
+    factory = factories.get(backend)
+    if factory is None:
+        critical(f'Backend "{backend}" cannot parse "{file_format}" files, expected one of '
+                 f'{[*factories, GEMTOOLSIO]}.', ArgumentError)
+    return factory
+
+
+def _select_parser(file_format: str, backend: str = None) -> Parser:
+    """
+    Import the parser of a format.
+
+    :param file_format: The file format.
+    :type file_format: str
+    :param backend: The name of the backend. Defaults to the first installed backend.
+    :type backend: str, optional
+    :return: The parser.
+    :rtype: Parser
+    :raises ArgumentError: If the backend is unknown for the format, or is not installed.
+    """
+    if backend is not None:
+        factory = _get_factory(file_format, backend)
+        try:
+            return factory(file_format)
+        except ImportError as error:
+            critical(f'Backend "{backend}" is not installed: {error}', ArgumentError)
+    for name, factory in _factories.get(file_format.lower(), {}).items():
+        # The default parser is the parser of the selected backend, so both are the same function.
+        parser = _parsers.get((file_format, name))
+        if parser is not None:
+            return parser
+        try:
+            return _parsers.setdefault((file_format, name), factory(file_format))
+        except ImportError:
+            pass
+    return _get_gemtoolsio_parser(file_format)
+
+
+def validate_backends(backends: dict[str, str]):
+    """
+    Check that the selected backends are registered for their format, without importing them.
+
+    :param backends: The backend to use by format.
+    :type backends: dict[str, str]
+    :return: None
+    :raises ArgumentError: If a backend is unknown for its format.
+    """
+    for file_format, backend in backends.items():
+        _get_factory(file_format, backend)
+
+
+def get_parser(file_format: str, backends: dict[str, str] = None) -> Parser:
+    """
+    Get the parser of a format. The parsing library is imported on the first call for the format, then the parser
+    is reused.
+
+    By default, the fastest installed backend parses each format: orjson, ujson, then json for JSON; tomllib
+    (Python 3.11+), tomli, then toml for TOML; PyYAML with the LibYAML safe loader, then its Python safe loader for
+    YAML. The other formats are parsed by gemtoolsio. The backends of a format return the same data: the documents
+    that orjson or ujson reject, such as NaN, Infinity or the integers that do not fit in 64 bits, are parsed again
+    by json.
+
+    :param file_format: The file format (e.g. ".toml").
+    :type file_format: str
+    :param backends: The backend to use by format (e.g. {".json": "json"}). The other formats use the default one.
+    :type backends: dict[str, str], optional
+    :return: The parser.
+    :rtype: Parser
+    :raises ArgumentError: If a selected backend is unknown for its format, or is not installed.
+    """
+    backend = backends.get(file_format.lower()) if backends else None
+    key = (file_format, backend)
+    parser = _parsers.get(key)
+    if parser is None:
+        parser = _parsers[key] = _select_parser(file_format, backend)
+    return parser
+
+
+def parse(data: Union[str, bytes, memoryview], file_format: str, backends: dict[str, str] = None) -> Any:
+    """
+    Parse configuration data with the parser of its format (see `get_parser`).
+
+    :param data: The text of the configuration, as a string or as UTF-8 bytes. A leading byte order mark is skipped.
+    :type data: Union[str, bytes, memoryview]
+    :param file_format: The file format (e.g. ".toml").
+    :type file_format: str
+    :param backends: The backend to use by format. Defaults to the fastest installed backends.
+    :type backends: dict[str, str], optional
+    :return: The configuration data.
+    :rtype: Any
+    :raises ArgumentError: If a selected backend is unknown for its format, or is not installed.
+    """
+    if isinstance(data, str):
+        if data[:1] == '\ufeff':
+            data = data[1:]
+    elif data[:len(_UTF8_BOM)] == _UTF8_BOM:
+        data = data[len(_UTF8_BOM):]
+    return get_parser(file_format, backends)(data)
+
+
+register_backend('orjson', ['.json'], _get_orjson_parser)
+register_backend('ujson', ['.json'], _get_ujson_parser)
+register_backend('json', ['.json'], _get_json_parser)
+register_backend('tomllib', ['.toml'], _get_toml_parser_factory('tomllib'))
+register_backend('tomli', ['.toml'], _get_toml_parser_factory('tomli'))
+register_backend('toml', ['.toml'], _get_toml_parser_factory('toml'))
+register_backend('yaml-c', ['.yaml', '.yml'], _get_yaml_parser_factory('CSafeLoader'))
+register_backend('yaml', ['.yaml', '.yml'], _get_yaml_parser_factory('SafeLoader'))
@@ -0,0 +1,440 @@
+import datetime
+import enum
+import logging
+import threading
+import types
+import typing
+from collections.abc import Mapping, MutableSequence, Sequence
+from pathlib import PurePath
+from typing import Any, Callable, TypeVar
+
+from .exceptions import critical, ArgumentError, ConfigurationBindingError
+
+T = TypeVar('T')
+
+Converter = Callable[[Any], Any]
+"""
+A converter takes a configuration value and returns it converted to a type of a schema.
+"""
+
+TRUE_STRINGS = frozenset(('true', 'yes', 'on', '1'))
+
+FALSE_STRINGS = frozenset(('false', 'no', 'off', '0'))
+
+_MISSING = object()
+
+_NONE_TYPE = type(None)
+
+_UNION_TYPES = (typing.Union, getattr(types, 'UnionType', typing.Union))
+
+_converters: dict[Any, Converter] = {}
+
+_converters_lock = threading.RLock()
+
+
+class _BindingFailure(Exception):
+    """
+    A conversion failure, raised by the converters. The keys of the failing value are added while it goes up through
+    the converters of its parents, so the success path does not build key paths.
+    """
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+        self.keys: list[Any] = []
+
+
+def _describe(value: Any) -> str:
+    text = repr(value)
+    if len(text) > 40:
+        text = text[:37] + '...'
+    return f'{type(value).__name__} {text}'
+
+
+def _fail(expected: str, value: Any):
+    raise _BindingFailure(f'expected {expected}, got {_describe(value)}')
+
+
+def _format_path(keys: list[Any]) -> str:
+    """
+    Format the keys of a value as a key path, e.g. "servers[2].port".
+
+    :param keys: The keys, from the root.
+    :type keys: list[Any]
+    :return: The key path, or "<root>" for the root.
+    :rtype: str
+    """
+    path = ''
+    for key in keys:
+        if isinstance(key, int):
+            path += f'[{key}]'
+        else:
+            path += f'.{key}' if path else str(key)
+    return path or '<root>'
+
+
+def _convert_bool(value: Any) -> bool:
+    if type(value) is bool:
+        return value
+    if type(value) is str:
+        lowered = value.strip().lower()
+        if lowered in TRUE_STRINGS:
+            return True
+        if lowered in FALSE_STRINGS:
+            return False
+    _fail('bool', value)
+
+
+def _convert_int(value: Any) -> int:
+    if type(value) is int:
+        return value
+    if type(value) is str:
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    _fail('int', value)
+
+
+def _convert_float(value: Any) -> float:
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    if type(value) is str:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    _fail('float', value)
+
+
+def _convert_str(value: Any) -> str:
+    if type(value) is str:
+        return value
+    _fail('str', value)
+
+
+def _convert_any(value: Any) -> Any:
+    return value
+
+
+def _get_date_converter(schema: type) -> Converter:
+    def convert(value: Any) -> Any:
+        if type(value) is schema:
+            return value
+        if type(value) is str:
+            try:
+                return schema.fromisoformat(value)
+            except ValueError:
+                pass
+        _fail(f'{schema.__name__} or ISO string', value)
+
+    return convert
+
+
+def _get_path_converter(schema: type) -> Converter:
+    def convert(value: Any) -> Any:
+        if isinstance(value, (str, PurePath)):
+            return schema(value)
+        _fail('path string', value)
+
+    return convert
+
+
+def _get_enum_converter(schema: type[enum.Enum]) -> Converter:
+    members = {member.value: member for member in schema}
+    names = {member.name: member for member in schema}
+
+    def convert(value: Any) -> Any:
+        try:
+            return members[value]
+        except (KeyError, TypeError):
+            pass
+        member = names.get(value) if type(value) is str else None
+        if member is None:
+            _fail(f'one of {list(members)}', value)
+        return member
+
+    return convert
+
+
+def _get_literal_converter(choices: tuple) -> Converter:
+    allowed = list(choices)
+
+    def convert(value: Any) -> Any:
+        for choice in allowed:
+            if value == choice and type(value) is type(choice):
+                return choice
+        _fail(f'one of {allowed}', value)
+
+    return convert
+
+
+def _get_union_converter(options: tuple) -> Converter:
+    optional = _NONE_TYPE in options
+    converters = [get_converter(option) for option in options if option is not _NONE_TYPE]
+    expected = ' or '.join(getattr(option, '__name__', str(option)) for option in options)
+
+    def convert(value: Any) -> Any:
+        if value is None and optional:
+            return None
+        for converter in converters:
+            try:
+                return converter(value)
+            except _BindingFailure:
+                pass
+        _fail(expected, value)
+
+    if optional and len(converters) == 1:
+        converter = converters[0]
+
+        def convert_optional(value: Any) -> Any:
+            if value is None:
+                return None
+            return converter(value)
+
+        return convert_optional
+    return convert
+
+
+def _get_list_converter(container: type, item: Any) -> Converter:
+    convert_item = get_converter(item)
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, (str, bytes, Mapping)) or not hasattr(value, '__iter__'):
+            _fail('list', value)
+        result = []
+        for index, item_value in enumerate(value):
+            try:
+                result.append(convert_item(item_value))
+            except _BindingFailure as failure:
+                failure.keys.append(index)
+                raise
+        return result if container is list else container(result)
+
+    return convert
+
+
+def _get_tuple_converter(items: tuple) -> Converter:
+    converters = [get_converter(item) for item in items]
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, (str, bytes, Mapping)) or not hasattr(value, '__len__') or len(value) != len(converters):
+            _fail(f'list of {len(converters)} items', value)
+        result = []
+        for index, (converter, item_value) in enumerate(zip(converters, value)):
+            try:
+                result.append(converter(item_value))
+            except _BindingFailure as failure:
+                failure.keys.append(index)
+                raise
+        return tuple(result)
+
+    return convert
+
+
+def _get_dict_converter(key: Any, item: Any) -> Converter:
+    convert_key = get_converter(key)
+    convert_item = get_converter(item)
+
+    def convert(value: Any) -> Any:
+        if not isinstance(value, Mapping):
+            _fail('mapping', value)
+        result = {}
+        for key_value, item_value in value.items():
+            try:
+                result[convert_key(key_value)] = convert_item(item_value)
+            except _BindingFailure as failure:
+                failure.keys.append(key_value)
+                raise
+        return result
+
+    return convert
+
+
+def _get_fields(schema: type) -> list[tuple[str, Any, Any, Any]]:
+    """
+    Get the fields of a dataclass or a NamedTuple.
+
+    :param schema: The dataclass or the NamedTuple.
+    :type schema: type
+    :return: The name, the type, the default value and the default factory of each field (_MISSING if none).
+    :rtype: list[tuple[str, Any, Any, Any]]
+    :raises ArgumentError: If the type hints of the schema cannot be resolved.
+    """
+    import dataclasses
+    try:
+        hints = typing.get_type_hints(schema)
+    except NameError as error:
+        critical(f'Cannot resolve the type hints of {schema.__name__}: {error}.', ArgumentError)
+    if dataclasses.is_dataclass(schema):
+        return [(field.name, hints.get(field.name, Any), field.default, field.default_factory)
+                for field in dataclasses.fields(schema) if field.init]
+    defaults = schema._field_defaults  # NOQA
+    return [(name, hints.get(name, Any), defaults.get(name, _MISSING), _MISSING) for name in schema._fields]  # NOQA
+
+
+def _get_record_converter(schema: type) -> Converter:
+    """
+    Get the converter of a dataclass or a NamedTuple. The fields are resolved once; each bind only looks up the
+    keys and runs the converters of the fields.
+
+    :param schema: The dataclass or the NamedTuple.
+    :type schema: type
+    :return: The converter.
+    :rtype: Converter
+    """
+    import dataclasses
+    fields = []
+    for name, hint, default, factory in _get_fields(schema):
+        if default is dataclasses.MISSING:
+            default = _MISSING
+        if factory is dataclasses.MISSING:
+            factory = _MISSING
+        fields.append((name, get_converter(hint), default, factory))
+    expected = f'mapping for {schema.__name__}'
+
+    def convert(value: Any) -> Any:
+        if type(value) is schema:
+            return value
+        if not isinstance(value, Mapping):
+            _fail(expected, value)
+        arguments = {}
+        for name, converter, default, factory in fields:
+            field_value = value.get(name, _MISSING)
+            if field_value is _MISSING:
+                if default is not _MISSING:
+                    continue
+                if factory is not _MISSING:
+                    continue
+                failure = _BindingFailure('missing required key')
+                failure.keys.append(name)
+                raise failure
+            try:
+                arguments[name] = converter(field_value)
+            except _BindingFailure as failure:
+                failure.keys.append(name)
+                raise
+        return schema(**arguments)
+
+    return convert
+
+
+def _build_converter(schema: Any) -> Converter:
+    """
+    Build the converter of a type.
+
+    :param schema: The type.
+    :type schema: Any
+    :return: The converter.
+    :rtype: Converter
+    :raises ArgumentError: If the type is not supported.
+    """
+    if schema is Any or schema is object:
+        return _convert_any
+    if schema is bool:
+        return _convert_bool
+    if schema is int:
+        return _convert_int
+    if schema is float:
+        return _convert_float
+    if schema is str:
+        return _convert_str
+    if schema is _NONE_TYPE:
+        return _get_literal_converter((None,))
+
+    origin = typing.get_origin(schema)
+    arguments = typing.get_args(schema)
+    if origin in _UNION_TYPES:
+        return _get_union_converter(arguments)
+    if origin is typing.Literal:
+        return _get_literal_converter(arguments)
+    if origin in (list, set, frozenset, Sequence, MutableSequence):
+        container = origin if origin in (list, set, frozenset) else list
+        return _get_list_converter(container, arguments[0] if arguments else Any)
+    if origin is tuple:
+        if len(arguments) == 2 and arguments[1] is Ellipsis:
+            return _get_list_converter(tuple, arguments[0])
+        return _get_tuple_converter(arguments)
+    if origin in (dict, Mapping):
+        return _get_dict_converter(*(arguments or (Any, Any)))
+    if schema in (list, set, frozenset, tuple):
+        return _get_list_converter(schema, Any)
+    if schema in (dict, Mapping):
+        return _get_dict_converter(Any, Any)
+
+    if isinstance(schema, type):
+        import dataclasses
+        if dataclasses.is_dataclass(schema) or (issubclass(schema, tuple) and hasattr(schema, '_fields')):
+            return _get_record_converter(schema)
+        if issubclass(schema, enum.Enum):
+            return _get_enum_converter(schema)
+        if issubclass(schema, (datetime.date, datetime.time)):
+            return _get_date_converter(schema)
+        if issubclass(schema, PurePath):
+            return _get_path_converter(schema)
+    critical(f'Type {schema!r} is not supported by the configuration binding.', ArgumentError)
+
+
+def get_converter(schema: Any) -> Converter:
+    """
+    Get the converter of a schema. It is built once per schema and cached, so binding the reloaded configurations
+    of a schema only runs the conversion.
+
+    The supported types are the dataclasses (slotted or not) and the NamedTuples, whose fields are looked up by
+    name in a mapping (the unknown keys are ignored), bool, int, float, str, Any, None, Optional and Union, Literal,
+    Enum (by value or by name), list, set, frozenset, tuple, dict and Mapping, date, datetime, time and Path. The
+    strings of the formats without types (e.g. INI) are converted to bool, int, float, dates and Path.
+
+    :param schema: The type to convert the configuration values to.
+    :type schema: Any
+    :return: The converter.
+    :rtype: Converter
+    :raises ArgumentError: If the schema is not supported.
+    """
+    converter = _converters.get(schema)
+    if converter is not None:
+        return converter
+    with _converters_lock:
+        converter = _converters.get(schema)
+        if converter is not None:
+            return converter
+        built = None
+
+        def forward(value: Any) -> Any:
+            return built(value)
+
+        # A recursive schema gets the forwarding converter while its own converter is being built.
+        _converters[schema] = forward
+        try:
+            built = _build_converter(schema)
+        except BaseException:
+            del _converters[schema]
+            raise
+        _converters[schema] = built
+        return built
+
+
+def bind(item: Any, schema: type[T]) -> T:
+    """
+    Bind a configuration item to a schema: a dataclass, a NamedTuple or any type supported by `get_converter`.
+
+    :param item: The configuration item.
+    :type item: Any
+    :param schema: The schema.
+    :type schema: type[T]
+    :return: The configuration converted to the schema.
+    :rtype: T
+    :raises ConfigurationBindingError: If a value does not match the schema. Its `path` is the key path of the value
+                                       (e.g. "servers[2].port").
+    :raises ArgumentError: If the schema is not supported.
+    """
+    converter = get_converter(schema)
+    try:
+        return converter(item)
+    except _BindingFailure as failure:
+        path = _format_path(failure.keys[::-1])
+        msg = f'Cannot bind the configuration to {getattr(schema, "__name__", schema)}: "{path}": {failure.message}.'
+    logging.critical(msg)
+    raise ConfigurationBindingError(msg, path)
@@ -0,0 +1,628 @@
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from os import PathLike
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Union
+
+from .forking import track_fork
+
+DEFAULT_CACHE_DIRECTORY = '.gemtoolscache'
+
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+DEFAULT_NEGATIVE_CACHE_SIZE = 1024
+
+DEFAULT_NEGATIVE_CACHE_TTL = 5.0
+
+DEFAULT_DECRYPTION_CACHE_SIZE = 128
+
+DEFAULT_PINNED = ('config',)
+"""
+The configurations an eviction policy never evicts by default: the default configuration.
+"""
+
+_ENTRY_SUFFIX = '.cache'
+
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+_ENTRY_VERSION = 1
+
+
+def _file_digest(file_path: Path) -> str:
+    """
+    Compute the content hash of a file.
+
+    :param file_path: The path of the file to hash.
+    :type file_path: Path
+    :return: The hexadecimal SHA-256 digest of the file content.
+    :rtype: str
+    """
+    import hashlib
+    return hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+
+class FileCache:
+    """
+    An on-disk cache of parsed configuration files.
+
+    Each entry is a pickled snapshot of a parsed configuration, stored with the size, the modification time and the
+    content hash of its source file. An entry is served when the source file stat is unchanged, or when only its
+    modification time changed but the content hash is the same. The total size of the entries is bounded, the least
+    recently used entries are evicted first.
+    """
+
+    def __init__(self,
+                 directory: Union[PathLike, str] = DEFAULT_CACHE_DIRECTORY,
+                 max_size: int = DEFAULT_CACHE_SIZE
+                 ):
+        """
+        FileCache constructor.
+
+        :param directory: The directory where the cache entries are stored. It is created if it does not exist.
+        :type directory: Union[PathLike, str]
+        :param max_size: The maximum total size of the cache entries, in bytes.
+        :type max_size: int
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+
+    def _entry_path(self, file_path: Path) -> Path:
+        """
+        Get the path of the cache entry of a configuration file.
+
+        :param file_path: The path of the configuration file.
+        :type file_path: Path
+        :return: The path of the cache entry.
+        :rtype: Path
+        """
+        import hashlib
+        name = hashlib.sha1(str(Path(file_path).resolve()).encode()).hexdigest()
+        return self._directory / (name + _ENTRY_SUFFIX)
+
+    def get(self, file_path: Union[PathLike, str]) -> Optional[dict]:
+        """
+        Get the cached configuration of a file.
+
+        :param file_path: The path of the configuration file.
+        :type file_path: Union[PathLike, str]
+        :return: The cached configuration, or None if there is no valid entry for the file.
+        :rtype: Optional[dict]
+        """
+        file_path = Path(file_path)
+        entry_path = self._entry_path(file_path)
+        try:
+            version, mtime_ns, size, digest, item = pickle.loads(entry_path.read_bytes())
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        except Exception as error:  # NOQA
+            logging.warning(f'Discard the corrupted cache entry "{entry_path}": {error}')
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        if version != _ENTRY_VERSION or stat.st_size != size:
+            return None
+        if stat.st_mtime_ns != mtime_ns:
+            if _file_digest(file_path) != digest:
+                return None
+            self._write(entry_path, (_ENTRY_VERSION, stat.st_mtime_ns, size, digest, item))
+        else:
+            os.utime(entry_path)
+        return item
+
+    def put(self, file_path: Union[PathLike, str], item: dict, stat: os.stat_result = None):
+        """
+        Store the parsed configuration of a file.
+
+        :param file_path: The path of the configuration file.
+        :type file_path: Union[PathLike, str]
+        :param item: The parsed configuration.
+        :type item: dict
+        :param stat: The stat of the file taken before it was parsed. If the file changed since, nothing is stored.
+        :type stat: os.stat_result, optional
+        :return: None
+        """
+        file_path = Path(file_path)
+        current = os.stat(file_path)
+        if stat is not None and (stat.st_mtime_ns, stat.st_size) != (current.st_mtime_ns, current.st_size):
+            return
+        entry = (_ENTRY_VERSION, current.st_mtime_ns, current.st_size, _file_digest(file_path), item)
+        self._write(self._entry_path(file_path), entry)
+        self._evict()
+
+    def invalidate(self, file_path: Union[PathLike, str] = None):
+        """
+        Remove the cache entry of a file, or every entry when no file is given.
+
+        :param file_path: The path of the configuration file.
+        :type file_path: Union[PathLike, str], optional
+        :return: None
+        """
+        if file_path is not None:
+            self._entry_path(Path(file_path)).unlink(missing_ok=True)
+            return
+        for entry_path in self._directory.glob('*' + _ENTRY_SUFFIX):
+            entry_path.unlink(missing_ok=True)
+
+    def _write(self, entry_path: Path, entry: tuple):
+        """
+        Atomically write a cache entry, so that concurrent processes and threads never read a partial entry. Each writer
+        uses its own temporary file, so that concurrent writers of the same entry do not replace each other's file.
+
+        :param entry_path: The path of the cache entry.
+        :type entry_path: Path
+        :param entry: The content of the cache entry.
+        :type entry: tuple
+        :return: None
+        """
+        temp_path = entry_path.with_name(f'{entry_path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        temp_path.write_bytes(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(temp_path, entry_path)
+
+    def _evict(self):
+        """
+        Remove the least recently used entries until the cache fits in its maximum size.
+
+        :return: None
+        """
+        entries = []
+        total_size = 0
+        for entry_path in self._directory.glob('*' + _ENTRY_SUFFIX):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry_path))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total_size <= self._max_size:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_size -= size
+
+
+class NegativeCache:
+    """
+    A bounded memory of the configuration names that could not be found, so that probing an optional configuration
+    does not go through the loader again.
+
+    A name is forgotten when its time to live expires, when the generation given by the `generation` callable
+    changes (e.g. the content of a configuration directory changed), or when the oldest names are dropped to keep
+    the cache within its maximum size.
+    """
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_NEGATIVE_CACHE_SIZE,
+                 ttl: float = DEFAULT_NEGATIVE_CACHE_TTL,
+                 generation: Callable[[], int] = None
+                 ):
+        """
+        NegativeCache constructor.
+
+        :param max_entries: The maximum number of names remembered.
+        :type max_entries: int
+        :param ttl: The time a name is remembered, in seconds.
+        :type ttl: float
+        :param generation: A callable returning a number that changes when the missing names may have appeared.
+        :type generation: Callable[[], int], optional
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._generation = generation
+        self._entries: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        track_fork(self)
+
+    def _after_fork(self):
+        """
+        Reset the lock in a forked child.
+
+        :return: None
+        """
+        self._lock = threading.Lock()
+
+    def _current_generation(self) -> int:
+        """
+        Get the current generation.
+
+        :return: The current generation, or 0 if the cache has no generation callable.
+        :rtype: int
+        """
+        return 0 if self._generation is None else self._generation()
+
+    def add(self, name: str):
+        """
+        Remember that a name could not be found.
+
+        :param name: The configuration name.
+        :type name: str
+        :return: None
+        """
+        entry = (time.monotonic() + self._ttl, self._current_generation())
+        with self._lock:
+            self._entries[name] = entry
+            self._entries.move_to_end(name)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, name: str):
+        """
+        Forget a name.
+
+        :param name: The configuration name.
+        :type name: str
+        :return: None
+        """
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def clear(self):
+        """
+        Forget every name.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, name: str) -> bool:
+        """
+        Checks if a name is remembered as missing.
+
+        :param name: The configuration name.
+        :type name: str
+        :return: A boolean value indicating whether the name is known to be missing.
+        :rtype: bool
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            return False
+        expires_at, generation = entry
+        if time.monotonic() < expires_at and generation == self._current_generation():
+            return True
+        self.discard(name)
+        return False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DecryptionCache:
+    """
+    A bounded, memory-only cache of decrypted and parsed configurations, keyed by the hash of their ciphertext, so
+    that loading the same encrypted file again skips the decryption and the parsing.
+
+    Each entry is a pickled snapshot of the parsed configuration, so every hit returns a fresh copy that callers may
+    modify. With `zero_on_evict`, the snapshot buffer is overwritten with zeros when it is evicted or cleared. The
+    decrypted text itself is an immutable object and cannot be zeroed.
+    """
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_DECRYPTION_CACHE_SIZE,
+                 zero_on_evict: bool = False
+                 ):
+        """
+        DecryptionCache constructor.
+
+        :param max_entries: The maximum number of configurations kept.
+        :type max_entries: int
+        :param zero_on_evict: Whether to overwrite the evicted entries with zeros.
+        :type zero_on_evict: bool
+        """
+        self._max_entries = max_entries
+        self._zero_on_evict = zero_on_evict
+        self._entries: OrderedDict[bytes, bytearray] = OrderedDict()
+        self._lock = threading.Lock()
+        track_fork(self)
+
+    def _after_fork(self):
+        """
+        Reset the lock in a forked child.
+
+        :return: None
+        """
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(ciphertext: bytes) -> bytes:
+        """
+        Get the cache key of a ciphertext.
+
+        :param ciphertext: The encrypted content of a configuration file.
+        :type ciphertext: bytes
+        :return: The SHA-256 digest of the ciphertext.
+        :rtype: bytes
+        """
+        import hashlib
+        return hashlib.sha256(ciphertext).digest()
+
+    def get(self, ciphertext: bytes) -> Optional[dict]:
+        """
+        Get the parsed configuration of a ciphertext.
+
+        :param ciphertext: The encrypted content of a configuration file.
+        :type ciphertext: bytes
+        :return: A copy of the parsed configuration, or None if it is not cached.
+        :rtype: Optional[dict]
+        """
+        key = self._key(ciphertext)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return pickle.loads(entry)
+
+    def put(self, ciphertext: bytes, item: dict):
+        """
+        Store the parsed configuration of a ciphertext.
+
+        :param ciphertext: The encrypted content of a configuration file.
+        :type ciphertext: bytes
+        :param item: The parsed configuration.
+        :type item: dict
+        :return: None
+        """
+        key = self._key(ciphertext)
+        entry = bytearray(pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._discard(previous)
+            self._entries[key] = entry
+            while len(self._entries) > self._max_entries:
+                self._discard(self._entries.popitem(last=False)[1])
+
+    def clear(self):
+        """
+        Remove every entry.
+
+        :return: None
+        """
+        with self._lock:
+            for entry in self._entries.values():
+                self._discard(entry)
+            self._entries.clear()
+
+    def _discard(self, entry: bytearray):
+        """
+        Release an entry, zeroing it if requested.
+
+        :param entry: The evicted entry.
+        :type entry: bytearray
+        :return: None
+        """
+        if self._zero_on_evict:
+            entry[:] = bytes(len(entry))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def estimate_size(item: Any) -> int:
+    """
+    Estimate the memory used by a configuration item: the sizes of its containers, keys and values. The containers
+    shared by several parts of the item are counted once.
+
+    :param item: The configuration item.
+    :type item: Any
+    :return: The estimated size, in bytes.
+    :rtype: int
+    """
+    getsizeof = sys.getsizeof
+    seen = set()
+    size = 0
+    stack = [item]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += getsizeof(value)
+        if isinstance(value, Mapping):
+            size += sum(map(getsizeof, value))
+            children = value.values()
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            children = value
+        else:
+            continue
+        for child in children:
+            if type(child) in _SCALAR_TYPES:
+                size += getsizeof(child)
+            else:
+                stack.append(child)
+    return size
+
+
+class EvictionPolicy:
+    """
+    The eviction policy of the lazily loaded configurations of `Configurations`, so the registry of a service that
+    loads many configurations (e.g. one per tenant) stays bounded.
+
+    A configuration is evicted when it expires (`ttl`), or when the least recently used ones are dropped to keep the
+    registry within `max_entries` and `max_bytes`. The expired configurations are evicted on their next access, or
+    by the next load, so the configurations that are not accessed anymore do not stay loaded. The pinned
+    configurations are never evicted. The policy counts the hits, the misses (the loads) and the evictions.
+
+    With an intern table (see `Configurations.set_intern_table`), the values of the evicted configurations are not
+    counted in `max_bytes`: the table keeps them until it prunes its unused values (see `InternTable`).
+    """
+
+    def __init__(self,
+                 max_entries: int = None,
+                 max_bytes: int = None,
+                 ttl: float = None,
+                 pinned: Iterable[str] = DEFAULT_PINNED,
+                 size_estimator: Callable[[Any], int] = estimate_size
+                 ):
+        """
+        EvictionPolicy constructor.
+
+        :param max_entries: The maximum number of evictable configurations. Defaults to None, no limit.
+        :type max_entries: int, optional
+        :param max_bytes: The maximum estimated size of the evictable configurations, in bytes. Defaults to None, no
+                          limit.
+        :type max_bytes: int, optional
+        :param ttl: The time a configuration is kept after its load, in seconds. Defaults to None, no expiration.
+        :type ttl: float, optional
+        :param pinned: The names of the configurations never evicted. Defaults to DEFAULT_PINNED.
+        :type pinned: Iterable[str], optional
+        :param size_estimator: The function estimating the size of a configuration, for `max_bytes`. Defaults to
+                               `estimate_size`.
+        :type size_estimator: Callable[[Any], int], optional
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._pinned = frozenset(pinned)
+        self._size_estimator = size_estimator
+        self._entries: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        self._expirations: deque[tuple[float, str]] = deque()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+        track_fork(self)
+
+    def _after_fork(self):
+        """
+        Reset the lock in a forked child.
+
+        :return: None
+        """
+        self._lock = threading.Lock()
+
+    def is_pinned(self, name: str) -> bool:
+        """
+        Checks if a configuration is pinned.
+
+        :param name: The configuration name.
+        :type name: str
+        :return: A boolean value indicating whether the configuration is never evicted.
+        :rtype: bool
+        """
+        return name in self._pinned
+
+    def add(self, name: str, item: Any) -> list[str]:
+        """
+        Record the load of a configuration, and choose the configurations to evict: the expired ones, then the least
+        recently used ones to stay within the limits. A pinned configuration is counted as a miss but not recorded.
+
+        :param name: The configuration name.
+        :type name: str
+        :param item: The configuration item.
+        :type item: Any
+        :return: The names of the configurations to evict, already forgotten by the policy.
+        :rtype: list[str]
+        """
+        pinned = name in self._pinned
+        size = 0 if pinned or self._max_bytes is None else self._size_estimator(item)
+        expires_at = float('inf') if self._ttl is None else time.monotonic() + self._ttl
+        evicted = []
+        with self._lock:
+            self._misses += 1
+            if pinned:
+                return evicted
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[name] = (expires_at, size)
+            self._bytes += size
+            if self._ttl is not None:
+                self._expirations.append((expires_at, name))
+                now = time.monotonic()
+                while self._expirations and self._expirations[0][0] <= now:
+                    expired_at, expired_name = self._expirations.popleft()
+                    expired = self._entries.get(expired_name)
+                    if expired is not None and expired[0] == expired_at:
+                        del self._entries[expired_name]
+                        self._bytes -= expired[1]
+                        evicted.append(expired_name)
+            while len(self._entries) > 1 and (
+                    (self._max_entries is not None and len(self._entries) > self._max_entries)
+                    or (self._max_bytes is not None and self._bytes > self._max_bytes)):
+                evicted_name, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                evicted.append(evicted_name)
+            self._evictions += len(evicted)
+        return evicted
+
+    def hit(self, name: str) -> bool:
+        """
+        Record an access to a loaded configuration. The order of the entries is changed under the lock, so a
+        concurrent eviction never iterates them while they move.
+
+        :param name: The configuration name.
+        :type name: str
+        :return: False if the configuration expired: it is forgotten by the policy and must be evicted.
+        :rtype: bool
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                if self._ttl is not None and entry[0] <= time.monotonic():
+                    del self._entries[name]
+                    self._bytes -= entry[1]
+                    self._evictions += 1
+                    return False
+                self._entries.move_to_end(name)
+            self._hits += 1
+            return True
+
+    def discard(self, name: str):
+        """
+        Forget a configuration, e.g. when it is unloaded or replaced by a configuration that is not lazy loaded.
+
+        :param name: The configuration name.
+        :type name: str
+        :return: None
+        """
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def clear(self):
+        """
+        Forget every configuration and reset the statistics.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._expirations.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def statistics(self) -> dict[str, int]:
+        """
+        Get the statistics of the policy.
+
+        :return: The "hits", "misses" and "evictions" counts, the number of evictable "entries" and their estimated
+                 "bytes" (0 without `max_bytes`).
+        :rtype: dict[str, int]
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,28 +1,110 @@
+import gc
+import logging
+import threading
+from typing import Any, Optional, Union
+
+from .aio import AsyncConfigurationLoader
+from .binding import bind
+from .cache import EvictionPolicy, NegativeCache
+from .diff import ChangeCallback, KeyTuple, get_path_value, values_equal
+from .forking import track_fork
+from .handlers import get_index_generation
+from .interning import InternTable
 from .loader import ConfigurationLoader, ConfigurationItem
+from .shared import SharedConfiguration, SharedList, SharedSegment
+from .subtree import KeyPath, split_key_path
 
 from .exceptions import ConfigurationLoaderFoundError, ConfigurationNotFoundError, \
-    ConfigurationLoaderNotFoundError, critical, ConfigurationLoadingError
+    ConfigurationLoaderNotFoundError, critical, ConfigurationLoadingError, ConfigurationBulkLoadingError, \
+    ArgumentError
 
 DEFAULT_CONFIGURATION_NAME = 'config'
 DEFAULT_LOADER_NAME = 'default'
 
+LOAD_MODES = ['thread', 'process']
+
+WARMUP_ALL = 'all'
+
+_MISSING = object()
+
+
+class _Flight:
+    """
+    A lazy load in progress, shared by every caller that asks for the same configuration at the same time.
+    """
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self) -> Any:
+        """
+        Wait for the end of the load.
+
+        :return: The loaded configuration.
+        :raises: The error raised by the load, if it failed.
+        """
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _lazy_load_in_worker(loader_name: str, config_name: str) -> ConfigurationItem:
+    """
+    Lazy load a configuration in a worker process. The worker is forked, so it inherits the loaders of its parent.
+
+    :param loader_name: The name of the loader to use.
+    :type loader_name: str
+    :param config_name: The name of the configuration to load.
+    :type config_name: str
+    :return: The loaded configuration.
+    :rtype: ConfigurationItem
+    """
+    return Configurations._get_sync_loader(loader_name).lazy_load(config_name)  # NOQA
+
 
 class Configurations:
     """
     A class representing a collection of configurations and configuration loaders.
+
+    The collection is thread-safe. Reading an already loaded configuration takes no lock, and concurrent lazy loads
+    of the same configuration are collapsed into a single load that the other callers wait on. In a forked process,
+    the lock and the loads in progress in the other threads of the parent are reset.
     """
     configurations: dict[str, ConfigurationItem] = {}
     loaders: dict[str, ConfigurationLoader] = {}
+    missing = NegativeCache(generation=get_index_generation)
+    _lock = threading.RLock()
+    _flights: dict[str, _Flight] = {}
+    _async_flights: dict[str, 'asyncio.Task'] = {}
+    shared: Optional[SharedSegment] = None
+    eviction: Optional[EvictionPolicy] = None
+    interning: Optional[InternTable] = None
+    _bound: dict[str, dict[type, tuple[ConfigurationItem, Any]]] = {}
+    _subscriptions: dict[str, dict[KeyTuple, list[ChangeCallback]]] = {}
 
     @classmethod
     def clear(cls):
         """
-        Clears all configurations and configuration loaders.
+        Clears all configurations, configuration loaders and subscriptions, removes the eviction policy and the intern
+        table, and closes the shared segment.
 
         :return: None
         """
-        cls.loaders.clear()
-        cls.configurations.clear()
+        with cls._lock:
+            cls.loaders.clear()
+            cls.configurations.clear()
+            cls.missing.clear()
+            cls._bound.clear()
+            cls._subscriptions = {}
+            cls.eviction = None
+            cls.interning = None
+            if cls.shared is not None:
+                cls.shared.close()
+                cls.shared = None
 
     @classmethod
     def unload(cls,
@@ -38,9 +120,103 @@ class Configurations:
         """
         if config_name is None:
             config_name = DEFAULT_CONFIGURATION_NAME
-        if config_name not in cls.configurations:
-            critical(f'Configuration "{config_name}" cannot be found.', ConfigurationNotFoundError)
-        del cls.configurations[config_name]
+        with cls._lock:
+            if config_name not in cls.configurations:
+                critical(f'Configuration "{config_name}" cannot be found.', ConfigurationNotFoundError)
+            del cls.configurations[config_name]
+            cls._bound.pop(config_name, None)
+            if cls.eviction is not None:
+                cls.eviction.discard(config_name)
+
+    @classmethod
+    def set_eviction_policy(cls,
+                            policy: Optional[EvictionPolicy]
+                            ):
+        """
+        Bound the lazily loaded configurations with an eviction policy, or remove it.
+
+        The policy applies to the configurations lazy loaded afterwards (by `get_config`, `try_get_config`,
+        `aget_config`, `load_many` and `warmup`). An evicted configuration is lazy loaded again on its next access.
+        The configurations added by `add_config` or `load_config` are never evicted, since they cannot be loaded
+        again by their name.
+
+        :param policy: The eviction policy, or None to keep every configuration.
+        :type policy: Optional[EvictionPolicy]
+        :return: None
+        """
+        with cls._lock:
+            cls.eviction = policy
+
+    @classmethod
+    def set_intern_table(cls,
+                         table: Optional[InternTable]
+                         ):
+        """
+        Share the identical sections and strings of the configurations through an intern table, or stop sharing them.
+
+        The configurations added afterwards, including the lazy loaded and reloaded ones, are interned by
+        `add_config`: they become frozen, and the sections they have in common with the other configurations (e.g.
+        the defaults of many tenants) are the same objects. The lazy and shared configurations are kept as is.
+
+        :param table: The intern table, or None to keep the configurations as they are loaded.
+        :type table: Optional[InternTable]
+        :return: None
+        """
+        with cls._lock:
+            cls.interning = table
+
+    @classmethod
+    def _track(cls, config_name: str, config: ConfigurationItem):
+        """
+        Record a lazy loaded configuration in the eviction policy, and evict the configurations it chooses.
+
+        :param config_name: The name of the configuration.
+        :type config_name: str
+        :param config: The configuration.
+        :type config: ConfigurationItem
+        :return: None
+        """
+        eviction = cls.eviction
+        if eviction is None:
+            return
+        with cls._lock:
+            for name in eviction.add(config_name, config):
+                cls.configurations.pop(name, None)
+                cls._bound.pop(name, None)
+
+    @classmethod
+    def _get_loaded(cls, config_name: str) -> Any:
+        """
+        Get a loaded configuration, and record the access in the eviction policy. An expired configuration is
+        evicted.
+
+        :param config_name: The name of the configuration.
+        :type config_name: str
+        :return: The configuration, or _MISSING if it is not loaded.
+        :rtype: Any
+        """
+        config = cls.configurations.get(config_name, _MISSING)
+        eviction = cls.eviction
+        if config is _MISSING or eviction is None or eviction.hit(config_name):
+            return config
+        cls._evict_expired(config_name, config)
+        return _MISSING
+
+    @classmethod
+    def _evict_expired(cls, config_name: str, config: ConfigurationItem):
+        """
+        Evict an expired configuration, unless it was replaced in the meantime.
+
+        :param config_name: The name of the configuration.
+        :type config_name: str
+        :param config: The expired configuration.
+        :type config: ConfigurationItem
+        :return: None
+        """
+        with cls._lock:
+            if cls.configurations.get(config_name) is config:
+                del cls.configurations[config_name]
+                cls._bound.pop(config_name, None)
 
     @classmethod
     def add_loader(cls,
@@ -62,9 +238,10 @@ class Configurations:
         """
         if loader_name is None:
             loader_name = DEFAULT_LOADER_NAME
-        if loader_name in cls.loaders and not allow_overwrite:
-            critical(f'A loader named "{loader_name}" already exists.', ConfigurationLoaderFoundError)
-        cls.loaders[loader_name] = loader
+        with cls._lock:
+            if loader_name in cls.loaders and not allow_overwrite:
+                critical(f'A loader named "{loader_name}" already exists.', ConfigurationLoaderFoundError)
+            cls.loaders[loader_name] = loader
 
     @classmethod
     def remove_loader(cls,
@@ -80,9 +257,10 @@ class Configurations:
         """
         if loader_name is None:
             loader_name = DEFAULT_LOADER_NAME
-        if loader_name not in cls.loaders:
-            critical(f'Loader "{loader_name}" cannot be found.', ConfigurationLoaderNotFoundError)
-        del cls.loaders[loader_name]
+        with cls._lock:
+            if loader_name not in cls.loaders:
+                critical(f'Loader "{loader_name}" cannot be found.', ConfigurationLoaderNotFoundError)
+            del cls.loaders[loader_name]
 
     @classmethod
     def load_config(cls,
@@ -112,18 +290,141 @@ class Configurations:
             config_name = DEFAULT_CONFIGURATION_NAME
         if loader_name is None:
             loader_name = DEFAULT_LOADER_NAME
-        config = cls.get_loader(loader_name).load(**parameters)
-        cls.add_config(config, config_name=config_name, allow_overwrite=allow_overwrite)
-        return config
+        config = cls._get_sync_loader(loader_name).load(**parameters)
+        return cls.add_config(config, config_name=config_name, allow_overwrite=allow_overwrite)
+
+    @classmethod
+    def load_many(cls,
+                  names: list[str],
+                  workers: int = None,
+                  mode: str = 'thread',
+                  loader_name: str = None,
+                  allow_overwrite: bool = False
+                  ) -> dict[str, ConfigurationItem]:
+        """
+        Lazy load many configurations in parallel and add them to the `configurations` dictionary.
+
+        In "thread" mode, the configurations are loaded by a thread pool, which suits loaders dominated by I/O. In
+        "process" mode, they are loaded by a pool of forked processes, which suits CPU-bound parsing; the workers
+        inherit the loaders and send back the parsed configurations. A failure does not stop the other loads.
+
+        :param names: The names of the configurations to load. The ones already loaded are skipped, unless
+                      `allow_overwrite` is `True`.
+        :type names: list[str]
+        :param workers: The number of workers. Defaults to the default of the executor.
+        :type workers: int, optional
+        :param mode: "thread" or "process". Defaults to "thread".
+        :type mode: str, optional
+        :param loader_name: The name of the loader to use. Defaults to `DEFAULT_LOADER_NAME`.
+        :type loader_name: str, optional
+        :param allow_overwrite: Whether to load again and overwrite the configurations already loaded.
+                                Defaults to `False`.
+        :type allow_overwrite: bool, optional
+        :return: The requested configurations, by name.
+        :rtype: dict[str, ConfigurationItem]
+        :raises ArgumentError: If the mode is invalid, or if processes cannot be forked on this platform.
+        :raises ConfigurationBulkLoadingError: If some configurations fail to load. The others are registered.
+        """
+        if mode not in LOAD_MODES:
+            critical(f'Argument "mode" must be one of {LOAD_MODES}, got {mode}.', ArgumentError)
+        if loader_name is None:
+            loader_name = DEFAULT_LOADER_NAME
+        loader = cls._get_sync_loader(loader_name)
+
+        loaded = {}
+        pending = []
+        for name in dict.fromkeys(names):
+            config = cls._get_loaded(name)
+            if config is _MISSING or allow_overwrite:
+                pending.append(name)
+            else:
+                loaded[name] = config
+
+        if mode == 'thread':
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(workers)
+            futures = {name: executor.submit(loader.lazy_load, name) for name in pending}
+        else:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            if 'fork' not in multiprocessing.get_all_start_methods():
+                critical('The "process" mode requires the "fork" start method.', ArgumentError)
+            executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+            futures = {name: executor.submit(_lazy_load_in_worker, loader_name, name) for name in pending}
+
+        errors = {}
+        with executor:
+            for name, future in futures.items():
+                try:
+                    config = future.result()
+                except Exception as error:  # NOQA
+                    errors[name] = error
+                    continue
+                previous = _MISSING
+                with cls._lock:
+                    if allow_overwrite or name not in cls.configurations:
+                        config, previous = cls._store_config(config, name, allow_overwrite)
+                        cls._track(name, config)
+                    loaded[name] = cls.configurations.get(name, config)
+                cls._notify(name, previous, config)
+
+        if errors:
+            msg = f'{len(errors)} configuration(s) failed to load: ' + \
+                  ', '.join(f'"{name}" ({error!r})' for name, error in errors.items())
+            logging.critical(msg)
+            raise ConfigurationBulkLoadingError(msg, loaded, errors)
+        return loaded
+
+    @classmethod
+    def warmup(cls,
+               names: Union[list[str], str] = WARMUP_ALL,
+               loader_name: str = None,
+               workers: int = None,
+               mode: str = 'thread',
+               freeze_gc: bool = True
+               ) -> dict[str, ConfigurationItem]:
+        """
+        Load configurations eagerly, before a pre-fork server forks its workers, so the workers do not parse them on
+        their first request.
+
+        The configurations are loaded by `load_many`. Then, with `freeze_gc`, every object tracked by the garbage
+        collector is moved to its permanent generation (`gc.freeze`): the collections of the workers do not visit
+        them, so they do not write to the pages of the configurations, which stay shared with the parent.
+
+        :param names: The names of the configurations, or WARMUP_ALL for every configuration listed by the loader
+                      (see `ConfigurationLoader.list_names`). Defaults to WARMUP_ALL.
+        :type names: Union[list[str], str], optional
+        :param loader_name: The name of the loader to use. Defaults to `DEFAULT_LOADER_NAME`.
+        :type loader_name: str, optional
+        :param workers: The number of workers of `load_many`. Defaults to the default of the executor.
+        :type workers: int, optional
+        :param mode: The mode of `load_many`, "thread" or "process". Defaults to "thread".
+        :type mode: str, optional
+        :param freeze_gc: Whether to freeze the objects tracked by the garbage collector. Defaults to True.
+        :type freeze_gc: bool, optional
+        :return: The configurations, by name.
+        :rtype: dict[str, ConfigurationItem]
+        :raises ConfigurationHandlerError: If all the configurations are requested and the loader cannot list them.
+        :raises ConfigurationBulkLoadingError: If some configurations fail to load. The others are registered.
+        """
+        if names == WARMUP_ALL:
+            names = cls._get_sync_loader(loader_name).list_names()
+        try:
+            return cls.load_many(names, workers, mode, loader_name)
+        finally:
+            if freeze_gc:
+                gc.collect()
+                gc.freeze()
 
     @classmethod
     def add_config(cls,
                    config: ConfigurationItem,
                    config_name: str = None,
                    allow_overwrite: bool = False
-                   ):
+                   ) -> ConfigurationItem:
         """
-        Add a configuration to the `configurations` dictionary under the given name.
+        Add a configuration to the `configurations` dictionary under the given name. With an intern table (see
+        `set_intern_table`), the interned configuration is added instead.
 
         :param config: The configuration item to add.
         :type config: ConfigurationItem
@@ -132,23 +433,374 @@ class Configurations:
         :param allow_overwrite: Whether to allow overwriting an existing configuration with the same name.
                                 Defaults to `False`.
         :type allow_overwrite: bool, optional
+        :return: The added configuration item.
+        :rtype: ConfigurationItem
         :raises ConfigurationLoadingError: If an error occurs while adding the configuration.
         """
         if config_name is None:
             config_name = DEFAULT_CONFIGURATION_NAME
-        if config_name in cls.configurations and not allow_overwrite:
-            critical(f'Configuration "{config_name}" is already loaded. Allow overwrite to erase the old one.',
-                     ConfigurationLoadingError)
-        cls.configurations[config_name] = config
+        config, previous = cls._store_config(config, config_name, allow_overwrite)
+        cls._notify(config_name, previous, config)
+        return config
+
+    @classmethod
+    def _store_config(cls,
+                      config: ConfigurationItem,
+                      config_name: str,
+                      allow_overwrite: bool
+                      ) -> tuple[ConfigurationItem, Any]:
+        """
+        Add a configuration to the `configurations` dictionary, without notifying the subscribers, so a caller that
+        holds the lock notifies them after releasing it (see `_notify`).
+
+        :param config: The configuration item to add.
+        :type config: ConfigurationItem
+        :param config_name: The name to use for the configuration.
+        :type config_name: str
+        :param allow_overwrite: Whether to allow overwriting an existing configuration with the same name.
+        :type allow_overwrite: bool
+        :return: The added configuration item, and the replaced one (_MISSING if there was none).
+        :rtype: tuple[ConfigurationItem, Any]
+        :raises ConfigurationLoadingError: If the configuration is already loaded and cannot be overwritten.
+        """
+        interning = cls.interning
+        if interning is not None:
+            config = interning.intern(config)
+        with cls._lock:
+            previous = cls.configurations.get(config_name, _MISSING)
+            if previous is not _MISSING and not allow_overwrite:
+                critical(f'Configuration "{config_name}" is already loaded. Allow overwrite to erase the old one.',
+                         ConfigurationLoadingError)
+            cls.configurations[config_name] = config
+            cls.missing.discard(config_name)
+            cls._bound.pop(config_name, None)
+            if cls.eviction is not None:
+                cls.eviction.discard(config_name)
+        return config, previous
+
+    @classmethod
+    def subscribe(cls,
+                  config_name: Optional[str],
+                  path: Optional[KeyPath],
+                  callback: ChangeCallback
+                  ):
+        """
+        Call a callback when a configuration is replaced (by `add_config` with `allow_overwrite`, `load_config` or a
+        `ConfigurationWatcher`) and its value at a key path changed. A replacement that leaves the value equal does
+        not call it, so a consumer rebuilds only what depends on the changed parts.
+
+        The callback is called with the name of the configuration, and the previous and new values at the key path
+        (None where the path does not exist), after the new configuration is published. An exception raised by a
+        callback is logged. See `diff_configurations` to get the changed key paths under the value.
+
+        :param config_name: The name of the configuration. Defaults to `DEFAULT_CONFIGURATION_NAME`.
+        :type config_name: Optional[str]
+        :param path: The key path, as a dotted string (e.g. "db.pool") or a sequence of keys. None for the whole
+                     configuration.
+        :type path: Optional[KeyPath]
+        :param callback: The callback.
+        :type callback: ChangeCallback
+        :return: None
+        """
+        if config_name is None:
+            config_name = DEFAULT_CONFIGURATION_NAME
+        keys = () if path is None else split_key_path(path)
+        with cls._lock:
+            # The subscriptions are replaced, not changed, so `add_config` reads them without the lock.
+            subscriptions = dict(cls._subscriptions.get(config_name, {}))
+            subscriptions[keys] = [*subscriptions.get(keys, []), callback]
+            cls._subscriptions = {**cls._subscriptions, config_name: subscriptions}
+
+    @classmethod
+    def unsubscribe(cls,
+                    config_name: Optional[str],
+                    path: Optional[KeyPath],
+                    callback: ChangeCallback
+                    ):
+        """
+        Remove a subscription added by `subscribe`.
+
+        :param config_name: The name of the configuration. Defaults to `DEFAULT_CONFIGURATION_NAME`.
+        :type config_name: Optional[str]
+        :param path: The key path of the subscription.
+        :type path: Optional[KeyPath]
+        :param callback: The callback of the subscription.
+        :type callback: ChangeCallback
+        :return: None
+        :raises ValueError: If there is no such subscription.
+        """
+        if config_name is None:
+            config_name = DEFAULT_CONFIGURATION_NAME
+        keys = () if path is None else split_key_path(path)
+        with cls._lock:
+            subscriptions = dict(cls._subscriptions.get(config_name, {}))
+            callbacks = list(subscriptions.get(keys, []))
+            callbacks.remove(callback)
+            if callbacks:
+                subscriptions[keys] = callbacks
+            else:
+                subscriptions.pop(keys)
+            cls._subscriptions = {**cls._subscriptions, config_name: subscriptions}
+
+    @classmethod
+    def _notify(cls,
+                config_name: str,
+                previous: Any,
+                config: ConfigurationItem
+                ):
+        """
+        Call the callbacks of the key paths whose value changed between two items of a configuration. Only the
+        subscribed values are compared: the same objects are skipped, the others are compared by equality (see
+        `diff_configurations`). It must be called without the lock, so the callbacks can use the collection.
+
+        :param config_name: The name of the configuration.
+        :type config_name: str
+        :param previous: The replaced configuration item, or _MISSING if the configuration was not loaded.
+        :type previous: Any
+        :param config: The new configuration item.
+        :type config: ConfigurationItem
+        :return: None
+        """
+        subscriptions = cls._subscriptions.get(config_name)
+        if not subscriptions or previous is _MISSING or previous is config:
+            return
+        for keys, callbacks in subscriptions.items():
+            old_value = get_path_value(previous, keys, _MISSING)
+            new_value = get_path_value(config, keys, _MISSING)
+            if old_value is new_value or (old_value is not _MISSING and new_value is not _MISSING
+                                          and values_equal(old_value, new_value)):
+                continue
+            old_value = None if old_value is _MISSING else old_value
+            new_value = None if new_value is _MISSING else new_value
+            for callback in callbacks:
+                try:
+                    callback(config_name, old_value, new_value)
+                except Exception as error:  # NOQA
+                    logging.error(f'Change callback of configuration "{config_name}" failed: {error}')
+
+    @classmethod
+    def share(cls,
+              names: list[str] = None
+              ) -> SharedSegment:
+        """
+        Publish loaded configurations in a shared memory segment, and replace them in the collection by read-only
+        views of the segment.
+
+        Call it in the parent process before forking the workers: the workers read the same memory pages instead of
+        holding a copy of every configuration each, even after the reference counting of the regular objects has
+        written to their pages. Processes that are not forked call `attach_shared` with the name of the segment.
+        The values are decoded on first access, in each process. The configurations lazy loaded afterwards are
+        regular ones, private to each process. A previous segment of this process is closed.
+
+        :param names: The names of the configurations to share. Defaults to every loaded configuration.
+        :type names: list[str], optional
+        :return: The segment. Its name attaches other processes to it.
+        :rtype: SharedSegment
+        :raises ConfigurationNotFoundError: If one of the configurations is not loaded.
+        """
+        with cls._lock:
+            if names is None:
+                names = list(cls.configurations)
+            for name in names:
+                if name not in cls.configurations:
+                    critical(f'Configuration "{name}" cannot be found.', ConfigurationNotFoundError)
+            segment = SharedSegment.create({name: cls.configurations[name] for name in names})
+            replaced = cls._set_shared(segment)
+        for name, previous, config in replaced:
+            cls._notify(name, previous, config)
+        return segment
+
+    @classmethod
+    def attach_shared(cls,
+                      segment_name: str
+                      ) -> SharedSegment:
+        """
+        Attach to a segment published by `share` in another process, and add its configurations to the collection,
+        overwriting the ones with the same names. A previous segment of this process is closed.
+
+        :param segment_name: The name of the segment.
+        :type segment_name: str
+        :return: The segment.
+        :rtype: SharedSegment
+        :raises FileNotFoundError: If the segment does not exist.
+        """
+        segment = SharedSegment.attach(segment_name)
+        with cls._lock:
+            replaced = cls._set_shared(segment)
+        for name, previous, config in replaced:
+            cls._notify(name, previous, config)
+        return segment
+
+    @classmethod
+    def _set_shared(cls, segment: SharedSegment) -> list[tuple[str, Any, ConfigurationItem]]:
+        """
+        Replace the shared segment and add its configurations to the collection. It is called with the lock, so the
+        subscribers are not notified: the caller notifies them after releasing the lock.
+
+        :param segment: The new segment.
+        :type segment: SharedSegment
+        :return: The name, the replaced item and the new item of each added configuration, to notify.
+        :rtype: list[tuple[str, Any, ConfigurationItem]]
+        """
+        previous, cls.shared = cls.shared, segment
+        replaced = []
+        for name, config in segment.root.items():
+            config, replaced_config = cls._store_config(config, name, True)
+            replaced.append((name, replaced_config, config))
+        if previous is not None:
+            for name, config in list(cls.configurations.items()):
+                if isinstance(config, (SharedConfiguration, SharedList)) and config._buffer is previous._buffer:  # NOQA
+                    del cls.configurations[name]
+                    cls._bound.pop(name, None)
+                    if cls.eviction is not None:
+                        cls.eviction.discard(name)
+            previous.close()
+        return replaced
 
     @classmethod
     def get_config(cls,
                    config_name: str = None,
-                   allow_lazy_load: bool = True
+                   allow_lazy_load: bool = True,
+                   schema: type = None
                    ) -> ConfigurationItem:
         """
         Gets the configuration with the given name.
 
+        :param config_name: The name of the configuration to get.
+        :type config_name: str
+        :param allow_lazy_load: Whether to allow lazy loading of the configuration if it does not exist.
+        :type allow_lazy_load: bool
+        :param schema: Optional schema to bind the configuration to: a dataclass, a NamedTuple or another type
+                       supported by `get_converter`. The bound configuration is cached until the configuration is
+                       replaced, so it is shared by the callers and should be treated as read-only (e.g. a frozen
+                       dataclass).
+        :type schema: type, optional
+        :raises ConfigurationNotFoundError: If the specified configuration does not exist and `allow_lazy_load` is `False`.
+        :raises ConfigurationBindingError: If the configuration does not match the schema.
+        :return: The requested configuration, bound to the schema if one is given.
+        :rtype: ConfigurationItem
+        """
+        if config_name is None:
+            config_name = DEFAULT_CONFIGURATION_NAME
+        config = cls.configurations.get(config_name, _MISSING)
+        if config is not _MISSING:
+            eviction = cls.eviction
+            if eviction is None or eviction.hit(config_name):
+                return config if schema is None else cls._bind(config_name, config, schema)
+            cls._evict_expired(config_name, config)
+        if not allow_lazy_load:
+            critical(f'Configuration "{config_name}" cannot be found. Lazy load is not allowed in this context.',
+                     ConfigurationNotFoundError)
+        config = cls._lazy_load(config_name)
+        return config if schema is None else cls._bind(config_name, config, schema)
+
+    @classmethod
+    def _bind(cls, config_name: str, config: ConfigurationItem, schema: type) -> Any:
+        """
+        Bind a configuration to a schema, or get the result of the previous bind if the configuration did not change.
+
+        :param config_name: The name of the configuration.
+        :type config_name: str
+        :param config: The configuration.
+        :type config: ConfigurationItem
+        :param schema: The schema.
+        :type schema: type
+        :return: The bound configuration.
+        :rtype: Any
+        :raises ConfigurationBindingError: If the configuration does not match the schema.
+        """
+        bound = cls._bound.get(config_name)
+        if bound is not None:
+            entry = bound.get(schema)
+            if entry is not None and entry[0] is config:
+                return entry[1]
+        result = bind(config, schema)
+        with cls._lock:
+            if cls.configurations.get(config_name) is config:
+                cls._bound.setdefault(config_name, {})[schema] = (config, result)
+        return result
+
+    @classmethod
+    def _lazy_load(cls, config_name: str) -> ConfigurationItem:
+        """
+        Lazy load a configuration with the default loader and add it to the collection. If the configuration is
+        already being loaded by another thread, wait for that load instead of starting a new one.
+
+        :param config_name: The name of the configuration to load.
+        :type config_name: str
+        :return: The loaded configuration.
+        :rtype: ConfigurationItem
+        """
+        with cls._lock:
+            config = cls.configurations.get(config_name, _MISSING)
+            if config is not _MISSING:
+                return config
+            flight = cls._flights.get(config_name)
+            if flight is not None:
+                leader = False
+            else:
+                leader = True
+                flight = cls._flights[config_name] = _Flight()
+
+        if not leader:
+            return flight.wait()
+
+        try:
+            flight.result = cls.add_config(cls._get_sync_loader().lazy_load(config_name), config_name)
+            cls._track(config_name, flight.result)
+            return flight.result
+        except (FileNotFoundError, ConfigurationNotFoundError) as error:
+            cls.missing.add(config_name)
+            flight.error = error
+            raise
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with cls._lock:
+                del cls._flights[config_name]
+            flight.event.set()
+
+    @classmethod
+    def try_get_config(cls,
+                       config_name: str = None,
+                       default: Any = None
+                       ) -> Any:
+        """
+        Gets the configuration with the given name, or a default value if it cannot be found, without raising or
+        logging. The names that could not be found are remembered for a while in `missing`, so probing them again
+        does not go through the loader.
+
+        :param config_name: The name of the configuration to get.
+        :type config_name: str
+        :param default: The value to return if the configuration cannot be found.
+        :type default: Any
+        :return: The requested configuration, or the default value.
+        :rtype: Any
+        """
+        if config_name is None:
+            config_name = DEFAULT_CONFIGURATION_NAME
+        config = cls._get_loaded(config_name)
+        if config is not _MISSING:
+            return config
+        if config_name in cls.missing or DEFAULT_LOADER_NAME not in cls.loaders:
+            return default
+        try:
+            return cls._lazy_load(config_name)
+        except (FileNotFoundError, ConfigurationNotFoundError):
+            return default
+
+    @classmethod
+    async def aget_config(cls,
+                          config_name: str = None,
+                          allow_lazy_load: bool = True
+                          ) -> ConfigurationItem:
+        """
+        Gets the configuration with the given name, without blocking the event loop when it must be loaded.
+
+        The configuration is lazy loaded by the default loader: awaited if it is an `AsyncConfigurationLoader`,
+        otherwise run in the executor of the event loop. Concurrent awaits of the same configuration share one load.
+
         :param config_name: The name of the configuration to get.
         :type config_name: str
         :param allow_lazy_load: Whether to allow lazy loading of the configuration if it does not exist.
@@ -159,13 +811,83 @@ class Configurations:
         """
         if config_name is None:
             config_name = DEFAULT_CONFIGURATION_NAME
-        if config_name not in cls.configurations:
-            if not allow_lazy_load:
-                critical(f'Configuration "{config_name}" cannot be found. Lazy load is not allowed in this context.',
-                         ConfigurationNotFoundError)
-            config = cls.get_loader().lazy_load(config_name)
-            cls.add_config(config, config_name)
-        return cls.configurations[config_name]
+        config = cls._get_loaded(config_name)
+        if config is not _MISSING:
+            return config
+        if not allow_lazy_load:
+            critical(f'Configuration "{config_name}" cannot be found. Lazy load is not allowed in this context.',
+                     ConfigurationNotFoundError)
+
+        import asyncio
+        loop = asyncio.get_running_loop()
+        task = cls._async_flights.get(config_name)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(cls._alazy_load(config_name))
+            cls._async_flights[config_name] = task
+        return await asyncio.shield(task)
+
+    @classmethod
+    async def _alazy_load(cls, config_name: str) -> ConfigurationItem:
+        """
+        Lazy load a configuration with the default loader and add it to the collection, from the event loop.
+
+        :param config_name: The name of the configuration to load.
+        :type config_name: str
+        :return: The loaded configuration.
+        :rtype: ConfigurationItem
+        """
+        import asyncio
+        import inspect
+        try:
+            loader = cls.get_loader()
+            if not inspect.iscoroutinefunction(loader.lazy_load):
+                return await asyncio.get_running_loop().run_in_executor(None, cls._lazy_load, config_name)
+            config = await loader.lazy_load(config_name)
+            with cls._lock:
+                # Another task or thread may have loaded the configuration during the await.
+                loaded = cls.configurations.get(config_name, _MISSING)
+                if loaded is not _MISSING:
+                    return loaded
+                config, _ = cls._store_config(config, config_name, False)
+            cls._track(config_name, config)
+            return config
+        finally:
+            if cls._async_flights.get(config_name) is asyncio.current_task():
+                del cls._async_flights[config_name]
+
+    @classmethod
+    async def aload_config(cls,
+                           config_name: str = None,
+                           loader_name: str = None,
+                           allow_overwrite: bool = False,
+                           **parameters,
+                           ) -> ConfigurationItem:
+        """
+        Load a configuration like `load_config`, without blocking the event loop.
+
+        :param config_name: The name to use for the loaded configuration. Defaults to `DEFAULT_CONFIGURATION_NAME`.
+        :type config_name: str, optional
+        :param loader_name: The name of the loader to use for loading the configuration. Defaults to `DEFAULT_LOADER_NAME`.
+        :type loader_name: str, optional
+        :param allow_overwrite: Whether to allow overwriting an existing configuration with the same name.
+                                Defaults to `False`.
+        :type allow_overwrite: bool, optional
+        :param **parameters: Additional parameters to pass to the loader when loading the configuration.
+        :type **parameters: dict, optional
+        :return: The loaded configuration item.
+        :rtype: ConfigurationItem
+        :raises ConfigurationLoadingError: If an error occurs while loading the configuration.
+        """
+        if config_name is None:
+            config_name = DEFAULT_CONFIGURATION_NAME
+        import inspect
+        loader = cls.get_loader(loader_name)
+        if inspect.iscoroutinefunction(loader.load):
+            config = await loader.load(**parameters)
+        else:
+            import asyncio
+            config = await asyncio.get_running_loop().run_in_executor(None, lambda: loader.load(**parameters))
+        return cls.add_config(config, config_name=config_name, allow_overwrite=allow_overwrite)
 
     @classmethod
     def get_loader(cls,
@@ -187,6 +909,24 @@ class Configurations:
             critical(f'Loader "{loader_name}" cannot be found.', ConfigurationLoaderNotFoundError)
         return cls.loaders[loader_name]
 
+    @classmethod
+    def _get_sync_loader(cls, loader_name: str = None) -> ConfigurationLoader:
+        """
+        Get a configuration loader for a synchronous load.
+
+        :param loader_name: The name of the configuration loader. Defaults to `DEFAULT_LOADER_NAME`.
+        :type loader_name: str
+        :return: The configuration loader.
+        :rtype: ConfigurationLoader
+        :raises ConfigurationLoaderNotFoundError: If a configuration loader with the given name is not found.
+        :raises ArgumentError: If the loader is an `AsyncConfigurationLoader`.
+        """
+        loader = cls.get_loader(loader_name)
+        if isinstance(loader, AsyncConfigurationLoader):
+            critical(f'Loader "{loader_name or DEFAULT_LOADER_NAME}" is asynchronous: load its configurations with '
+                     f'`aget_config` or `aload_config`.', ArgumentError)
+        return loader
+
     @classmethod
     def is_configuration_loaded(cls, name: str) -> bool:
         """
@@ -210,3 +950,18 @@ class Configurations:
         :rtype: bool
         """
         return name in cls.loaders
+
+    @classmethod
+    def _after_fork(cls):
+        """
+        Reset the lock and forget the loads in progress in a forked child: the threads of the parent that held them
+        do not exist in the child.
+
+        :return: None
+        """
+        cls._lock = threading.RLock()
+        cls._flights = {}
+        cls._async_flights = {}
+
+
+track_fork(Configurations)
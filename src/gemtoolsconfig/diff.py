@@ -0,0 +1,167 @@
+from collections.abc import Mapping
+from typing import Any, Callable, Optional
+
+from .frozen import FrozenConfiguration, thaw
+from .subtree import KeyPath, split_key_path
+
+KeyTuple = tuple[Any, ...]
+
+ChangeCallback = Callable[[str, Any, Any], None]
+"""
+A change callback is called with the name of a replaced configuration, and the previous and new values at the key
+path it subscribed to (None where the path does not exist).
+"""
+
+
+class ConfigurationDiff:
+    """
+    The structural difference between two configuration items, as key paths (tuples of keys).
+
+    - changed: The paths whose value changed. A value that is a mapping in both items is compared key by key, so
+      only its changed descendants are listed.
+    - added: The paths of the new keys.
+    - removed: The paths of the removed keys.
+
+    A value that is not a mapping, such as a list, is compared as a whole. When one of the items is not a mapping,
+    the root path () is changed.
+    """
+    __slots__ = ('changed', 'added', 'removed', '_paths', '_prefixes')
+
+    def __init__(self, changed: list[KeyTuple], added: list[KeyTuple], removed: list[KeyTuple]):
+        """
+        ConfigurationDiff constructor. Use `diff_configurations` to compare two configuration items.
+
+        :param changed: The paths whose value changed.
+        :type changed: list[KeyTuple]
+        :param added: The paths of the new keys.
+        :type added: list[KeyTuple]
+        :param removed: The paths of the removed keys.
+        :type removed: list[KeyTuple]
+        """
+        self.changed = changed
+        self.added = added
+        self.removed = removed
+        self._paths = {*changed, *added, *removed}
+        self._prefixes = {path[:length] for path in self._paths for length in range(len(path) + 1)}
+
+    def __bool__(self) -> bool:
+        return bool(self._paths)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(changed={self.changed!r}, added={self.added!r}, removed={self.removed!r})'
+
+    def affects(self, path: Optional[KeyPath] = None) -> bool:
+        """
+        Check whether the value at a key path differs: the path, one of its descendants or one of its ancestors is
+        changed, added or removed.
+
+        :param path: The key path, as a dotted string or a sequence of keys. Defaults to the root.
+        :type path: Optional[KeyPath]
+        :return: Whether the value at the key path differs.
+        :rtype: bool
+        """
+        keys = () if path is None else split_key_path(path)
+        if keys in self._prefixes:
+            return True
+        return any(keys[:length] in self._paths for length in range(len(keys)))
+
+
+def values_equal(value: Any, other: Any) -> bool:
+    """
+    Check whether two configuration values are equal, a frozen value being equal to its thawed value (e.g. a tuple
+    to the list it was frozen from). The values are thawed only when they are not equal as they are.
+
+    :param value: The first value.
+    :type value: Any
+    :param other: The second value.
+    :type other: Any
+    :return: Whether the values are equal.
+    :rtype: bool
+    """
+    if value == other:
+        return True
+    return (type(value) is tuple or type(other) is tuple) and thaw(value) == thaw(other)
+
+
+def _compare(old: Mapping, new: Mapping, prefix: KeyTuple, diff: tuple[list, list, list]):
+    """
+    Compare two mappings key by key. The values that are the same object, or that are equal, are not walked: a
+    dictionary comparison runs in C, and frozen configurations compare their hashes first when both are computed.
+
+    :param old: The previous mapping.
+    :type old: Mapping
+    :param new: The new mapping.
+    :type new: Mapping
+    :param prefix: The key path of the mappings.
+    :type prefix: KeyTuple
+    :param diff: The changed, added and removed paths to fill.
+    :type diff: tuple[list, list, list]
+    :return: None
+    """
+    changed, added, removed = diff
+    # The items of frozen configurations are read from their dictionaries, without the Mapping methods.
+    old = old._data if type(old) is FrozenConfiguration else old  # NOQA
+    new = new._data if type(new) is FrozenConfiguration else new  # NOQA
+    for key, value in old.items():
+        if key not in new:
+            removed.append(prefix + (key,))
+            continue
+        other = new[key]
+        if value is other:
+            continue
+        if isinstance(value, Mapping) and isinstance(other, Mapping):
+            if value != other:
+                _compare(value, other, prefix + (key,), diff)
+        elif not values_equal(value, other):
+            changed.append(prefix + (key,))
+    for key in new:
+        if key not in old:
+            added.append(prefix + (key,))
+
+
+def diff_configurations(old: Any, new: Any) -> ConfigurationDiff:
+    """
+    Compute the structural difference between two configuration items.
+
+    Only the mappings that differ are walked key by key. The subtrees that are the same object are skipped, and the
+    others are compared as a whole first: in C for dictionaries, by their cached hashes, when they are computed, for
+    frozen configurations.
+    The cost depends on the size of the changes more than on the size of the items. The values are compared by
+    equality, so 1 and 1.0 are the same value, and a frozen value is the same as its thawed value (see
+    `values_equal`).
+
+    :param old: The previous configuration item.
+    :type old: Any
+    :param new: The new configuration item.
+    :type new: Any
+    :return: The difference.
+    :rtype: ConfigurationDiff
+    """
+    diff = ([], [], [])
+    if old is new:
+        pass
+    elif isinstance(old, Mapping) and isinstance(new, Mapping):
+        _compare(old, new, (), diff)
+    elif not values_equal(old, new):
+        diff[0].append(())
+    return ConfigurationDiff(*diff)
+
+
+def get_path_value(item: Any, keys: KeyTuple, default: Any = None) -> Any:
+    """
+    Get the value at a key path of a configuration item.
+
+    :param item: The configuration item.
+    :type item: Any
+    :param keys: The keys of the path.
+    :type keys: KeyTuple
+    :param default: The value to return if the path does not exist.
+    :type default: Any
+    :return: The value.
+    :rtype: Any
+    """
+    for key in keys:
+        if not isinstance(item, Mapping) or key not in item:
+            return default
+        item = item[key]
+    return item
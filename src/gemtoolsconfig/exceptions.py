@@ -34,6 +34,34 @@ class ConfigurationLoadingError(Exception):
     """
 
 
+class ConfigurationBulkLoadingError(ConfigurationLoadingError):
+    """Raised when some configurations of a bulk load fail to load.
+
+    The configurations that loaded successfully are registered anyway. The
+    `loaded` attribute maps their names to their configuration, and the
+    `errors` attribute maps the names of the failed ones to their error.
+
+    """
+
+    def __init__(self, msg: str, loaded: dict, errors: dict[str, Exception]):
+        super().__init__(msg)
+        self.loaded = loaded
+        self.errors = errors
+
+
+class ConfigurationBindingError(ConfigurationLoadingError):
+    """Raised when a configuration does not match the schema it is bound to.
+
+    The `path` attribute is the key path of the value that does not match
+    (e.g. "servers[2].port"), or "<root>" for the configuration itself.
+
+    """
+
+    def __init__(self, msg: str, path: str):
+        super().__init__(msg)
+        self.path = path
+
+
 class ConfigurationLoaderNotFoundError(Exception):
     """Raised when a configuration loader cannot be found.
 
@@ -0,0 +1,40 @@
+import logging
+import os
+import weakref
+from typing import Any
+
+_tracked: weakref.WeakSet = weakref.WeakSet()
+
+
+def track_fork(item: Any) -> Any:
+    """
+    Reset an object in the child processes forked after this call, by calling its `_after_fork` method.
+
+    The threads of the parent do not exist in a forked child, so a lock they held stays locked forever, and their
+    work in progress never ends. `_after_fork` replaces the locks and forgets the state owned by those threads. The
+    objects are tracked by weak references.
+
+    :param item: The object (or class) to reset, with an `_after_fork` method.
+    :type item: Any
+    :return: The object.
+    :rtype: Any
+    """
+    _tracked.add(item)
+    return item
+
+
+def _after_fork_in_child():
+    """
+    Reset the tracked objects in a forked child.
+
+    :return: None
+    """
+    for item in list(_tracked):
+        try:
+            item._after_fork()  # NOQA
+        except Exception as error:  # NOQA
+            logging.error(f'Cannot reset {item!r} after fork: {error}')
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,184 @@
+import sys
+from collections.abc import Mapping
+from typing import Any, Iterator, Optional
+
+_MISSING = object()
+
+PATH_SEPARATOR = '.'
+
+
+class FrozenConfiguration(Mapping):
+    """
+    An immutable configuration item, safe to share between threads without copies.
+
+    Nested dictionaries are frozen too and lists become tuples. The string keys are interned, so the configurations
+    that share key names share their strings. The root item holds a flat index of every dotted key path, so
+    `config.get('debug.level')` is a single lookup instead of one lookup per level.
+
+    A frozen configuration is hashable when its values are. Its hash is computed once, and two frozen configurations
+    whose hashes are computed are compared by their hashes first. A frozen configuration equals its thawed value: it
+    is compared to another mapping as regular dictionaries and lists.
+    """
+    __slots__ = ('_data', '_index', '_hash')
+
+    def __init__(self, data: dict, index: Optional[dict] = None):
+        """
+        FrozenConfiguration constructor. Use `freeze` to build a frozen configuration from a regular one.
+
+        :param data: The frozen values, by key.
+        :type data: dict
+        :param index: The flat index of the key paths, for a root item.
+        :type index: dict, optional
+        """
+        self._data = data
+        self._index = index
+        self._hash = None
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self._data!r})'
+
+    def __hash__(self) -> int:
+        value = self._hash
+        if value is None:
+            value = self._hash = hash(frozenset(self._data.items()))
+        return value
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if type(other) is not FrozenConfiguration:
+            # The lists of the other mapping are tuples here, so the values are compared thawed when they differ.
+            equal = Mapping.__eq__(self, other)
+            return equal if equal is not False else thaw(self) == other
+        if self._hash is not None and other._hash is not None and self._hash != other._hash:
+            return False
+        return self._data == other._data
+
+    def __reduce__(self):
+        # The cached hash is not pickled: the hashes of strings change between processes.
+        return FrozenConfiguration, (self._data, self._index)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Get a value by its key, or by a dotted key path (e.g. "debug.level").
+
+        :param key: The key, or the key path.
+        :type key: Any
+        :param default: The value to return if the key cannot be found.
+        :type default: Any
+        :return: The value.
+        :rtype: Any
+        """
+        if self._index is not None:
+            return self._index.get(key, default)
+
+        value = self._data.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if not isinstance(key, str) or PATH_SEPARATOR not in key:
+            return default
+
+        value = self
+        for part in key.split(PATH_SEPARATOR):
+            if not isinstance(value, FrozenConfiguration):
+                return default
+            value = value._data.get(part, _MISSING)
+            if value is _MISSING:
+                return default
+        return value
+
+    def thaw(self) -> dict:
+        """
+        Get a mutable copy of the configuration, made of regular dictionaries and lists.
+
+        :return: The mutable copy.
+        :rtype: dict
+        """
+        return thaw(self)
+
+
+def _freeze_value(value: Any) -> Any:
+    """
+    Freeze a value of a configuration, without index.
+
+    :param value: The value to freeze.
+    :type value: Any
+    :return: The frozen value.
+    :rtype: Any
+    """
+    if isinstance(value, dict):
+        return FrozenConfiguration({
+            sys.intern(key) if type(key) is str else key: _freeze_value(item) for key, item in value.items()
+        })
+    if isinstance(value, list):
+        return tuple(_freeze_value(item) for item in value)
+    return value
+
+
+def _build_index(item: FrozenConfiguration, index: dict, prefix: str = None):
+    """
+    Add the key paths of a frozen configuration to a flat index.
+
+    :param item: The frozen configuration.
+    :type item: FrozenConfiguration
+    :param index: The index to fill.
+    :type index: dict
+    :param prefix: The key path of the configuration, None for the root.
+    :type prefix: str, optional
+    :return: None
+    """
+    for key, value in item._data.items():
+        path = key if prefix is None else f'{prefix}{PATH_SEPARATOR}{key}'
+        index.setdefault(path, value)
+        if isinstance(value, FrozenConfiguration):
+            _build_index(value, index, str(path))
+
+
+def freeze(item: Any) -> Any:
+    """
+    Get the immutable representation of a configuration item: a `FrozenConfiguration` for a dictionary, a tuple for
+    a list. An item already frozen is returned as is.
+
+    :param item: The configuration item.
+    :type item: Any
+    :return: The frozen configuration item.
+    :rtype: Any
+    """
+    if isinstance(item, FrozenConfiguration):
+        if item._index is None:
+            item = FrozenConfiguration(item._data, {})
+            _build_index(item, item._index)
+        return item
+    frozen = _freeze_value(item)
+    if isinstance(frozen, FrozenConfiguration):
+        frozen._index = {}
+        _build_index(frozen, frozen._index)
+    return frozen
+
+
+def thaw(item: Any) -> Any:
+    """
+    Get a mutable copy of a frozen configuration item, made of regular dictionaries and lists.
+
+    :param item: The frozen configuration item.
+    :type item: Any
+    :return: The mutable copy.
+    :rtype: Any
+    """
+    if isinstance(item, FrozenConfiguration):
+        return {key: thaw(value) for key, value in item._data.items()}
+    if isinstance(item, tuple):
+        return [thaw(value) for value in item]
+    return item
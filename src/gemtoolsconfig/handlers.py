@@ -1,13 +1,17 @@
 import os
+import time
 from functools import partial
 from os import PathLike
 from pathlib import Path
 from typing import Callable, Union
 from typing import Any
 
-from gemtoolsio import load_string, load_file, load_encrypted_file
-
+from .backends import get_parser, parse, validate_backends
+from .cache import FileCache, DecryptionCache
 from .exceptions import critical, ArgumentError
+from .lazy import LAZY_EXTENSIONS, load_lazy
+from .mapped import load_mapped
+from .subtree import load_subtree, select_subtree
 
 KEY_RESULT = '__result__'
 
@@ -15,9 +19,88 @@ DEFAULT_PATH = '.'
 
 DEFAULT_CONFIG_PATH = 'config.toml'
 
+EXTENSION_PRIORITY = ['.toml', '.yaml', '.yml', '.json', '.ini']
+"""
+The order in which the configuration files of the same name are chosen, when several exist (e.g. "app.toml" and
+"app.yaml"). Files with another extension come after, in alphabetical order.
+"""
+
 _MISSING = object()
 
 
+def load_string(text: Union[str, bytes], file_format: str, backends: dict[str, str] = None) -> Any:
+    """
+    Parse configuration data with the fastest installed parser of its format, or with gemtoolsio (see
+    `backends.get_parser`). The parser is imported on the first call for the format: the processes that do not parse
+    configurations do not import the parsers, nor the cryptography of gemtoolsio.
+
+    :param text: The configuration data, as a string or as UTF-8 bytes.
+    :type text: Union[str, bytes]
+    :param file_format: The format of the data (e.g. ".toml").
+    :type file_format: str
+    :param backends: The backend to use by format (e.g. {".json": "json"}). Defaults to the fastest installed ones.
+    :type backends: dict[str, str], optional
+    :return: The parsed configuration data.
+    :rtype: Any
+    """
+    return parse(text, file_format, backends)
+
+
+def load_file(file_path: Path, backends: dict[str, str] = None) -> Any:
+    """
+    Load a configuration file with the parser of its format (see `load_string`). The file is read as UTF-8 bytes,
+    unless the format is parsed by gemtoolsio, which reads the file itself (see `backends.GEMTOOLSIO_BACKENDS`).
+
+    :param file_path: The path of the file.
+    :type file_path: Path
+    :param backends: The backend to use by format. Defaults to the fastest installed ones.
+    :type backends: dict[str, str], optional
+    :return: The parsed configuration data.
+    :rtype: Any
+    """
+    parser = get_parser(file_path.suffix, backends)
+    if getattr(parser, 'gemtoolsio', False) is True:
+        from gemtoolsio import load_file as load
+        return load(file_path)
+    return parse(file_path.read_bytes(), file_path.suffix, backends)
+
+
+def load_encrypted_file(file_path: Path, key: bytes) -> Any:
+    """
+    Load an encrypted configuration file with gemtoolsio, imported on the first call (see `load_string`).
+
+    :param file_path: The path of the file.
+    :type file_path: Path
+    :param key: The encryption key.
+    :type key: bytes
+    :return: The parsed configuration data.
+    :rtype: Any
+    """
+    from gemtoolsio import load_encrypted_file as load
+    return load(file_path, key=key)
+
+
+def _check_choices(name: str, value: Any, choices: Any):
+    """
+    Raise an ArgumentError if a value is not one of the valid choices.
+
+    :param name: The name of the argument.
+    :type name: str
+    :param value: The value of the argument.
+    :type value: Any
+    :param choices: The valid choices.
+    :type choices: Any
+    :return: None
+    :raises: ArgumentError: If the value is not one of the choices.
+    """
+    try:
+        valid = value in choices
+    except TypeError:
+        valid = False
+    if not valid:
+        critical(f'Argument "{name}" must be one of {sorted(choices, key=repr)}, got {value!r}.', ArgumentError)
+
+
 def get_argument(kwargs: dict,
                  name: str,
                  default: Any = _MISSING,
@@ -43,13 +126,60 @@ def get_argument(kwargs: dict,
     """
     value = kwargs.get(name, default)
     if value is _MISSING:
-        critical(f'Missing required argument "{name}" in {kwargs}.', ArgumentError)
+        critical(f'Missing required argument "{name}", got the arguments {list(kwargs)}.', ArgumentError)
     if choices is not None and value not in choices:
         critical(f'Argument "{name}" must be one of {choices}, got {value}.', ArgumentError)
 
     return value
 
 
+def get_argument_getter(name: str,
+                        default: Any = _MISSING,
+                        choices: list[Any] = None
+                        ) -> Callable[[dict], Any]:
+    """
+    Get a function that returns the value of an argument, like `get_argument`, with the default value and the valid
+    choices resolved once. Handlers build their getters when they are created, so each call only does the lookup.
+
+    :param name: The name of the argument to retrieve.
+    :type name: str
+    :param default: The default value to return if the argument is not present. Defaults to _MISSING, which
+                    indicates that the argument is required.
+    :type default: Any, optional
+    :param choices: The valid choices for the argument value. They are turned into a frozenset when they are
+                    hashable.
+    :type choices: list[Any], optional
+    :return: A callable that takes a dictionary of keyword arguments and returns the value of the argument.
+    :rtype: Callable[[dict], Any]
+    :raises: ArgumentError: When called, if the argument is required and missing, or if its value is not one of the
+             valid choices.
+    """
+    if choices is not None:
+        try:
+            choices = frozenset(choices)
+        except TypeError:
+            choices = tuple(choices)
+
+    if default is _MISSING:
+        def getter(kwargs: dict) -> Any:
+            value = kwargs.get(name, _MISSING)
+            if value is _MISSING:
+                critical(f'Missing required argument "{name}", got the arguments {list(kwargs)}.', ArgumentError)
+            if choices is not None:
+                _check_choices(name, value, choices)
+            return value
+    elif choices is None:
+        def getter(kwargs: dict) -> Any:
+            return kwargs.get(name, default)
+    else:
+        def getter(kwargs: dict) -> Any:
+            value = kwargs.get(name, default)
+            _check_choices(name, value, choices)
+            return value
+
+    return getter
+
+
 LoadingHandler = Callable[[dict], dict]
 """
 A loading handler is a callable that takes a dictionary containing configuration data as input
@@ -68,6 +198,11 @@ filter configuration data lazily, i.e. on-demand when the data is accessed for t
 """
 
 
+_get_text = get_argument_getter('text')
+
+_get_format = get_argument_getter('format')
+
+
 def from_source(params: dict) -> dict:
     """
     Load configuration data from a string source.
@@ -80,48 +215,295 @@ def from_source(params: dict) -> dict:
     :return: A dictionary containing the loaded configuration data under the KEY_RESULT key.
     :rtype: dict
     """
-    source_text = get_argument(params, 'text')
-    source_format = get_argument(params, 'format')
-    params[KEY_RESULT] = load_string(source_text, source_format)
+    params[KEY_RESULT] = load_string(_get_text(params), _get_format(params))
     return params
 
 
-def get_file_handler(directory: Union[PathLike, str] = DEFAULT_PATH, key: bytes = None) -> LoadingHandler:
+def _get_decrypting_load(key: bytes,
+                         decryption_cache: DecryptionCache,
+                         backends: dict[str, str] = None
+                         ) -> Callable[[Path], Any]:
+    """
+    Get a function that loads an encrypted configuration file through a decryption cache. The same cipher object
+    decrypts every file.
+
+    :param key: The encryption key.
+    :type key: bytes
+    :param decryption_cache: The cache of the decrypted and parsed configurations.
+    :type decryption_cache: DecryptionCache
+    :param backends: The backend to use by format. Defaults to the fastest installed ones.
+    :type backends: dict[str, str], optional
+    :return: A callable that takes the path of an encrypted file and returns its configuration data.
+    :rtype: Callable[[Path], Any]
+    """
+    from cryptography.fernet import Fernet
+    cipher = Fernet(key)
+
+    def load(file_path: Path) -> Any:
+        ciphertext = file_path.read_bytes()
+        result = decryption_cache.get(ciphertext)
+        if result is None:
+            result = load_string(cipher.decrypt(ciphertext), file_path.suffix, backends)
+            decryption_cache.put(ciphertext, result)
+        return result
+
+    return load
+
+
+def get_file_handler(directory: Union[PathLike, str] = DEFAULT_PATH,
+                     key: bytes = None,
+                     cache: FileCache = None,
+                     decryption_cache: DecryptionCache = None,
+                     memory_map: bool = False,
+                     lazy: bool = False,
+                     backends: dict[str, str] = None
+                     ) -> LoadingHandler:
     """
     Get a handler for loading configuration data from a file.
 
+    With a "subtree" parameter (a dotted key path such as "routing.eu", or a list of keys), only this section of the
+    file is returned. Plain JSON files are scanned without being fully parsed, the other files are fully parsed (see
+    `load_subtree`).
+
     :param directory: The directory where the configuration file is located. Defaults to the current directory.
     :type directory: Union[PathLike, str]
     :param key: Optional encryption key for encrypted configuration files. Defaults to None.
     :type key: bytes, optional
+    :param cache: Optional on-disk cache of the parsed files. A file is parsed only if its cache entry is missing or
+                  outdated. It cannot be used with an encryption key. Defaults to None.
+    :type cache: FileCache, optional
+    :param decryption_cache: Optional memory-only cache of the decrypted and parsed files, used with an encryption
+                             key. An encrypted file is decrypted and parsed only if its ciphertext is not cached.
+                             Defaults to None.
+    :type decryption_cache: DecryptionCache, optional
+    :param memory_map: Whether to read the plain JSON files through a memory map, parsed without intermediate copies
+                       when orjson is installed (see `load_mapped`). Defaults to False.
+    :type memory_map: bool, optional
+    :param lazy: Whether to load the plain JSON files as `LazyConfiguration` items, decoded on access (see
+                 `load_lazy`). It takes precedence over `memory_map`. These files are not stored in the file cache,
+                 which would return them as regular dictionaries. Defaults to False.
+    :type lazy: bool, optional
+    :param backends: The parser to use by format (e.g. {".yaml": "yaml"}), by backend name (see
+                     `backends.get_parser`). The other formats are parsed by their fastest installed backend. The
+                     files loaded by gemtoolsio with an encryption key and no decryption cache are not concerned.
+                     Defaults to None.
+    :type backends: dict[str, str], optional
     :return: A callable that takes a dictionary containing parameters for loading configuration data
              from a file, and returns a dictionary containing the loaded configuration data under
              the KEY_RESULT key.
     :rtype: LoadingHandler
     :raises: NotADirectoryError if the specified directory does not exist.
+    :raises: ArgumentError if both an encryption key and a cache are given, or if a backend is unknown.
     """
     directory = Path(directory)
     if not directory.exists():
         critical(str(directory), NotADirectoryError)
-
-    if key is not None:
+    if key is not None and cache is not None:
+        critical('Encrypted configuration files cannot be stored in the file cache.', ArgumentError)
+    if backends is not None:
+        validate_backends(backends)
+
+    if key is not None and decryption_cache is not None:
+        load = _get_decrypting_load(key, decryption_cache, backends)
+    elif key is not None:
         load = partial(load_encrypted_file, key=key)
     else:
-        load = load_file
+        load = load_file if backends is None else partial(load_file, backends=backends)
+        if lazy:
+            load = partial(load_lazy, load=load, backends=backends)
+        elif memory_map:
+            load = partial(load_mapped, load=load, backends=backends)
+
+    get_path = get_argument_getter('path', DEFAULT_CONFIG_PATH)
+    get_subtree = get_argument_getter('subtree', None)
 
     def handler(params: dict) -> dict:
-        file_path = directory / get_argument(params, 'path', DEFAULT_CONFIG_PATH)
+        file_path = directory / get_path(params)
         params['full_path'] = file_path
-        params[KEY_RESULT] = load(file_path)
+        subtree = get_subtree(params)
+        if subtree is None:
+            params[KEY_RESULT] = load(file_path)
+        elif key is None:
+            params[KEY_RESULT] = load_subtree(file_path, subtree, load, backends)
+        else:
+            params[KEY_RESULT] = select_subtree(load(file_path), subtree, file_path)
+        return params
+
+    def cached_handler(params: dict) -> dict:
+        file_path = directory / get_path(params)
+        if lazy and file_path.suffix.lower() in LAZY_EXTENSIONS:
+            return handler(params)
+        params['full_path'] = file_path
+        result = cache.get(file_path)
+        if result is None:
+            stat = os.stat(file_path)
+            result = load(file_path)
+            cache.put(file_path, result, stat)
+        subtree = get_subtree(params)
+        params[KEY_RESULT] = result if subtree is None else select_subtree(result, subtree, file_path)
+        return params
+
+    return handler if cache is None else cached_handler
+
+
+def get_environ_handler(prefix: str, separator: str = '__') -> LoadingHandler:
+    """
+    Get a handler for loading configuration data from the environment variables that start with a prefix.
+
+    The prefix is removed and the rest of the variable name is split on the separator to build nested sections, in
+    lower case: with the prefix "APP_", the variable "APP_DB__HOST" becomes {'db': {'host': ...}}. The values are
+    strings.
+
+    :param prefix: The prefix of the environment variables.
+    :type prefix: str
+    :param separator: The separator of the nested sections. Defaults to "__".
+    :type separator: str
+    :return: A callable that returns a dictionary containing the configuration data built from the environment
+             variables under the KEY_RESULT key.
+    :rtype: LoadingHandler
+    """
+
+    def handler(params: dict) -> dict:
+        result = {}
+        for name, value in sorted(os.environ.items()):
+            if not name.startswith(prefix) or name == prefix:
+                continue
+            *sections, key = name[len(prefix):].lower().split(separator)
+            node = result
+            for section in sections:
+                child = node.get(section)
+                if not isinstance(child, dict):
+                    child = node[section] = {}
+                node = child
+            node[key] = value
+        params[KEY_RESULT] = result
         return params
 
     return handler
 
 
+class _DirectoryIndex:
+    """
+    The files of a directory, indexed by name and by stem.
+    """
+    __slots__ = ('mtime_ns', 'built_ns', 'files', 'stems')
+
+    def __init__(self, mtime_ns: int, built_ns: int, files: frozenset[str], stems: dict[str, str]):
+        self.mtime_ns = mtime_ns
+        self.built_ns = built_ns
+        self.files = files
+        self.stems = stems
+
+
+_directory_indexes: dict[str, _DirectoryIndex] = {}
+
+_index_generation = 0
+
+_RACY_DELAY_NS = 2_000_000_000
+"""
+The delay after the last modification of a directory during which its index is not trusted, in nanoseconds (see
+`_get_directory_index`).
+"""
+
+
+def _file_priority(filename: str) -> tuple[int, str]:
+    """
+    Get the sort key of a configuration file among the files of the same stem.
+
+    :param filename: The name of the file.
+    :type filename: str
+    :return: The rank of its extension in EXTENSION_PRIORITY, then its name.
+    :rtype: tuple[int, str]
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in EXTENSION_PRIORITY:
+        return EXTENSION_PRIORITY.index(extension), filename
+    return len(EXTENSION_PRIORITY), filename
+
+
+def _get_directory_index(directory: Path) -> _DirectoryIndex:
+    """
+    Get the index of a directory. It is built once and rebuilt when the modification time of the directory changes.
+
+    An index built less than two seconds after the last modification of the directory is rebuilt on its next use,
+    because a file added within the same timestamp tick would not change the modification time.
+
+    :param directory: The directory to index.
+    :type directory: Path
+    :return: The index of the directory.
+    :rtype: _DirectoryIndex
+    """
+    global _index_generation
+    key = os.fspath(directory)
+    mtime_ns = os.stat(key).st_mtime_ns
+    index = _directory_indexes.get(key)
+    if index is not None and index.mtime_ns == mtime_ns and index.built_ns - mtime_ns > _RACY_DELAY_NS:
+        return index
+
+    built_ns = time.time_ns()
+    filenames = []
+    for filename in os.listdir(key):
+        if isinstance(filename, bytes):
+            filename = filename.decode()
+        filenames.append(filename)
+
+    stems = {}
+    for filename in sorted(filenames, key=_file_priority):
+        stems.setdefault(filename.split('.')[0], filename)
+    files = frozenset(filenames)
+    if index is not None and index.files != files:
+        _index_generation += 1
+    index = _DirectoryIndex(mtime_ns, built_ns, files, stems)
+    _directory_indexes[key] = index
+    return index
+
+
+def list_configuration_names(directory: Union[PathLike, str] = DEFAULT_PATH) -> list[str]:
+    """
+    List the configurations of a directory: one per file name without extension, for the files whose extension is in
+    EXTENSION_PRIORITY. The files of the other extensions (e.g. a key file) are ignored.
+
+    :param directory: The directory of the configuration files. Defaults to the current directory.
+    :type directory: Union[PathLike, str]
+    :return: The sorted names of the configurations.
+    :rtype: list[str]
+    """
+    directory = Path(directory)
+    return sorted(stem for stem, filename in _get_directory_index(directory).stems.items()
+                  if os.path.splitext(filename)[1].lower() in EXTENSION_PRIORITY
+                  and (directory / filename).is_file())
+
+
+def get_index_generation() -> int:
+    """
+    Get the generation of the directory indexes. It changes each time the content of an indexed directory changes,
+    so it tells when a configuration that was not found may have been added.
+
+    It checks the modification time of every indexed directory, which costs one stat per directory.
+
+    :return: The generation of the directory indexes.
+    :rtype: int
+    """
+    global _index_generation
+    for key, index in list(_directory_indexes.items()):
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns != index.mtime_ns:
+            _directory_indexes.pop(key, None)
+            _index_generation += 1
+    return _index_generation
+
+
 def _find_suitable_file(directory: Path, config_name: str) -> str:
     """
     Find a suitable configuration file in the specified directory.
 
+    A file named exactly like the configuration is chosen first. Otherwise, the files whose name starts with the
+    configuration name followed by a dot are candidates, chosen by the order of their extension in
+    EXTENSION_PRIORITY. The files of the directory are indexed once, until the directory is modified.
+
     :param directory: The directory where the configuration files are located. Defaults to the current directory.
     :type directory: Union[PathLike, str]
     :param config_name: The name of the configuration file.
@@ -130,16 +512,13 @@ def _find_suitable_file(directory: Path, config_name: str) -> str:
     :rtype: str
     :raises: FileNotFoundError if no suitable configuration file is found in the directory.
     """
-    for filename in os.listdir(directory):
-        if isinstance(filename, bytes):
-            filename = filename.decode()
-
-        if filename == config_name:
-            return config_name
-
-        if filename.split('.')[0] == config_name:
-            return filename
-    raise FileNotFoundError(f'Cannot find a suitable configuration file for "{config_name}" in "{str(directory)}".')
+    index = _get_directory_index(directory)
+    if config_name in index.files:
+        return config_name
+    filename = index.stems.get(config_name)
+    if filename is None:
+        raise FileNotFoundError(f'Cannot find a suitable configuration file for "{config_name}" in "{str(directory)}".')
+    return filename
 
 
 def get_find_suitable_file_handler(directory: Union[PathLike, str] = DEFAULT_PATH) -> LazyHandler:
@@ -157,9 +536,10 @@ def get_find_suitable_file_handler(directory: Union[PathLike, str] = DEFAULT_PAT
     if not directory.exists():
         critical(str(directory), NotADirectoryError)
 
+    get_name = get_argument_getter('name')
+
     def handler(params: dict) -> dict:
-        config_name = get_argument(params, 'name')
-        params['path'] = _find_suitable_file(directory, config_name)
+        params['path'] = _find_suitable_file(directory, get_name(params))
         return params
 
     return handler
@@ -0,0 +1,391 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from os import PathLike
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from .forking import track_fork
+from .handlers import KEY_RESULT
+from .lazy import LazyConfiguration, LazyList
+from .shared import SharedConfiguration, SharedList
+
+STAGE_LAZY = 'lazy'
+
+STAGE_LOADING = 'loading'
+
+DEFAULT_MAX_SAMPLES = 1024
+
+PROMETHEUS_METRIC = 'gemtoolsconfig_handler_duration_seconds'
+
+
+class HandlerEvent:
+    """
+    The measurement of one handler call.
+
+    - stage: STAGE_LAZY or STAGE_LOADING.
+    - handler: The name of the handler.
+    - config_name: The name of the configuration, if the parameters have one.
+    - elapsed_ns: The duration of the call, in nanoseconds.
+    - bytes_read: The size of the file the handler loaded, if it recorded a new "full_path".
+    - result_size: The number of values of the configuration the handler produced, if it changed it. It is None
+      for the lazy and shared configurations, which are not decoded to count them.
+    - error: The exception raised by the handler, if any.
+    """
+    __slots__ = ('stage', 'handler', 'config_name', 'elapsed_ns', 'bytes_read', 'result_size', 'error')
+
+    def __init__(self,
+                 stage: str,
+                 handler: str,
+                 config_name: Optional[str],
+                 elapsed_ns: int,
+                 bytes_read: Optional[int] = None,
+                 result_size: Optional[int] = None,
+                 error: Optional[BaseException] = None
+                 ):
+        self.stage = stage
+        self.handler = handler
+        self.config_name = config_name
+        self.elapsed_ns = elapsed_ns
+        self.bytes_read = bytes_read
+        self.result_size = result_size
+        self.error = error
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}({self.stage}, {self.handler}, {self.config_name}, {self.elapsed_ns}ns, '
+                f'bytes_read={self.bytes_read}, result_size={self.result_size}, error={self.error!r})')
+
+
+PreHook = Callable[[str, str, dict], None]
+"""
+A pre hook is called before each handler with the stage, the name of the handler and the parameters it receives.
+"""
+
+PostHook = Callable[[HandlerEvent], None]
+"""
+A post hook is called after each handler, even a failing one, with the measurement of the call.
+"""
+
+
+def handler_name(handler: Callable) -> str:
+    """
+    Get the name of a handler: its `name` attribute if it has one, else its qualified name (e.g.
+    "get_file_handler.<locals>.handler").
+
+    :param handler: The handler.
+    :type handler: Callable
+    :return: The name of the handler.
+    :rtype: str
+    """
+    name = getattr(handler, 'name', None)
+    if isinstance(name, str):
+        return name
+    function = getattr(handler, 'func', handler)
+    return getattr(function, '__qualname__', None) or repr(handler)
+
+
+_VIEW_TYPES = (LazyConfiguration, LazyList, SharedConfiguration, SharedList)
+"""
+The configuration items decoded on access, which are not walked to count their values: it would decode them.
+"""
+
+
+def _count_values(item: Any) -> Optional[int]:
+    """
+    Count the values of a configuration item, recursively. A lazy or shared view is not counted, and a view nested
+    in a regular item counts as one value, so counting does not decode them.
+
+    :param item: The configuration item.
+    :type item: Any
+    :return: The number of values, or None for a lazy or shared view.
+    :rtype: Optional[int]
+    """
+    if isinstance(item, _VIEW_TYPES):
+        return None
+    return _count_nested(item)
+
+
+def _count_nested(item: Any) -> int:
+    if isinstance(item, _VIEW_TYPES):
+        return 1
+    if isinstance(item, Mapping):
+        return sum(_count_nested(value) for value in item.values())
+    if isinstance(item, (list, tuple)):
+        return sum(_count_nested(value) for value in item)
+    return 1
+
+
+class Instrumentation:
+    """
+    Pre and post hooks called around each handler of the loaders it is given to.
+
+    A loader without instrumentation runs its handlers in a plain loop, so the instrumentation costs nothing when
+    it is not set. The measurement of the bytes read and of the result size is only done for the post hooks.
+    """
+
+    def __init__(self, pre_hooks: list[PreHook] = None, post_hooks: list[PostHook] = None):
+        """
+        Instrumentation constructor.
+
+        :param pre_hooks: The hooks called before each handler.
+        :type pre_hooks: list[PreHook], optional
+        :param post_hooks: The hooks called after each handler.
+        :type post_hooks: list[PostHook], optional
+        """
+        self._pre_hooks = list(pre_hooks or [])
+        self._post_hooks = list(post_hooks or [])
+
+    def add_pre_hook(self, hook: PreHook):
+        """
+        Add a hook called before each handler.
+
+        :param hook: The hook to add.
+        :type hook: PreHook
+        :return: None
+        """
+        self._pre_hooks.append(hook)
+
+    def add_post_hook(self, hook: PostHook):
+        """
+        Add a hook called after each handler.
+
+        :param hook: The hook to add.
+        :type hook: PostHook
+        :return: None
+        """
+        self._post_hooks.append(hook)
+
+    def remove_hook(self, hook: Union[PreHook, PostHook]):
+        """
+        Remove a pre or post hook.
+
+        :param hook: The hook to remove.
+        :type hook: Union[PreHook, PostHook]
+        :return: None
+        """
+        if hook in self._pre_hooks:
+            self._pre_hooks.remove(hook)
+        if hook in self._post_hooks:
+            self._post_hooks.remove(hook)
+
+    def run(self, stage: str, handlers: list[Callable[[dict], dict]], parameters: dict) -> dict:
+        """
+        Run a chain of handlers and call the hooks around each of them.
+
+        :param stage: STAGE_LAZY or STAGE_LOADING.
+        :type stage: str
+        :param handlers: The handlers to run.
+        :type handlers: list[Callable[[dict], dict]]
+        :param parameters: The parameters given to the first handler.
+        :type parameters: dict
+        :return: The parameters returned by the last handler.
+        :rtype: dict
+        """
+        for handler in handlers:
+            name = handler_name(handler)
+            for hook in self._pre_hooks:
+                hook(stage, name, parameters)
+            full_path = parameters.get('full_path')
+            result = parameters.get(KEY_RESULT)
+            error = None
+            start = time.perf_counter_ns()
+            try:
+                parameters = handler(parameters)
+            except BaseException as exception:
+                error = exception
+                raise
+            finally:
+                elapsed_ns = time.perf_counter_ns() - start
+                if self._post_hooks:
+                    self._notify(stage, name, parameters, elapsed_ns, full_path, result, error)
+        return parameters
+
+    def _notify(self,
+                stage: str,
+                name: str,
+                parameters: dict,
+                elapsed_ns: int,
+                full_path: Any,
+                result: Any,
+                error: Optional[BaseException]
+                ):
+        """
+        Measure a handler call and call the post hooks.
+
+        :param stage: STAGE_LAZY or STAGE_LOADING.
+        :type stage: str
+        :param name: The name of the handler.
+        :type name: str
+        :param parameters: The parameters after the call.
+        :type parameters: dict
+        :param elapsed_ns: The duration of the call, in nanoseconds.
+        :type elapsed_ns: int
+        :param full_path: The "full_path" parameter before the call.
+        :type full_path: Any
+        :param result: The configuration before the call.
+        :type result: Any
+        :param error: The exception raised by the handler, if any.
+        :type error: BaseException, optional
+        :return: None
+        """
+        bytes_read = result_size = None
+        if error is None and isinstance(parameters, dict):
+            new_path = parameters.get('full_path')
+            if new_path is not None and new_path is not full_path:
+                try:
+                    bytes_read = os.stat(new_path).st_size
+                except OSError:
+                    pass
+            new_result = parameters.get(KEY_RESULT)
+            if new_result is not None and new_result is not result:
+                result_size = _count_values(new_result)
+        event = HandlerEvent(stage, name, parameters.get('name') if isinstance(parameters, dict) else None,
+                             elapsed_ns, bytes_read, result_size, error)
+        for hook in self._post_hooks:
+            try:
+                hook(event)
+            except Exception as exception:  # NOQA
+                logging.error(f'Instrumentation hook {hook} failed: {exception}')
+
+
+class HandlerStatistics:
+    """
+    A post hook that aggregates the handler durations per handler and configuration name: count, errors, total,
+    p50 and p99. The percentiles are computed on the most recent samples only.
+    """
+
+    def __init__(self, max_samples: int = DEFAULT_MAX_SAMPLES):
+        """
+        HandlerStatistics constructor.
+
+        :param max_samples: The number of recent durations kept per handler and configuration, for the percentiles.
+        :type max_samples: int
+        """
+        self._max_samples = max_samples
+        self._entries: dict[tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+        track_fork(self)
+
+    def _after_fork(self):
+        """
+        Reset the lock in a forked child.
+
+        :return: None
+        """
+        self._lock = threading.Lock()
+
+    def __call__(self, event: HandlerEvent):
+        key = (event.handler, event.config_name or '')
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [0, 0, 0, deque(maxlen=self._max_samples)]
+            entry[0] += 1
+            entry[1] += event.error is not None
+            entry[2] += event.elapsed_ns
+            entry[3].append(event.elapsed_ns)
+
+    def summary(self) -> dict[tuple[str, str], dict]:
+        """
+        Get the aggregated statistics.
+
+        :return: By handler name and configuration name (empty if unknown): the "count", "errors", "total_ns",
+                 "p50_ns" and "p99_ns" of the calls.
+        :rtype: dict[tuple[str, str], dict]
+        """
+        with self._lock:
+            entries = {key: (count, errors, total, sorted(samples))
+                       for key, (count, errors, total, samples) in self._entries.items()}
+        return {key: {'count': count,
+                      'errors': errors,
+                      'total_ns': total,
+                      'p50_ns': _percentile(samples, 0.50),
+                      'p99_ns': _percentile(samples, 0.99)}
+                for key, (count, errors, total, samples) in entries.items()}
+
+    def clear(self):
+        """
+        Forget every measurement.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+def _percentile(samples: list[int], fraction: float) -> int:
+    """
+    Get a percentile of sorted samples, by the nearest rank.
+
+    :param samples: The sorted samples.
+    :type samples: list[int]
+    :param fraction: The percentile, between 0 and 1.
+    :type fraction: float
+    :return: The percentile, or 0 without samples.
+    :rtype: int
+    """
+    if not samples:
+        return 0
+    return samples[min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))]
+
+
+def get_logging_hook(logger: logging.Logger = None,
+                     level: int = logging.DEBUG,
+                     threshold_ns: int = 0
+                     ) -> PostHook:
+    """
+    Get a post hook that logs the handler calls.
+
+    :param logger: The logger. Defaults to the root logger.
+    :type logger: logging.Logger, optional
+    :param level: The level of the messages. The failed calls are logged as warnings. Defaults to DEBUG.
+    :type level: int
+    :param threshold_ns: Only log the calls that last at least this duration, in nanoseconds. Defaults to 0.
+    :type threshold_ns: int
+    :return: The post hook.
+    :rtype: PostHook
+    """
+    if logger is None:
+        logger = logging.getLogger()
+
+    def hook(event: HandlerEvent):
+        if event.elapsed_ns < threshold_ns and event.error is None:
+            return
+        logger.log(logging.WARNING if event.error is not None else level,
+                   '%s handler %s of configuration "%s": %.3f ms, bytes read: %s, result size: %s%s',
+                   event.stage, event.handler, event.config_name, event.elapsed_ns / 1e6, event.bytes_read,
+                   event.result_size, '' if event.error is None else f', error: {event.error!r}')
+
+    return hook
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def write_prometheus(statistics: HandlerStatistics, file_path: Union[PathLike, str]):
+    """
+    Write the aggregated statistics to a file in the Prometheus text format, as a summary metric, for example to be
+    collected by the textfile collector of the node exporter. The file is replaced atomically.
+
+    :param statistics: The aggregated statistics.
+    :type statistics: HandlerStatistics
+    :param file_path: The path of the file.
+    :type file_path: Union[PathLike, str]
+    :return: None
+    """
+    lines = [f'# HELP {PROMETHEUS_METRIC} Duration of the gemtoolsconfig loading handlers.',
+             f'# TYPE {PROMETHEUS_METRIC} summary']
+    for (handler, config_name), entry in sorted(statistics.summary().items()):
+        labels = f'handler="{_escape_label(handler)}",config="{_escape_label(config_name)}"'
+        lines.append(f'{PROMETHEUS_METRIC}{{{labels},quantile="0.5"}} {entry["p50_ns"] / 1e9:.9f}')
+        lines.append(f'{PROMETHEUS_METRIC}{{{labels},quantile="0.99"}} {entry["p99_ns"] / 1e9:.9f}')
+        lines.append(f'{PROMETHEUS_METRIC}_sum{{{labels}}} {entry["total_ns"] / 1e9:.9f}')
+        lines.append(f'{PROMETHEUS_METRIC}_count{{{labels}}} {entry["count"]}')
+    file_path = Path(file_path)
+    temp_path = file_path.with_name(f'{file_path.name}.{os.getpid()}.tmp')
+    temp_path.write_text('\n'.join(lines) + '\n')
+    os.replace(temp_path, file_path)
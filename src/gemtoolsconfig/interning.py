@@ -0,0 +1,210 @@
+import math
+import sys
+import threading
+from operator import is_
+from typing import Any
+
+from .forking import track_fork
+from .frozen import FrozenConfiguration
+
+_CONTAINER_TYPES = frozenset((dict, list, tuple, FrozenConfiguration))
+
+_TABLE_REFERENCES = 4
+"""
+The reference count of a value used by no configuration, while the table is pruned: the key and the value of its
+entry, the loop variable and the argument of `sys.getrefcount`.
+"""
+
+MIN_PRUNE_ENTRIES = 10_000
+"""
+The number of entries under which the table is not pruned automatically.
+"""
+
+_EXACT_TYPES = frozenset((str, int, bool, type(None)))
+"""
+The types whose equal values are interchangeable. The equal values of the other types are compared by `_same`.
+"""
+
+
+def _same(value: Any, other: Any) -> bool:
+    """
+    Check whether a value of the table can replace an equal value of the same type. The items of the containers are
+    already shared, so they must be the same objects, in the same order: equal items that are different objects
+    differ in type, e.g. 1 and True. Equal floats can differ in sign, e.g. 0.0 and -0.0, and equal values of other
+    types by their representation, e.g. datetimes of the same instant in two time zones.
+    """
+    kind = type(value)
+    if kind is FrozenConfiguration:
+        value, other = value._data, other._data  # NOQA
+        return len(value) == len(other) and all(map(is_, value, other)) and all(map(is_, value.values(),
+                                                                                    other.values()))
+    if kind is tuple:
+        return len(value) == len(other) and all(map(is_, value, other))
+    if kind is float:
+        return value != 0 or math.copysign(1, value) == math.copysign(1, other)
+    return repr(value) == repr(other)
+
+
+def _size(value: FrozenConfiguration) -> int:
+    return sys.getsizeof(value) + sys.getsizeof(value._data)  # NOQA
+
+
+class InternTable:
+    """
+    A table of the shared values of configurations (hash-consing), so the configurations that repeat the same
+    sections (e.g. the defaults of many tenants) keep one copy of them.
+
+    A configuration is interned from its leaves up: its keys and values, then each section and list, are replaced by
+    the equal value already in the table, or added to it. A section is found by its items, which are already shared,
+    so they are compared by identity. The interned configurations are made of `FrozenConfiguration` items, without
+    the flat index of the key paths, and tuples, since the shared values must not change. The values are shared only
+    when they are identical: 1, 1.0 and True are not the same value.
+
+    The values that no configuration uses anymore, e.g. after an eviction or a reload, are pruned when the table has
+    doubled since its last pruning (and holds at least MIN_PRUNE_ENTRIES values), so the table stays within twice the
+    size of the loaded values. `prune` removes them at once.
+    """
+
+    def __init__(self):
+        """
+        InternTable constructor.
+        """
+        self._items: dict[type, dict[Any, Any]] = {}
+        self._hits = 0
+        self._saved_bytes = 0
+        self._prune_at = MIN_PRUNE_ENTRIES
+        self._lock = threading.Lock()
+        track_fork(self)
+
+    def _after_fork(self):
+        """
+        Reset the lock in a forked child.
+
+        :return: None
+        """
+        self._lock = threading.Lock()
+
+    def _share(self, value: Any) -> Any:
+        """
+        Get the value of the table equal to a value, or add the value to the table.
+
+        :param value: A scalar, or a container whose items are already shared.
+        :type value: Any
+        :return: The shared value, or the value itself if it is new or cannot be shared.
+        :rtype: Any
+        """
+        kind = type(value)
+        items = self._items.get(kind)
+        if items is None:
+            items = self._items[kind] = {}
+        try:
+            shared = items.setdefault(value, value)
+        except TypeError:
+            return value
+        if shared is value or (kind not in _EXACT_TYPES and not _same(shared, value)):
+            return value
+        self._hits += 1
+        self._saved_bytes += _size(value) if kind is FrozenConfiguration else sys.getsizeof(value)
+        return shared
+
+    def _intern(self, value: Any) -> Any:
+        """
+        Intern a container and its items.
+
+        :param value: The container.
+        :type value: Any
+        :return: The shared container.
+        :rtype: Any
+        """
+        share, intern = self._share, self._intern
+        kind = type(value)
+        if kind is FrozenConfiguration:
+            if self._items.get(kind, {}).get(value) is value:
+                return value
+            value = value._data  # NOQA
+        elif kind is not dict:
+            return share(tuple([intern(item) if type(item) in _CONTAINER_TYPES else share(item) for item in value]))
+        return share(FrozenConfiguration({
+            share(key): intern(item) if type(item) in _CONTAINER_TYPES else share(item) for key, item in value.items()
+        }))
+
+    def intern(self, item: Any) -> Any:
+        """
+        Intern a configuration item. A dictionary becomes a `FrozenConfiguration` and a list a tuple, made of the
+        values of the table. The other items, such as scalars or lazy and shared configurations, are returned as is.
+
+        :param item: The configuration item.
+        :type item: Any
+        :return: The interned configuration item.
+        :rtype: Any
+        """
+        if type(item) not in _CONTAINER_TYPES:
+            return item
+        with self._lock:
+            if len(self) > self._prune_at:
+                self._prune()
+            return self._intern(item)
+
+    def _prune(self) -> int:
+        """
+        Remove the values referenced only by the table. A section is removed before its items, whose references are
+        released with it, so the table is swept until nothing is removed.
+
+        :return: The number of removed values.
+        :rtype: int
+        """
+        removed = 0
+        if hasattr(sys, 'getrefcount'):
+            stale = True
+            while stale:
+                stale = 0
+                for items in self._items.values():
+                    unused = [value for value in items if sys.getrefcount(value) <= _TABLE_REFERENCES]
+                    stale += len(unused)
+                    while unused:
+                        del items[unused.pop()]
+                removed += stale
+        self._prune_at = max(MIN_PRUNE_ENTRIES, 2 * len(self))
+        return removed
+
+    def prune(self) -> int:
+        """
+        Remove the values that no configuration uses anymore, e.g. after an eviction or a reload. It is also done
+        automatically when the table doubles.
+
+        :return: The number of removed values.
+        :rtype: int
+        """
+        with self._lock:
+            return self._prune()
+
+    def clear(self):
+        """
+        Forget every value and reset the statistics. The configurations already interned keep their values.
+
+        :return: None
+        """
+        with self._lock:
+            self._items.clear()
+            self._hits = 0
+            self._saved_bytes = 0
+            self._prune_at = MIN_PRUNE_ENTRIES
+
+    def statistics(self) -> dict[str, int]:
+        """
+        Get the statistics of the table.
+
+        :return: The number of shared values ("entries"), the number of values replaced by a shared one ("hits") and
+                 the estimated size of the replaced values ("saved_bytes"). A replaced section is counted without its
+                 items, which are counted when they are replaced.
+        :rtype: dict[str, int]
+        """
+        with self._lock:
+            return {
+                'entries': len(self),
+                'hits': self._hits,
+                'saved_bytes': self._saved_bytes,
+            }
+
+    def __len__(self) -> int:
+        return sum(map(len, list(self._items.values())))
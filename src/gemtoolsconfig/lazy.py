@@ -0,0 +1,362 @@
+import json
+import re
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from .backends import Parser, get_parser
+from .frozen import PATH_SEPARATOR
+from .subtree import _UTF8_BOM, _skip_whitespace, _value_end
+
+LAZY_EXTENSIONS = ['.json']
+"""
+The file extensions loaded as lazy configurations. The other formats are loaded by the regular loading function.
+"""
+
+EAGER_SIZE = 4096
+"""
+The size in bytes under which a nested object or array is decoded at once, as a regular dictionary or list: scanning
+a small container costs more than decoding it.
+"""
+
+_MISSING = object()
+
+_KEY = re.compile(rb'"([^"\\]*(?:\\.[^"\\]*)*)"[ \t\n\r]*:[ \t\n\r]*', re.DOTALL)
+
+_SEPARATOR = re.compile(rb'[ \t\n\r]*(,?)[ \t\n\r]*')
+
+
+def _decode_key(raw: bytes, parse: Parser) -> str:
+    """
+    Decode an object key, without the JSON parser when it has no escape sequence.
+    """
+    if b'\\' in raw:
+        return parse(b'"' + raw + b'"')
+    return str(raw, 'utf-8')
+
+
+def _skip(buffer: bytes, position: int) -> int:
+    """
+    Find the end of the JSON value that starts at a position, like `_value_end`. A container without nested
+    containers, escapes or brackets in its strings is found by searching its closing bracket only.
+    """
+    first = buffer[position:position + 1]
+    if first == b'{' or first == b'[':
+        close = buffer.find(b'}' if first == b'{' else b']', position)
+        if close != -1:
+            text = buffer[position + 1:close]
+            if b'{' not in text and b'[' not in text and b'\\' not in text and not text.count(b'"') % 2:
+                return close + 1
+    return _value_end(buffer, position)
+
+
+def _decode(buffer: bytes, start: int, end: int, parse: Parser) -> Any:
+    """
+    Decode the value at an offset with a JSON parser: a lazy view for a large object or array, the decoded value
+    otherwise.
+    """
+    first = buffer[start]
+    if end - start < EAGER_SIZE:
+        return parse(buffer[start:end])
+    if first == 0x7b:  # {
+        return LazyConfiguration(buffer, start, parse)
+    if first == 0x5b:  # [
+        return LazyList(buffer, start, parse)
+    return parse(buffer[start:end])
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, (LazyConfiguration, LazyList)):
+        return value.thaw()
+    return value
+
+
+class LazyConfiguration(Mapping):
+    """
+    A read-only configuration decoded from a JSON document on access.
+
+    The document is kept as raw bytes. The keys of an object are scanned when they are first needed, up to the
+    requested key: the values are skipped by their structural brackets, without being decoded. A value is decoded
+    when it is first accessed, then kept; a nested object or array is itself a lazy view, unless it is smaller than
+    EAGER_SIZE. When an object has the same key several times, the first one is used.
+
+    The skipped parts of the document are not validated, so a syntax error is raised by the access that reaches it,
+    as a ValueError. A lazy configuration is pickled as a regular dictionary.
+
+    A lazy configuration can be shared between threads: the scans and the decodes hold the lock of the view, and the
+    values already decoded are read without it.
+    """
+    __slots__ = ('_buffer', '_position', '_offsets', '_values', '_complete', '_parse', '_lock')
+
+    def __init__(self, buffer: bytes, start: int, parse: Parser = json.loads):
+        """
+        LazyConfiguration constructor. Use `load_lazy` to load a file.
+
+        :param buffer: The JSON document.
+        :type buffer: bytes
+        :param start: The offset of the opening brace of the object.
+        :type start: int
+        :param parse: The JSON parser of the values. Defaults to `json.loads`.
+        :type parse: Parser, optional
+        """
+        self._buffer = buffer
+        self._parse = parse
+        self._position = _skip_whitespace(buffer, start + 1)
+        self._offsets: dict[str, tuple[int, int]] = {}
+        self._values: dict[str, Any] = {}
+        self._complete = False
+        self._lock = threading.Lock()
+
+    def _scan(self, key: Any = _MISSING) -> Any:
+        """
+        Scan the next entries of the object, until a key is found or until the end of the object. It is called with
+        the lock.
+
+        :param key: The key to find. Defaults to none: scan to the end.
+        :type key: Any
+        :return: The offsets of the value of the key, or None if it is not found.
+        :rtype: Any
+        :raises ValueError: If the scanned part of the document is not valid JSON.
+        """
+        buffer = self._buffer
+        position = self._position
+        offsets = self._offsets
+        match_key = _KEY.match
+        match_separator = _SEPARATOR.match
+        found = None
+        while not self._complete and found is None:
+            if buffer[position:position + 1] == b'}':
+                self._complete = True
+                break
+            match = match_key(buffer, position)
+            if match is None:
+                raise ValueError(f'Expecting a key at {position}.')
+            name = _decode_key(match.group(1), self._parse)
+            start = match.end()
+            end = _skip(buffer, start)
+            if name not in offsets:
+                offsets[name] = (start, end)
+                if name == key:
+                    found = offsets[name]
+            match = match_separator(buffer, end)
+            position = match.end()
+            if not match.group(1) and buffer[position:position + 1] != b'}':
+                raise ValueError(f'Expecting "," or "}}" at {position}.')
+        self._position = position
+        return found
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._values.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            value = self._values.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            offsets = self._offsets.get(key)
+            if offsets is None:
+                if self._complete or type(key) is not str:
+                    raise KeyError(key)
+                offsets = self._scan(key)
+                if offsets is None:
+                    raise KeyError(key)
+            value = self._values[key] = _decode(self._buffer, *offsets, self._parse)
+        return value
+
+    def _scan_all(self):
+        """
+        Scan the object to its end, unless it is already scanned.
+
+        :return: None
+        """
+        if not self._complete:
+            with self._lock:
+                self._scan()
+
+    def __iter__(self) -> Iterator[str]:
+        self._scan_all()
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        self._scan_all()
+        return len(self._offsets)
+
+    def __contains__(self, key: Any) -> bool:
+        if key in self._offsets:
+            return True
+        if self._complete or type(key) is not str:
+            return False
+        with self._lock:
+            return key in self._offsets or self._scan(key) is not None
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.thaw()!r})'
+
+    def __reduce__(self):
+        return dict, (self.thaw(),)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Get a value by its key, or by a dotted key path (e.g. "debug.level").
+
+        :param key: The key, or the key path.
+        :type key: Any
+        :param default: The value to return if the key cannot be found.
+        :type default: Any
+        :return: The value.
+        :rtype: Any
+        """
+        if key in self:
+            return self[key]
+        if type(key) is not str or PATH_SEPARATOR not in key:
+            return default
+        value = self
+        for part in key.split(PATH_SEPARATOR):
+            if not isinstance(value, Mapping) or part not in value:
+                return default
+            value = value[part]
+        return value
+
+    def thaw(self) -> dict:
+        """
+        Get the configuration as regular dictionaries and lists. The values already decoded are reused.
+
+        :return: The configuration.
+        :rtype: dict
+        """
+        return {key: _thaw(value) for key, value in self.items()}
+
+
+class LazyList(Sequence):
+    """
+    A read-only JSON array decoded on access, like `LazyConfiguration`: the items are scanned up to the requested
+    index, and decoded when they are first accessed. It can be shared between threads, like `LazyConfiguration`.
+    """
+    __slots__ = ('_buffer', '_position', '_offsets', '_values', '_complete', '_parse', '_lock')
+
+    def __init__(self, buffer: bytes, start: int, parse: Parser = json.loads):
+        """
+        LazyList constructor.
+
+        :param buffer: The JSON document.
+        :type buffer: bytes
+        :param start: The offset of the opening bracket of the array.
+        :type start: int
+        :param parse: The JSON parser of the items. Defaults to `json.loads`.
+        :type parse: Parser, optional
+        """
+        self._buffer = buffer
+        self._parse = parse
+        self._position = _skip_whitespace(buffer, start + 1)
+        self._offsets: list[tuple[int, int]] = []
+        self._values: dict[int, Any] = {}
+        self._complete = False
+        self._lock = threading.Lock()
+
+    def _scan(self, count: int = None):
+        """
+        Scan the next items of the array, until it has `count` items or until the end of the array. It is called
+        with the lock.
+
+        :param count: The number of items to reach. Defaults to none: scan to the end.
+        :type count: int, optional
+        :return: None
+        :raises ValueError: If the scanned part of the document is not valid JSON.
+        """
+        buffer = self._buffer
+        position = self._position
+        offsets = self._offsets
+        match_separator = _SEPARATOR.match
+        while not self._complete and (count is None or len(offsets) < count):
+            if buffer[position:position + 1] == b']':
+                self._complete = True
+                break
+            end = _skip(buffer, position)
+            offsets.append((position, end))
+            match = match_separator(buffer, end)
+            position = match.end()
+            if not match.group(1) and buffer[position:position + 1] != b']':
+                raise ValueError(f'Expecting "," or "]" at {position}.')
+        self._position = position
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        value = self._values.get(index, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            value = self._values.get(index, _MISSING)
+            if value is not _MISSING:
+                return value
+            if index >= len(self._offsets):
+                self._scan(index + 1)
+            if not 0 <= index < len(self._offsets):
+                raise IndexError('list index out of range')
+            value = self._values[index] = _decode(self._buffer, *self._offsets[index], self._parse)
+        return value
+
+    def __len__(self) -> int:
+        if not self._complete:
+            with self._lock:
+                self._scan()
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[Any]:
+        index = 0
+        while True:
+            try:
+                yield self[index]
+            except IndexError:
+                return
+            index += 1
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(item == other_item for item, other_item in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.thaw()!r})'
+
+    def __reduce__(self):
+        return list, (self.thaw(),)
+
+    def thaw(self) -> list:
+        """
+        Get the array as regular dictionaries and lists. The values already decoded are reused.
+
+        :return: The array.
+        :rtype: list
+        """
+        return [_thaw(value) for value in self]
+
+
+def load_lazy(file_path: Path, load: Callable[[Path], Any], backends: dict[str, str] = None) -> Any:
+    """
+    Load a configuration file as a `LazyConfiguration` when its format allows it (see LAZY_EXTENSIONS) and its root
+    is an object, with the regular loading function otherwise. The values are decoded by the selected JSON backend;
+    the files of a format parsed by gemtoolsio are loaded by the regular loading function.
+
+    :param file_path: The path of the configuration file.
+    :type file_path: Path
+    :param load: The regular loading function.
+    :type load: Callable[[Path], Any]
+    :param backends: The backend to use by format (see `backends.get_parser`). Defaults to the fastest installed ones.
+    :type backends: dict[str, str], optional
+    :return: The configuration data.
+    :rtype: Any
+    """
+    if file_path.suffix.lower() not in LAZY_EXTENSIONS:
+        return load(file_path)
+    parse = get_parser('.json', backends)
+    if getattr(parse, 'gemtoolsio', False) is True:
+        return load(file_path)
+    buffer = file_path.read_bytes()
+    start = _skip_whitespace(buffer, len(_UTF8_BOM) if buffer[:len(_UTF8_BOM)] == _UTF8_BOM else 0)
+    if buffer[start:start + 1] != b'{':
+        return parse(buffer[start:])
+    return LazyConfiguration(buffer, start, parse)
@@ -1,16 +1,94 @@
 from __future__ import annotations
-from typing import Any
+from collections.abc import Mapping
+from typing import Any, Callable
 
 from .exceptions import critical, ConfigurationHandlerError
+from .frozen import freeze
 from .handlers import LazyHandler, LoadingHandler, KEY_RESULT
+from .instrumentation import Instrumentation, STAGE_LAZY, STAGE_LOADING
+from .merge import Layer, get_merge_handler
 
 ConfigurationItem = dict
 
+Pipeline = Callable[[dict], dict]
+
+NameLister = Callable[[], list[str]]
+"""
+A name lister returns the names of the configurations a loader can lazy load.
+"""
+
+_MISSING = object()
+
+_ITEM_TYPES = (dict, list, tuple)
+
+
+def compile_handlers(handlers: list[Callable[[dict], dict]]) -> Pipeline:
+    """
+    Compose a chain of handlers into a single callable, once, instead of looping over the handlers on each call.
+
+    :param handlers: The handlers, in calling order.
+    :type handlers: list[Callable[[dict], dict]]
+    :return: A callable that takes the parameters given to the first handler and returns the parameters returned by
+             the last one.
+    :rtype: Pipeline
+    """
+    handlers = tuple(handlers)
+    if not handlers:
+        return lambda parameters: parameters
+    if len(handlers) == 1:
+        return handlers[0]
+    if len(handlers) == 2:
+        first, second = handlers
+        return lambda parameters: second(first(parameters))
+
+    def pipeline(parameters: dict) -> dict:
+        for handler in handlers:
+            parameters = handler(parameters)
+        return parameters
+
+    return pipeline
+
+
+def validate_parameters(parameters: dict, frozen: bool = False) -> dict:
+    """
+    Check the parameters returned by the last loading handler.
+
+    :param parameters: The parameters returned by the loading handlers.
+    :type parameters: dict
+    :param frozen: Whether to replace the configuration by its immutable representation.
+    :type frozen: bool
+    :return: The same parameters.
+    :rtype: dict
+    :raises ConfigurationHandlerError: If the configuration is missing or has an invalid type.
+    """
+    configuration = parameters.get(KEY_RESULT, _MISSING)
+    if configuration is _MISSING:
+        critical(f'The loader is not configured correctly. "{KEY_RESULT}" not found in the result parameters: '
+                 f'{list(parameters)}', ConfigurationHandlerError)
+
+    if type(configuration) not in _ITEM_TYPES and not isinstance(configuration, (list, tuple, Mapping)):
+        critical(
+            f'The loader gets a configuration with an invalid type: expect dict or list, got {type(configuration)}',
+            ConfigurationHandlerError)
+
+    if frozen:
+        parameters[KEY_RESULT] = freeze(configuration)
+    return parameters
+
 
 class ConfigurationLoader:
+    """
+    Load configurations through a chain of lazy handlers, that resolve the loading parameters from a configuration
+    name, and a chain of loading handlers, that produce the configuration. Each chain is composed once, when the
+    loader is created.
+    """
+
     def __init__(self,
                  lazy_handlers: list[LazyHandler],
-                 loading_handlers: list[LoadingHandler]
+                 loading_handlers: list[LoadingHandler],
+                 frozen: bool = False,
+                 instrumentation: Instrumentation = None,
+                 name_lister: NameLister = None
                  ):
         """
         ConfigurationLoader constructor.
@@ -19,9 +97,21 @@ class ConfigurationLoader:
         :type lazy_handlers: list[LazyHandler]
         :param loading_handlers: List of loading handlers.
         :type loading_handlers: list[LoadingHandler]
+        :param frozen: Whether the loaded configurations are immutable `FrozenConfiguration` items.
+        :type frozen: bool
+        :param instrumentation: The hooks called around each handler. Defaults to None, no instrumentation.
+        :type instrumentation: Instrumentation, optional
+        :param name_lister: The function that lists the configurations of the loader. Defaults to None, the loader
+                            cannot list its configurations.
+        :type name_lister: NameLister, optional
         """
         self._loading_handlers = loading_handlers
         self._lazy_handlers = lazy_handlers
+        self._loading_pipeline = compile_handlers(loading_handlers)
+        self._lazy_pipeline = compile_handlers(lazy_handlers)
+        self._frozen = frozen
+        self.instrumentation = instrumentation
+        self._name_lister = name_lister
 
     def load(self, **parameters: Any) -> ConfigurationItem:
         """
@@ -33,20 +123,36 @@ class ConfigurationLoader:
         :rtype: ConfigurationItem
         :raises ConfigurationHandlerError: If the loader is not configured correctly.
         """
-        for handler in self._loading_handlers:
-            parameters = handler(parameters)
+        return self._load(parameters)[KEY_RESULT]
 
-        if KEY_RESULT not in parameters:
-            critical(f'The loader is not configured correctly. "{KEY_RESULT}" not found in the result: {parameters}',
-                     ConfigurationHandlerError)
+    def load_parameters(self, **parameters: Any) -> dict:
+        """
+        Load configuration and return every parameter produced by the loading handlers, such as the "full_path" of
+        a loaded file.
 
-        configuration = parameters[KEY_RESULT]
-        if not isinstance(configuration, list) and not isinstance(configuration, dict):
-            critical(
-                f'The loader gets a configuration with an invalid type: expect dict or list, got {type(configuration)}',
-                ConfigurationHandlerError)
+        :param parameters: Configuration parameters.
+        :type parameters: dict
+        :return: The parameters, with the configuration under the KEY_RESULT key.
+        :rtype: dict
+        :raises ConfigurationHandlerError: If the loader is not configured correctly.
+        """
+        return self._load(parameters)
+
+    def _load(self, parameters: dict) -> dict:
+        """
+        Run the loading handlers and check their result.
 
-        return parameters[KEY_RESULT]
+        :param parameters: Configuration parameters.
+        :type parameters: dict
+        :return: The parameters, with the configuration under the KEY_RESULT key.
+        :rtype: dict
+        :raises ConfigurationHandlerError: If the loader is not configured correctly.
+        """
+        if self.instrumentation is None:
+            parameters = self._loading_pipeline(parameters)
+        else:
+            parameters = self.instrumentation.run(STAGE_LOADING, self._loading_handlers, parameters)
+        return validate_parameters(parameters, self._frozen)
 
     def lazy_load(self, name: str) -> ConfigurationItem:
         """
@@ -57,11 +163,32 @@ class ConfigurationLoader:
         :return: ConfigurationItem object.
         :rtype: ConfigurationItem
         """
-        parameters = {'name': name}
-        for handler in self._lazy_handlers:
-            parameters = handler(parameters)
+        return self.load(**self.lazy_parameters(name))
 
-        return self.load(**parameters)
+    def lazy_parameters(self, name: str) -> dict:
+        """
+        Run the lazy handlers only, to get the loading parameters of a configuration from its name.
+
+        :param name: Configuration name.
+        :type name: str
+        :return: The parameters to pass to `load`.
+        :rtype: dict
+        """
+        if self.instrumentation is None:
+            return self._lazy_pipeline({'name': name})
+        return self.instrumentation.run(STAGE_LAZY, self._lazy_handlers, {'name': name})
+
+    def list_names(self) -> list[str]:
+        """
+        List the names of the configurations this loader can lazy load.
+
+        :return: The configuration names.
+        :rtype: list[str]
+        :raises ConfigurationHandlerError: If the loader has no name lister.
+        """
+        if self._name_lister is None:
+            critical('This loader cannot list its configurations: it has no name lister.', ConfigurationHandlerError)
+        return self._name_lister()
 
 
 class ConfigurationLoaderBuilder:
@@ -75,18 +202,58 @@ class ConfigurationLoaderBuilder:
         """
         self._loading_handlers = []
         self._lazy_handlers = []
+        self._frozen = False
+        self._instrumentation = None
+        self._name_lister = None
 
     def build(self) -> ConfigurationLoader:
         """
-        Builds a new `ConfigurationLoader` instance based on the current state of the builder.
+        Builds a new `ConfigurationLoader` instance based on the current state of the builder. The handlers added to
+        the builder afterwards do not change the built loader.
 
         :return: A new `ConfigurationLoader` instance.
         """
         return ConfigurationLoader(
-            self._lazy_handlers,
-            self._loading_handlers
+            list(self._lazy_handlers),
+            list(self._loading_handlers),
+            self._frozen,
+            self._instrumentation,
+            self._name_lister
         )
 
+    def set_frozen(self, frozen: bool = True) -> ConfigurationLoaderBuilder:
+        """
+        Sets whether the loader produces immutable `FrozenConfiguration` items.
+
+        :param frozen: Whether the loaded configurations are frozen.
+        :type frozen: bool
+        :return: The `ConfigurationLoaderBuilder` instance, to allow method chaining.
+        """
+        self._frozen = frozen
+        return self
+
+    def set_instrumentation(self, instrumentation: Instrumentation) -> ConfigurationLoaderBuilder:
+        """
+        Sets the hooks called around each handler of the loader.
+
+        :param instrumentation: The instrumentation, or None to disable it.
+        :type instrumentation: Instrumentation
+        :return: The `ConfigurationLoaderBuilder` instance, to allow method chaining.
+        """
+        self._instrumentation = instrumentation
+        return self
+
+    def set_name_lister(self, name_lister: NameLister) -> ConfigurationLoaderBuilder:
+        """
+        Sets the function that lists the configurations of the loader, used by `Configurations.warmup`.
+
+        :param name_lister: The name lister, or None.
+        :type name_lister: NameLister
+        :return: The `ConfigurationLoaderBuilder` instance, to allow method chaining.
+        """
+        self._name_lister = name_lister
+        return self
+
     def add_loading_handler(self, handler: LoadingHandler) -> ConfigurationLoaderBuilder:
         """
         Adds a loading handler to the builder.
@@ -98,6 +265,24 @@ class ConfigurationLoaderBuilder:
         self._loading_handlers.append(handler)
         return self
 
+    def add_merge_handler(self,
+                          layers: list[Layer],
+                          list_strategy: str = 'replace',
+                          dict_strategy: str = 'merge'
+                          ) -> ConfigurationLoaderBuilder:
+        """
+        Adds a loading handler that loads ordered configuration layers and merges them. See `get_merge_handler`.
+
+        :param layers: The layers, from the lowest to the highest priority.
+        :type layers: list[Layer]
+        :param list_strategy: How the lists of the layers are merged. Defaults to "replace".
+        :type list_strategy: str
+        :param dict_strategy: How the dictionaries of the layers are merged. Defaults to "merge".
+        :type dict_strategy: str
+        :return: The `ConfigurationLoaderBuilder` instance, to allow method chaining.
+        """
+        return self.add_loading_handler(get_merge_handler(layers, list_strategy, dict_strategy))
+
     def add_lazy_handler(self, handler: LazyHandler) -> ConfigurationLoaderBuilder:
         """
         Adds a lazy loading handler to the builder.
@@ -0,0 +1,60 @@
+import mmap
+from pathlib import Path
+from typing import Any, Callable
+
+from .backends import get_parser
+
+MAPPED_EXTENSIONS = ['.json']
+"""
+The file extensions read through a memory map. The other formats are loaded by the regular loading function.
+"""
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+
+def _loads_json(buffer: mmap.mmap, backends: dict[str, str] = None) -> Any:
+    """
+    Parse a memory-mapped JSON document.
+
+    The parser reads the mapped pages through a memoryview: orjson parses it without copying the document, the
+    other backends copy it once. The memoryview is released before returning, so the map can be closed.
+
+    :param buffer: The memory-mapped document.
+    :type buffer: mmap.mmap
+    :param backends: The backend to use by format. Defaults to the fastest installed JSON backend.
+    :type backends: dict[str, str], optional
+    :return: The parsed document.
+    :rtype: Any
+    """
+    parser = get_parser('.json', backends)
+    start = len(_UTF8_BOM) if buffer[:len(_UTF8_BOM)] == _UTF8_BOM else 0
+    with memoryview(buffer) as view, view[start:] as document:
+        return parser(document)
+
+
+def load_mapped(file_path: Path, load: Callable[[Path], Any], backends: dict[str, str] = None) -> Any:
+    """
+    Load a configuration file through a memory map when its format allows it (see MAPPED_EXTENSIONS), with the
+    regular loading function otherwise. The map is closed before returning.
+
+    The documents that orjson rejects, such as NaN or Infinity, are copied out of the map to be parsed by json.
+
+    :param file_path: The path of the configuration file.
+    :type file_path: Path
+    :param load: The regular loading function.
+    :type load: Callable[[Path], Any]
+    :param backends: The backend to use by format (see `backends.get_parser`). Defaults to the fastest installed ones.
+    :type backends: dict[str, str], optional
+    :return: The configuration data.
+    :rtype: Any
+    """
+    if file_path.suffix.lower() not in MAPPED_EXTENSIONS:
+        return load(file_path)
+
+    with open(file_path, 'rb') as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return get_parser('.json', backends)(b'')
+        with buffer:
+            return _loads_json(buffer, backends)
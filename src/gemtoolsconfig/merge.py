@@ -0,0 +1,346 @@
+import copy
+import threading
+from collections.abc import Mapping
+from typing import Any, Optional, Union
+
+from .exceptions import critical, ArgumentError, ConfigurationHandlerError
+from .frozen import PATH_SEPARATOR
+from .handlers import LoadingHandler, KEY_RESULT, get_argument_getter
+
+LIST_STRATEGIES = ['replace', 'append', 'unique']
+"""
+How a list is merged with the list of a previous layer: "replace" keeps the last one, "append" concatenates them,
+"unique" concatenates them without the items already present.
+"""
+
+DICT_STRATEGIES = ['merge', 'replace']
+"""
+How a dictionary is merged with the dictionary of a previous layer: "merge" merges them key by key, recursively,
+"replace" keeps the last one. The layers themselves are always merged key by key.
+"""
+
+_MISSING = object()
+
+Layer = tuple[str, LoadingHandler, dict]
+"""
+A layer of a merge handler: its name, the loading handler that produces it and the parameters given to this handler
+in addition to the loading parameters.
+"""
+
+Provenance = Union[str, dict]
+
+
+def _copy_tree(value: Any) -> Any:
+    """
+    Copy the dictionaries and the lists of a tree. The other values are shared.
+
+    :param value: The tree.
+    :type value: Any
+    :return: The copy.
+    :rtype: Any
+    """
+    if isinstance(value, dict):
+        return {key: _copy_tree(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(item) for item in value]
+    return value
+
+
+def _changed_paths(old: dict, new: dict, prefix: tuple = ()) -> list[tuple]:
+    """
+    Get the topmost key paths whose value differs between two versions of a layer.
+
+    :param old: The previous version.
+    :type old: dict
+    :param new: The new version.
+    :type new: dict
+    :param prefix: The key path of the compared dictionaries.
+    :type prefix: tuple
+    :return: The changed key paths.
+    :rtype: list[tuple]
+    """
+    changed = []
+    if old is new:
+        return changed
+    for key in dict.fromkeys([*old, *new]):
+        old_value = old.get(key, _MISSING)
+        new_value = new.get(key, _MISSING)
+        if old_value is new_value:
+            continue
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            changed += _changed_paths(old_value, new_value, prefix + (key,))
+        elif old_value is _MISSING or new_value is _MISSING or old_value != new_value:
+            changed.append(prefix + (key,))
+    return changed
+
+
+class ConfigurationMerger:
+    """
+    Merge ordered configuration layers (e.g. base file, environment file, host file, environment variables) into one
+    configuration, where the later layers override the earlier ones, and record which layer provides each value.
+
+    When a layer changes, only the subtrees that differ from its previous version are merged again. The dictionaries
+    along the changed paths are copied, so the previous results are never modified and the unchanged subtrees are
+    shared between the successive results.
+    """
+
+    def __init__(self,
+                 layer_names: list[str],
+                 list_strategy: str = 'replace',
+                 dict_strategy: str = 'merge'
+                 ):
+        """
+        ConfigurationMerger constructor.
+
+        :param layer_names: The names of the layers, from the lowest to the highest priority.
+        :type layer_names: list[str]
+        :param list_strategy: One of LIST_STRATEGIES. Defaults to "replace".
+        :type list_strategy: str
+        :param dict_strategy: One of DICT_STRATEGIES. Defaults to "merge".
+        :type dict_strategy: str
+        :raises ArgumentError: If a strategy is invalid.
+        """
+        if list_strategy not in LIST_STRATEGIES:
+            critical(f'Argument "list_strategy" must be one of {LIST_STRATEGIES}, got {list_strategy}.', ArgumentError)
+        if dict_strategy not in DICT_STRATEGIES:
+            critical(f'Argument "dict_strategy" must be one of {DICT_STRATEGIES}, got {dict_strategy}.', ArgumentError)
+        self._names = list(layer_names)
+        self._list_strategy = list_strategy
+        self._dict_strategy = dict_strategy
+        self._layers: dict[str, dict] = {}
+        self._result: dict = {}
+        self._provenance: dict = {}
+
+    @property
+    def result(self) -> dict:
+        """
+        The merged configuration. Its unchanged subtrees are shared with the next results, so it must not be
+        modified.
+
+        :rtype: dict
+        """
+        return self._result
+
+    def get_layer(self, name: str) -> Optional[dict]:
+        """
+        Get the current version of a layer.
+
+        :param name: The name of the layer.
+        :type name: str
+        :return: The layer, or None if it is not set.
+        :rtype: Optional[dict]
+        """
+        return self._layers.get(name)
+
+    def get_provenance(self, path: str) -> Optional[str]:
+        """
+        Get the name of the layer that provides the value at a dotted key path.
+
+        :param path: The key path (e.g. "db.pool.size").
+        :type path: str
+        :return: The name of the layer, or None if the path is not a value of the merged configuration.
+        :rtype: Optional[str]
+        """
+        node = self._provenance
+        for key in path.split(PATH_SEPARATOR):
+            if not isinstance(node, dict):
+                break
+            node = node.get(key)
+        return node if isinstance(node, str) else None
+
+    def set_layer(self, name: str, data: Mapping) -> dict:
+        """
+        Set the new version of a layer and merge its changes.
+
+        :param name: The name of the layer.
+        :type name: str
+        :param data: The content of the layer.
+        :type data: Mapping
+        :return: The merged configuration.
+        :rtype: dict
+        :raises ArgumentError: If the layer is unknown.
+        :raises ConfigurationHandlerError: If the layer is not a dictionary.
+        """
+        if name not in self._names:
+            critical(f'Layer "{name}" is not one of {self._names}.', ArgumentError)
+        if not isinstance(data, dict):
+            critical(f'Layer "{name}" must be a dictionary, got {type(data)}.', ConfigurationHandlerError)
+
+        previous = self._layers.get(name, {})
+        self._layers[name] = data
+        for path in _changed_paths(previous, data):
+            self._remerge(path)
+        return self._result
+
+    def merge(self) -> dict:
+        """
+        Merge every layer again, from scratch.
+
+        :return: The merged configuration.
+        :rtype: dict
+        """
+        values = [(name, self._layers[name]) for name in self._names if name in self._layers]
+        self._result, self._provenance = self._merge_dictionaries(values)
+        return self._result
+
+    def _merge_values(self, values: list[tuple[str, Any]]) -> tuple[Any, Provenance]:
+        """
+        Merge the values that the layers define at the same key path.
+
+        :param values: The layer names and their values, from the lowest to the highest priority.
+        :type values: list[tuple[str, Any]]
+        :return: The merged value and its provenance: a layer name, or a dictionary of provenances by key.
+        :rtype: tuple[Any, Provenance]
+        """
+        merged = _MISSING
+        provenance = None
+        dictionaries = []
+        for name, value in values:
+            if isinstance(value, dict) and self._dict_strategy == 'merge':
+                if not dictionaries:
+                    merged = _MISSING
+                dictionaries.append((name, value))
+                continue
+            dictionaries = []
+            if isinstance(value, list) and isinstance(merged, list) and self._list_strategy != 'replace':
+                if self._list_strategy == 'append':
+                    merged = merged + copy.deepcopy(value)
+                else:
+                    merged = merged + [item for item in copy.deepcopy(value) if item not in merged]
+            else:
+                merged = copy.deepcopy(value)
+            provenance = name
+
+        if not dictionaries:
+            return merged, provenance
+        return self._merge_dictionaries(dictionaries)
+
+    def _merge_dictionaries(self, dictionaries: list[tuple[str, dict]]) -> tuple[dict, dict]:
+        """
+        Merge the dictionaries that the layers define at the same key path, key by key.
+
+        :param dictionaries: The layer names and their dictionaries, from the lowest to the highest priority.
+        :type dictionaries: list[tuple[str, dict]]
+        :return: The merged dictionary and the provenances of its values, by key.
+        :rtype: tuple[dict, dict]
+        """
+        result = {}
+        provenances = {}
+        for key in dict.fromkeys(key for _, value in dictionaries for key in value):
+            result[key], provenances[key] = self._merge_values(
+                [(name, value[key]) for name, value in dictionaries if key in value])
+        return result, provenances
+
+    def _values_at(self, path: tuple) -> tuple[tuple, list[tuple[str, Any]]]:
+        """
+        Find where a changed key path must be merged again: the path itself, or its closest ancestor where a layer
+        does not define a dictionary to merge, and get the values of the layers there.
+
+        :param path: The changed key path.
+        :type path: tuple
+        :return: The key path to merge again and the values of the layers at this path.
+        :rtype: tuple[tuple, list[tuple[str, Any]]]
+        """
+        values = [(name, self._layers[name]) for name in self._names if name in self._layers]
+        for depth, key in enumerate(path):
+            values = [(name, value[key]) for name, value in values if key in value]
+            if any(not isinstance(value, dict) or self._dict_strategy == 'replace' for _, value in values):
+                return path[:depth + 1], values
+        return path, values
+
+    def _remerge(self, path: tuple):
+        """
+        Merge the layers again at a changed key path and replace the subtree in the result.
+
+        :param path: The changed key path.
+        :type path: tuple
+        :return: None
+        """
+        path, values = self._values_at(path)
+        if values:
+            value, provenance = self._merge_values(values)
+        else:
+            value = provenance = _MISSING
+        self._result = self._replace(self._result, path, value)
+        self._provenance = self._replace(self._provenance, path, provenance)
+
+    def _replace(self, tree: dict, path: tuple, value: Any) -> dict:
+        """
+        Get a copy of a tree where the value at a key path is replaced, copying only the dictionaries along the path.
+
+        :param tree: The tree.
+        :type tree: dict
+        :param path: The key path.
+        :type path: tuple
+        :param value: The new value, or _MISSING to remove the key.
+        :type value: Any
+        :return: The new tree.
+        :rtype: dict
+        """
+        tree = dict(tree) if isinstance(tree, dict) else {}
+        key = path[0]
+        if len(path) > 1:
+            value = self._replace(tree.get(key), path[1:], value)
+        if value is _MISSING:
+            tree.pop(key, None)
+        else:
+            tree[key] = value
+        return tree
+
+
+def get_merge_handler(layers: list[Layer],
+                      list_strategy: str = 'replace',
+                      dict_strategy: str = 'merge'
+                      ) -> LoadingHandler:
+    """
+    Get a handler that loads ordered configuration layers and merges them.
+
+    Each layer is loaded by its own handler, with the loading parameters updated by the parameters of the layer. The
+    layers are merged by a `ConfigurationMerger` per configuration name (the "name" parameter, None without it),
+    returned by the `get_merger` attribute of the handler, which also tells the provenance of each value. On the next
+    loads of a configuration, only the changes of its layers are merged again. The merges of a handler run one at a
+    time, and each load returns its own copy of the merged configuration.
+
+    :param layers: The layers, from the lowest to the highest priority.
+    :type layers: list[Layer]
+    :param list_strategy: One of LIST_STRATEGIES. Defaults to "replace".
+    :type list_strategy: str
+    :param dict_strategy: One of DICT_STRATEGIES. Defaults to "merge".
+    :type dict_strategy: str
+    :return: A callable that loads and merges the layers, and returns a dictionary containing the merged
+             configuration under the KEY_RESULT key.
+    :rtype: LoadingHandler
+    """
+    layer_names = [name for name, _, _ in layers]
+    # The strategies are validated when the handler is created, not by its first load.
+    ConfigurationMerger(layer_names, list_strategy, dict_strategy)
+    mergers: dict[Any, ConfigurationMerger] = {}
+    lock = threading.Lock()
+    get_name = get_argument_getter('name', None)
+
+    def get_merger(config_name: Any = None) -> Optional[ConfigurationMerger]:
+        """
+        Get the merger of a configuration.
+
+        :param config_name: The name of the configuration, None for the loads without name.
+        :type config_name: Any
+        :return: The merger, or None if the configuration was not loaded.
+        :rtype: Optional[ConfigurationMerger]
+        """
+        return mergers.get(config_name)
+
+    def handler(params: dict) -> dict:
+        loaded = [(name, layer_handler({**params, **layer_params})[KEY_RESULT])
+                  for name, layer_handler, layer_params in layers]
+        config_name = get_name(params)
+        with lock:
+            merger = mergers.get(config_name)
+            if merger is None:
+                merger = mergers[config_name] = ConfigurationMerger(layer_names, list_strategy, dict_strategy)
+            for name, layer in loaded:
+                merger.set_layer(name, layer)
+            params[KEY_RESULT] = _copy_tree(merger.result)
+        return params
+
+    handler.get_merger = get_merger
+    return handler
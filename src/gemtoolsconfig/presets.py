@@ -1,25 +1,39 @@
+from functools import partial
 from os import PathLike
 from pathlib import Path
 from typing import Union
 
+from .cache import FileCache, DecryptionCache, DEFAULT_CACHE_SIZE
 from .loader import ConfigurationLoader, ConfigurationLoaderBuilder
-from .handlers import from_source, DEFAULT_PATH, get_file_handler, get_find_suitable_file_handler
+from .handlers import from_source, DEFAULT_PATH, get_file_handler, get_find_suitable_file_handler, \
+    list_configuration_names
+from .snapshot import DEFAULT_SNAPSHOT_PATH, SnapshotReader, get_snapshot_handler
 
 
-def preset_source_loader() -> ConfigurationLoader:
+def preset_source_loader(frozen: bool = False) -> ConfigurationLoader:
     """
     Get a configuration loader that loads configuration data from a source string.
 
+    :param frozen: Whether the loaded configurations are immutable `FrozenConfiguration` items. Defaults to False.
+    :type frozen: bool, optional
     :return: A ConfigurationLoader instance that can be used to load configuration data from a source string.
     :rtype: ConfigurationLoader
     """
     builder = ConfigurationLoaderBuilder()
     builder.add_loading_handler(from_source)
+    builder.set_frozen(frozen)
     return builder.build()
 
 
 def preset_file_loader(directory: Union[PathLike, str] = DEFAULT_PATH,
-                       key_file: Union[PathLike, str] = None
+                       key_file: Union[PathLike, str] = None,
+                       cache_directory: Union[PathLike, str] = None,
+                       cache_max_size: int = DEFAULT_CACHE_SIZE,
+                       frozen: bool = False,
+                       decryption_cache: DecryptionCache = None,
+                       memory_map: bool = False,
+                       lazy: bool = False,
+                       backends: dict[str, str] = None
                        ) -> ConfigurationLoader:
     """
     Get a configuration loader that loads configuration data from a file.
@@ -29,15 +43,63 @@ def preset_file_loader(directory: Union[PathLike, str] = DEFAULT_PATH,
     :param key_file: Optional path to the file containing the encryption key for encrypted configuration files.
                      Defaults to None.
     :type key_file: Union[PathLike, str], optional
+    :param cache_directory: Optional directory of an on-disk cache of the parsed files (e.g. ".gemtoolscache"), so
+                            that unchanged files are not parsed again by the next processes. Defaults to None.
+    :type cache_directory: Union[PathLike, str], optional
+    :param cache_max_size: The maximum size of the on-disk cache, in bytes.
+    :type cache_max_size: int, optional
+    :param frozen: Whether the loaded configurations are immutable `FrozenConfiguration` items. Defaults to False.
+    :type frozen: bool, optional
+    :param decryption_cache: Optional memory-only cache of the decrypted and parsed files, used with `key_file`. It
+                             can be shared by several loaders. Defaults to None.
+    :type decryption_cache: DecryptionCache, optional
+    :param memory_map: Whether to read the plain JSON files through a memory map. Defaults to False.
+    :type memory_map: bool, optional
+    :param lazy: Whether to load the plain JSON files as read-only `LazyConfiguration` items, whose sections are
+                 decoded when they are first accessed. Defaults to False.
+    :type lazy: bool, optional
+    :param backends: The parser to use by format (e.g. {".yaml": "yaml"}), by backend name. The other formats are
+                     parsed by their fastest installed backend (see `backends.get_parser`). Defaults to None.
+    :type backends: dict[str, str], optional
     :return: A ConfigurationLoader instance that can be used to load configuration data from a file.
     :rtype: ConfigurationLoader
     :raises: NotADirectoryError if the specified directory does not exist.
+    :raises: ArgumentError if a backend is unknown for its format.
     """
     key = None
     if key_file is not None:
         key = Path(key_file).read_bytes()
+    cache = None
+    if cache_directory is not None:
+        cache = FileCache(cache_directory, cache_max_size)
 
     builder = ConfigurationLoaderBuilder()
-    builder.add_loading_handler(get_file_handler(directory, key))
+    builder.add_loading_handler(get_file_handler(directory, key, cache, decryption_cache, memory_map, lazy,
+                                                 backends))
     builder.add_lazy_handler(get_find_suitable_file_handler(directory))
+    builder.set_name_lister(partial(list_configuration_names, directory))
+    builder.set_frozen(frozen)
+    return builder.build()
+
+
+def preset_snapshot_loader(path: Union[PathLike, str] = DEFAULT_SNAPSHOT_PATH,
+                           frozen: bool = False
+                           ) -> ConfigurationLoader:
+    """
+    Get a configuration loader that loads configuration data from a snapshot compiled by `compile_snapshot` (or
+    `python -m gemtoolsconfig compile`). A lazy load reads and deserializes only the requested configuration.
+
+    :param path: The path of the snapshot file. Defaults to DEFAULT_SNAPSHOT_PATH.
+    :type path: Union[PathLike, str]
+    :param frozen: Whether the loaded configurations are immutable `FrozenConfiguration` items. Defaults to False.
+    :type frozen: bool, optional
+    :return: A ConfigurationLoader instance that can be used to load configuration data from a snapshot.
+    :rtype: ConfigurationLoader
+    :raises: FileNotFoundError if the snapshot file does not exist.
+    """
+    reader = SnapshotReader(path)
+    builder = ConfigurationLoaderBuilder()
+    builder.add_loading_handler(get_snapshot_handler(reader))
+    builder.set_name_lister(reader.names)
+    builder.set_frozen(frozen)
     return builder.build()
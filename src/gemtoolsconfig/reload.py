@@ -0,0 +1,306 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from .configurations import Configurations, DEFAULT_CONFIGURATION_NAME, DEFAULT_LOADER_NAME
+from .exceptions import critical, ConfigurationHandlerError, ConfigurationNotFoundError
+from .forking import track_fork
+from .handlers import KEY_RESULT
+from .loader import ConfigurationItem
+
+DEFAULT_INTERVAL = 1.0
+
+DEFAULT_DEBOUNCE = 0.5
+
+DEFAULT_BATCH_SIZE = 256
+
+ReloadCallback = Callable[[str, Optional[ConfigurationItem], ConfigurationItem], None]
+"""
+A reload callback is called with the name of a reloaded configuration, its previous item (None if it was not loaded)
+and its new item, once the new item is published in `Configurations`.
+"""
+
+
+def _signature(path: Path) -> Optional[tuple[int, int]]:
+    """
+    Get the signature of a file, used to detect its modifications.
+
+    :param path: The path of the file.
+    :type path: Path
+    :return: The modification time and the size of the file, or None if it does not exist.
+    :rtype: Optional[tuple[int, int]]
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _WatchedFile:
+    """
+    The state of a watched configuration file.
+    """
+    __slots__ = ('loader_name', 'parameters', 'full_path', 'signature', 'pending', 'pending_since')
+
+    def __init__(self, loader_name: str, parameters: dict, full_path: Path, signature: tuple[int, int]):
+        self.loader_name = loader_name
+        self.parameters = parameters
+        self.full_path = full_path
+        self.signature = signature
+        self.pending = signature
+        self.pending_since = 0.0
+
+
+class ConfigurationWatcher:
+    """
+    Watch the files of loaded configurations and publish a new configuration item in `Configurations` when a file
+    changes.
+
+    The files are polled by their stat, a bounded batch of files per polling step, so the cost of a step does not
+    grow with the number of watched files. A change is reloaded once the file has been stable for the debounce
+    window. Only the changed files are parsed again, and the new item replaces the old one in a single assignment,
+    so readers always get a complete configuration.
+
+    By default, the polling thread runs only in the process that started it: a forked process does not poll the
+    files, so the workers of a pre-fork server do not each reload them. With `watch_in_children`, a process forked
+    while the watcher runs starts its own polling thread, so each worker keeps receiving the reloads.
+    """
+
+    def __init__(self,
+                 interval: float = DEFAULT_INTERVAL,
+                 debounce: float = DEFAULT_DEBOUNCE,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 watch_in_children: bool = False
+                 ):
+        """
+        ConfigurationWatcher constructor.
+
+        :param interval: The time between two polling steps of the background thread, in seconds.
+        :type interval: float
+        :param debounce: The time a changed file must stay unchanged before it is reloaded, in seconds.
+        :type debounce: float
+        :param batch_size: The maximum number of files checked by one polling step.
+        :type batch_size: int
+        :param watch_in_children: Whether a process forked while the watcher runs starts its own polling thread.
+                                  Defaults to False.
+        :type watch_in_children: bool, optional
+        """
+        self._interval = interval
+        self._debounce = debounce
+        self._batch_size = batch_size
+        self._watch_in_children = watch_in_children
+        self._watched: dict[str, _WatchedFile] = {}
+        self._names: list[str] = []
+        self._cursor = 0
+        self._callbacks: list[ReloadCallback] = []
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        track_fork(self)
+
+    def watch(self,
+              config_name: str = None,
+              loader_name: str = None,
+              **parameters
+              ) -> ConfigurationItem:
+        """
+        Load a configuration, publish it in `Configurations` and watch its file.
+
+        :param config_name: The name of the configuration. Defaults to `DEFAULT_CONFIGURATION_NAME`.
+        :type config_name: str, optional
+        :param loader_name: The name of the loader to use. Defaults to `DEFAULT_LOADER_NAME`.
+        :type loader_name: str, optional
+        :param parameters: The loading parameters. By default, they are resolved by the lazy handlers of the loader.
+        :type parameters: dict, optional
+        :return: The loaded configuration item.
+        :rtype: ConfigurationItem
+        :raises ConfigurationHandlerError: If the loader does not record the "full_path" of the loaded file.
+        """
+        if config_name is None:
+            config_name = DEFAULT_CONFIGURATION_NAME
+        if loader_name is None:
+            loader_name = DEFAULT_LOADER_NAME
+        loader = Configurations._get_sync_loader(loader_name)  # NOQA
+        if not parameters:
+            parameters = loader.lazy_parameters(config_name)
+
+        loaded = loader.load_parameters(**parameters)
+        full_path = loaded.get('full_path')
+        if full_path is None:
+            critical(f'Configuration "{config_name}" cannot be watched: its loader does not load a file.',
+                     ConfigurationHandlerError)
+        signature = _signature(full_path)
+
+        with self._lock:
+            if config_name not in self._watched:
+                self._names.append(config_name)
+            self._watched[config_name] = _WatchedFile(loader_name, parameters, Path(full_path), signature)
+        self._publish(config_name, loaded[KEY_RESULT])
+        return loaded[KEY_RESULT]
+
+    def unwatch(self, config_name: str = None):
+        """
+        Stop watching the file of a configuration. The configuration stays loaded.
+
+        :param config_name: The name of the configuration. Defaults to `DEFAULT_CONFIGURATION_NAME`.
+        :type config_name: str, optional
+        :raises ConfigurationNotFoundError: If the configuration is not watched.
+        :return: None
+        """
+        if config_name is None:
+            config_name = DEFAULT_CONFIGURATION_NAME
+        with self._lock:
+            if config_name not in self._watched:
+                critical(f'Configuration "{config_name}" is not watched.', ConfigurationNotFoundError)
+            del self._watched[config_name]
+            self._names.remove(config_name)
+
+    def add_callback(self, callback: ReloadCallback):
+        """
+        Add a callback called after each reload.
+
+        :param callback: The callback to add.
+        :type callback: ReloadCallback
+        :return: None
+        """
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: ReloadCallback):
+        """
+        Remove a reload callback.
+
+        :param callback: The callback to remove.
+        :type callback: ReloadCallback
+        :return: None
+        """
+        self._callbacks.remove(callback)
+
+    def is_watched(self, config_name: str) -> bool:
+        """
+        Checks if the file of a configuration is watched.
+
+        :param config_name: The name of the configuration.
+        :type config_name: str
+        :return: A boolean value indicating whether the configuration is watched.
+        :rtype: bool
+        """
+        return config_name in self._watched
+
+    def poll(self) -> list[str]:
+        """
+        Run one polling step: check the next batch of watched files and reload the changed ones. The files are
+        checked under the lock, and the changed ones are reloaded after it is released, so the parsing and the
+        reload callbacks do not block `watch` and `unwatch`.
+
+        :return: The names of the reloaded configurations.
+        :rtype: list[str]
+        """
+        changed = []
+        with self._lock:
+            if not self._names:
+                return []
+            count = min(self._batch_size, len(self._names))
+            batch = [self._names[(self._cursor + index) % len(self._names)] for index in range(count)]
+            self._cursor = (self._cursor + count) % len(self._names)
+
+            now = time.monotonic()
+            for config_name in batch:
+                watched = self._watched[config_name]
+                signature = _signature(watched.full_path)
+                if signature is None or signature == watched.signature:
+                    continue
+                if signature != watched.pending:
+                    watched.pending = signature
+                    watched.pending_since = now
+                if now - watched.pending_since < self._debounce:
+                    continue
+                watched.signature = signature
+                changed.append((config_name, watched))
+        return [config_name for config_name, watched in changed if self._reload(config_name, watched)]
+
+    def _reload(self, config_name: str, watched: _WatchedFile) -> bool:
+        """
+        Parse the file of a configuration again and publish the new item.
+
+        :param config_name: The name of the configuration.
+        :type config_name: str
+        :param watched: The state of the watched file.
+        :type watched: _WatchedFile
+        :return: Whether the configuration was reloaded. On error, the previous item is kept.
+        :rtype: bool
+        """
+        try:
+            item = Configurations._get_sync_loader(watched.loader_name).load(**watched.parameters)  # NOQA
+        except Exception as error:  # NOQA
+            logging.error(f'Cannot reload configuration "{config_name}" from "{watched.full_path}": {error}')
+            return False
+        self._publish(config_name, item)
+        return True
+
+    def _publish(self, config_name: str, item: ConfigurationItem):
+        """
+        Replace a configuration in `Configurations` and call the reload callbacks.
+
+        :param config_name: The name of the configuration.
+        :type config_name: str
+        :param item: The new configuration item.
+        :type item: ConfigurationItem
+        :return: None
+        """
+        previous = Configurations.configurations.get(config_name)
+        item = Configurations.add_config(item, config_name, allow_overwrite=True)
+        for callback in list(self._callbacks):
+            try:
+                callback(config_name, previous, item)
+            except Exception as error:  # NOQA
+                logging.error(f'Reload callback of configuration "{config_name}" failed: {error}')
+
+    def start(self):
+        """
+        Start polling the watched files in a background thread.
+
+        :return: None
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='gemtoolsconfig-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background thread.
+
+        :return: None
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _after_fork(self):
+        """
+        Reset the lock in a forked child. The thread of the parent does not exist in the child: a new polling thread
+        is started if the watcher was running and `watch_in_children` is set.
+
+        :return: None
+        """
+        self._lock = threading.RLock()
+        running = self._thread is not None and not self._stop_event.is_set()
+        self._thread = None
+        self._stop_event = threading.Event()
+        if running and self._watch_in_children:
+            self.start()
+
+    def _run(self):
+        """
+        The loop of the background thread.
+
+        :return: None
+        """
+        while not self._stop_event.wait(self._interval):
+            self.poll()
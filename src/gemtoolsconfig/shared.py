@@ -0,0 +1,483 @@
+from __future__ import annotations
+
+import os
+import pickle
+import struct
+import sys
+from collections.abc import ItemsView, Mapping, Sequence, ValuesView
+from typing import Any, Iterator
+
+from .exceptions import critical, ConfigurationLoadingError
+from .frozen import PATH_SEPARATOR
+
+_MAGIC = b'GTCSHM\x00\x01'
+
+_HEADER = struct.Struct('<8sQQ')
+"""
+The header of a shared segment: the magic bytes, the size of the encoded tree and the offset of its root node.
+"""
+
+_COUNT = struct.Struct('<I')
+
+_DICT_ENTRY = struct.Struct('<III')
+"""
+An entry of a dictionary node: the offset and the size of the UTF-8 key, and the offset of the value node.
+"""
+
+_INT = struct.Struct('<q')
+
+_FLOAT = struct.Struct('<d')
+
+_TAG_DICT = ord('D')
+_TAG_LIST = ord('L')
+_TAG_STR = ord('s')
+_TAG_INT = ord('i')
+_TAG_FLOAT = ord('d')
+_TAG_TRUE = ord('t')
+_TAG_FALSE = ord('f')
+_TAG_NONE = ord('n')
+_TAG_PICKLE = ord('p')
+
+_INT_MIN = -2 ** 63
+
+_INT_MAX = 2 ** 63 - 1
+
+
+class _Encoder:
+    """
+    Encode a configuration tree in the binary format read by `SharedConfiguration` and `SharedList`.
+
+    The children of a node are written before the node, so each node refers to them by their offset. The entries of
+    a dictionary node are followed by their indexes sorted by key, for the binary search of the lookups. The values
+    that have no dedicated encoding (e.g. dates), and the dictionaries with keys other than strings, are pickled.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray(_HEADER.size)
+
+    def _append(self, data: bytes) -> int:
+        offset = len(self.buffer)
+        self.buffer += data
+        return offset
+
+    def encode(self, value: Any) -> int:
+        """
+        Encode a value and its children.
+
+        :param value: The value to encode.
+        :type value: Any
+        :return: The offset of the encoded value.
+        :rtype: int
+        """
+        if value is None:
+            return self._append(bytes([_TAG_NONE]))
+        if value is True:
+            return self._append(bytes([_TAG_TRUE]))
+        if value is False:
+            return self._append(bytes([_TAG_FALSE]))
+        if type(value) is int and _INT_MIN <= value <= _INT_MAX:
+            return self._append(bytes([_TAG_INT]) + _INT.pack(value))
+        if type(value) is float:
+            return self._append(bytes([_TAG_FLOAT]) + _FLOAT.pack(value))
+        if type(value) is str:
+            data = value.encode('utf-8', 'surrogatepass')
+            return self._append(bytes([_TAG_STR]) + _COUNT.pack(len(data)) + data)
+        if isinstance(value, Mapping) and all(type(key) is str for key in value):
+            return self._encode_dict(value)
+        if isinstance(value, (list, tuple)):
+            offsets = [self.encode(item) for item in value]
+            return self._append(bytes([_TAG_LIST]) + _COUNT.pack(len(offsets))
+                                + struct.pack(f'<{len(offsets)}I', *offsets))
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return self._append(bytes([_TAG_PICKLE]) + _COUNT.pack(len(data)) + data)
+
+    def _encode_dict(self, value: Mapping) -> int:
+        entries = []
+        for key, item in value.items():
+            item_offset = self.encode(item)
+            data = key.encode('utf-8', 'surrogatepass')
+            entries.append((data, self._append(data), item_offset))
+        order = sorted(range(len(entries)), key=lambda index: entries[index][0])
+        node = bytearray([_TAG_DICT])
+        node += _COUNT.pack(len(entries))
+        for data, key_offset, item_offset in entries:
+            node += _DICT_ENTRY.pack(key_offset, len(data), item_offset)
+        node += struct.pack(f'<{len(order)}I', *order)
+        return self._append(bytes(node))
+
+
+def encode_tree(item: Any) -> bytes:
+    """
+    Encode a configuration tree for a shared segment.
+
+    :param item: The configuration tree.
+    :type item: Any
+    :return: The encoded tree, with its header.
+    :rtype: bytes
+    """
+    encoder = _Encoder()
+    root = encoder.encode(item)
+    _HEADER.pack_into(encoder.buffer, 0, _MAGIC, len(encoder.buffer), root)
+    return bytes(encoder.buffer)
+
+
+def _decode(buffer: memoryview, offset: int) -> Any:
+    """
+    Decode the node at an offset. The dictionaries and the lists are decoded as views, their children are decoded
+    when they are accessed.
+
+    :param buffer: The encoded tree.
+    :type buffer: memoryview
+    :param offset: The offset of the node.
+    :type offset: int
+    :return: The decoded value.
+    :rtype: Any
+    """
+    tag = buffer[offset]
+    if tag == _TAG_DICT:
+        return SharedConfiguration(buffer, offset)
+    if tag == _TAG_LIST:
+        return SharedList(buffer, offset)
+    if tag == _TAG_STR:
+        size, = _COUNT.unpack_from(buffer, offset + 1)
+        return str(buffer[offset + 5:offset + 5 + size], 'utf-8', 'surrogatepass')
+    if tag == _TAG_INT:
+        return _INT.unpack_from(buffer, offset + 1)[0]
+    if tag == _TAG_FLOAT:
+        return _FLOAT.unpack_from(buffer, offset + 1)[0]
+    if tag == _TAG_TRUE:
+        return True
+    if tag == _TAG_FALSE:
+        return False
+    if tag == _TAG_NONE:
+        return None
+    size, = _COUNT.unpack_from(buffer, offset + 1)
+    return pickle.loads(buffer[offset + 5:offset + 5 + size])
+
+
+class SharedConfiguration(Mapping):
+    """
+    A read-only view of a dictionary encoded in shared memory.
+
+    A lookup is a binary search on the encoded keys, and only the accessed values are decoded. The views of the nested
+    dictionaries and lists are kept by their parent; the other values are decoded again on each access, so reading a
+    configuration does not accumulate a private copy of it in each process. Processes that share the segment share
+    its pages: reading the configuration does not write to them, so the copy-on-write of forked processes keeps a
+    single copy.
+    """
+    __slots__ = ('_buffer', '_offset', '_count', '_children')
+
+    def __init__(self, buffer: memoryview, offset: int):
+        """
+        SharedConfiguration constructor. Use `SharedSegment` to get the root of a shared segment.
+
+        :param buffer: The encoded tree.
+        :type buffer: memoryview
+        :param offset: The offset of the dictionary node.
+        :type offset: int
+        """
+        self._buffer = buffer
+        self._offset = offset
+        self._count, = _COUNT.unpack_from(buffer, offset + 1)
+        self._children: dict[str, Any] = {}
+
+    def _entry(self, index: int) -> tuple[int, int, int]:
+        return _DICT_ENTRY.unpack_from(self._buffer, self._offset + 5 + index * _DICT_ENTRY.size)
+
+    def _key(self, index: int) -> bytes:
+        key_offset, key_size, _ = self._entry(index)
+        return bytes(self._buffer[key_offset:key_offset + key_size])
+
+    def _find(self, key: str) -> int:
+        """
+        Find the value node of a key, by a binary search on the sorted entries.
+
+        :param key: The key.
+        :type key: str
+        :return: The offset of the value node, or -1 if the key is missing.
+        :rtype: int
+        """
+        data = key.encode('utf-8', 'surrogatepass')
+        order_offset = self._offset + 5 + self._count * _DICT_ENTRY.size
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            index, = _COUNT.unpack_from(self._buffer, order_offset + middle * _COUNT.size)
+            key_offset, key_size, value_offset = self._entry(index)
+            current = bytes(self._buffer[key_offset:key_offset + key_size])
+            if current == data:
+                return value_offset
+            if current < data:
+                low = middle + 1
+            else:
+                high = middle
+        return -1
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._children.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if type(key) is not str:
+            raise KeyError(key)
+        offset = self._find(key)
+        if offset < 0:
+            raise KeyError(key)
+        value = _decode(self._buffer, offset)
+        if type(value) in _VIEWS:
+            self._children[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._key(index).decode('utf-8', 'surrogatepass')
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._children or (type(key) is str and self._find(key) >= 0)
+
+    def _iter_items(self) -> Iterator[tuple[str, Any]]:
+        """
+        Iterate over the items in their original order, reading the entries directly instead of searching each key.
+
+        :return: The items.
+        :rtype: Iterator[tuple[str, Any]]
+        """
+        for index in range(self._count):
+            key_offset, key_size, value_offset = self._entry(index)
+            key = str(self._buffer[key_offset:key_offset + key_size], 'utf-8', 'surrogatepass')
+            value = self._children.get(key, _MISSING)
+            if value is _MISSING:
+                value = _decode(self._buffer, value_offset)
+                if type(value) in _VIEWS:
+                    self._children[key] = value
+            yield key, value
+
+    def items(self) -> ItemsView:
+        return _SharedItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _SharedValuesView(self)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.thaw()!r})'
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Get a value by its key, or by a dotted key path (e.g. "debug.level").
+
+        :param key: The key, or the key path.
+        :type key: Any
+        :param default: The value to return if the key cannot be found.
+        :type default: Any
+        :return: The value.
+        :rtype: Any
+        """
+        try:
+            return self[key]
+        except KeyError:
+            pass
+        if type(key) is not str or PATH_SEPARATOR not in key:
+            return default
+        value = self
+        for part in key.split(PATH_SEPARATOR):
+            if not isinstance(value, SharedConfiguration) or part not in value:
+                return default
+            value = value[part]
+        return value
+
+    def thaw(self) -> dict:
+        """
+        Get a mutable copy of the configuration, made of regular dictionaries and lists.
+
+        :return: The mutable copy.
+        :rtype: dict
+        """
+        return {key: _thaw(value) for key, value in self.items()}
+
+
+class SharedList(Sequence):
+    """
+    A read-only view of a list encoded in shared memory. Only the accessed items are decoded, and only the views of
+    the nested dictionaries and lists are kept.
+    """
+    __slots__ = ('_buffer', '_offset', '_count', '_children')
+
+    def __init__(self, buffer: memoryview, offset: int):
+        """
+        SharedList constructor.
+
+        :param buffer: The encoded tree.
+        :type buffer: memoryview
+        :param offset: The offset of the list node.
+        :type offset: int
+        """
+        self._buffer = buffer
+        self._offset = offset
+        self._count, = _COUNT.unpack_from(buffer, offset + 1)
+        self._children: dict[int, Any] = {}
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('list index out of range')
+        value = self._children.get(index, _MISSING)
+        if value is _MISSING:
+            offset, = _COUNT.unpack_from(self._buffer, self._offset + 5 + index * _COUNT.size)
+            value = _decode(self._buffer, offset)
+            if type(value) in _VIEWS:
+                self._children[index] = value
+        return value
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(item == other_item for item, other_item in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.thaw()!r})'
+
+    def thaw(self) -> list:
+        """
+        Get a mutable copy of the list, made of regular dictionaries and lists.
+
+        :return: The mutable copy.
+        :rtype: list
+        """
+        return [_thaw(value) for value in self]
+
+
+_MISSING = object()
+
+_VIEWS = (SharedConfiguration, SharedList)
+
+
+class _SharedItemsView(ItemsView):
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator[tuple[str, Any]]:
+        return self._mapping._iter_items()  # NOQA
+
+
+class _SharedValuesView(ValuesView):
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator[Any]:
+        for _, value in self._mapping._iter_items():  # NOQA
+            yield value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, (SharedConfiguration, SharedList)):
+        return value.thaw()
+    return value
+
+
+class SharedSegment:
+    """
+    A shared memory segment holding an encoded configuration tree.
+
+    The process that creates the segment owns it and destroys it when it is closed; the processes forked from it only
+    release it. Other processes attach to it by its name, read-only.
+    """
+
+    def __init__(self, memory: 'shared_memory.SharedMemory', owner: bool):
+        """
+        SharedSegment constructor. Use `create` or `attach`.
+
+        :param memory: The shared memory.
+        :type memory: shared_memory.SharedMemory
+        :param owner: Whether this process created the segment.
+        :type owner: bool
+        :raises ConfigurationLoadingError: If the shared memory does not hold a configuration tree.
+        """
+        self._memory = memory
+        self._owner = os.getpid() if owner else None
+        magic, size, root = _HEADER.unpack_from(memory.buf, 0)
+        if magic != _MAGIC:
+            memory.close()
+            critical(f'Shared memory "{memory.name}" does not hold a configuration tree.', ConfigurationLoadingError)
+        self._buffer = memory.buf[:size].toreadonly()
+        self.root: SharedConfiguration = _decode(self._buffer, root)
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the shared memory, to attach to it from other processes.
+
+        :rtype: str
+        """
+        return self._memory.name
+
+    @property
+    def size(self) -> int:
+        """
+        The size of the encoded tree, in bytes.
+
+        :rtype: int
+        """
+        return len(self._buffer)
+
+    @classmethod
+    def create(cls, configurations: dict[str, Any], name: str = None) -> SharedSegment:
+        """
+        Encode configurations in a new shared memory segment.
+
+        :param configurations: The configurations, by name.
+        :type configurations: dict[str, Any]
+        :param name: The name of the shared memory. Defaults to a random name.
+        :type name: str, optional
+        :return: The segment, whose root maps the names to the shared configurations.
+        :rtype: SharedSegment
+        """
+        from multiprocessing import shared_memory
+        data = encode_tree(configurations)
+        memory = shared_memory.SharedMemory(name, create=True, size=len(data))
+        memory.buf[:len(data)] = data
+        return cls(memory, True)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedSegment:
+        """
+        Attach to a segment created by another process.
+
+        :param name: The name of the shared memory.
+        :type name: str
+        :return: The segment.
+        :rtype: SharedSegment
+        :raises FileNotFoundError: If the shared memory does not exist.
+        """
+        from multiprocessing import shared_memory
+        if sys.version_info >= (3, 13):
+            memory = shared_memory.SharedMemory(name, track=False)
+        else:
+            memory = shared_memory.SharedMemory(name)
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(memory._name, 'shared_memory')  # NOQA
+        return cls(memory, False)
+
+    def close(self):
+        """
+        Release the segment in this process, and destroy it if this process created it. The shared configurations
+        of this segment cannot be used afterwards.
+
+        :return: None
+        """
+        self.root = None
+        self._buffer.release()
+        self._memory.close()
+        if self._owner == os.getpid():
+            self._memory.unlink()
+
+    def __enter__(self) -> SharedSegment:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
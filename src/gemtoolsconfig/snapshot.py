@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import os
+import pickle
+import struct
+import threading
+from os import PathLike
+from pathlib import Path
+from typing import Any, Union
+
+from .exceptions import critical, ConfigurationNotFoundError, ConfigurationLoadingError
+from .forking import track_fork
+from .handlers import DEFAULT_PATH, KEY_RESULT, LoadingHandler, get_argument_getter, list_configuration_names
+
+DEFAULT_SNAPSHOT_PATH = 'configurations.snapshot'
+
+_MAGIC = b'GTCSNAP\x00'
+
+_VERSION = 1
+
+_HEADER = struct.Struct('<8sHQQ')
+"""
+The header of a snapshot: the magic bytes, the format version, the offset and the size of the index.
+"""
+
+
+def compile_snapshot(directory: Union[PathLike, str] = DEFAULT_PATH,
+                     output: Union[PathLike, str] = DEFAULT_SNAPSHOT_PATH,
+                     key_file: Union[PathLike, str] = None
+                     ) -> list[str]:
+    """
+    Load every configuration of a directory and write them in a snapshot file.
+
+    The configurations are resolved like `preset_file_loader` resolves them (see `list_configuration_names`). Each
+    configuration is stored as a separate pickled entry, found by an index of their offsets, so a reader only
+    deserializes the configurations it loads. The snapshot file is replaced atomically: when a configuration cannot
+    be loaded, the previous snapshot is kept and the temporary file is removed.
+
+    :param directory: The directory of the configuration files. Defaults to the current directory.
+    :type directory: Union[PathLike, str]
+    :param output: The path of the snapshot file. Defaults to DEFAULT_SNAPSHOT_PATH.
+    :type output: Union[PathLike, str]
+    :param key_file: Optional path to the file containing the encryption key of the configuration files.
+    :type key_file: Union[PathLike, str], optional
+    :return: The names of the compiled configurations.
+    :rtype: list[str]
+    :raises: NotADirectoryError if the specified directory does not exist.
+    """
+    from .presets import preset_file_loader
+
+    directory = Path(directory)
+    loader = preset_file_loader(directory, key_file)
+    names = list_configuration_names(directory)
+
+    output = Path(output)
+    temp_path = output.with_name(f'{output.name}.{os.getpid()}.tmp')
+    index = {}
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(bytes(_HEADER.size))
+            for name in names:
+                entry = pickle.dumps(loader.lazy_load(name), protocol=pickle.HIGHEST_PROTOCOL)
+                index[name] = (file.tell(), len(entry))
+                file.write(entry)
+            index_offset = file.tell()
+            index_entry = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+            file.write(index_entry)
+            file.seek(0)
+            file.write(_HEADER.pack(_MAGIC, _VERSION, index_offset, len(index_entry)))
+        os.replace(temp_path, output)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return names
+
+
+class SnapshotReader:
+    """
+    Read the configurations of a snapshot file written by `compile_snapshot`.
+
+    Only the index is read when the snapshot is opened. Each configuration is read at its offset and deserialized
+    when it is requested. When the snapshot file is replaced, or in a forked process, it is opened again on the next
+    read, so a child does not share the file position of its parent.
+
+    The entries are pickled, so a snapshot must come from a trusted source, like the configuration files themselves.
+    """
+
+    def __init__(self, path: Union[PathLike, str] = DEFAULT_SNAPSHOT_PATH):
+        """
+        SnapshotReader constructor.
+
+        :param path: The path of the snapshot file.
+        :type path: Union[PathLike, str]
+        :raises FileNotFoundError: If the snapshot file does not exist.
+        :raises ConfigurationLoadingError: If the file is not a snapshot.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+        self._signature = None
+        self._index: dict[str, tuple[int, int]] = {}
+        self._open()
+        track_fork(self)
+
+    def _open(self):
+        """
+        Open the snapshot file and read its index.
+
+        :return: None
+        :raises ConfigurationLoadingError: If the file is not a snapshot.
+        """
+        file = open(self.path, 'rb')
+        try:
+            stat = os.fstat(file.fileno())
+            magic, version, index_offset, index_size = _HEADER.unpack(file.read(_HEADER.size).ljust(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION:
+                critical(f'"{self.path}" is not a configuration snapshot of version {_VERSION}.',
+                         ConfigurationLoadingError)
+            file.seek(index_offset)
+            index = pickle.loads(file.read(index_size))
+        except BaseException:
+            file.close()
+            raise
+        if self._file is not None:
+            self._file.close()
+        self._file = file
+        self._signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self._index = index
+
+    def _refresh(self):
+        """
+        Open the snapshot file again if it was closed, or replaced since it was opened.
+
+        :return: None
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            stat = None
+        if self._file is None or (stat is not None
+                                  and (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self._signature):
+            self._open()
+
+    def names(self) -> list[str]:
+        """
+        Get the names of the configurations of the snapshot.
+
+        :return: The configuration names.
+        :rtype: list[str]
+        """
+        with self._lock:
+            self._refresh()
+            return list(self._index)
+
+    def read(self, name: str) -> Any:
+        """
+        Read and deserialize one configuration.
+
+        :param name: The name of the configuration.
+        :type name: str
+        :return: The configuration.
+        :rtype: Any
+        :raises ConfigurationNotFoundError: If the snapshot has no configuration with this name.
+        """
+        with self._lock:
+            self._refresh()
+            location = self._index.get(name)
+            if location is None:
+                critical(f'Configuration "{name}" cannot be found in the snapshot "{self.path}".',
+                         ConfigurationNotFoundError)
+            offset, size = location
+            self._file.seek(offset)
+            entry = self._file.read(size)
+        return pickle.loads(entry)
+
+    def close(self):
+        """
+        Close the snapshot file.
+
+        :return: None
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _after_fork(self):
+        """
+        Reset the lock and forget the file in a forked child, so it is opened again on the next read.
+
+        :return: None
+        """
+        self._lock = threading.Lock()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> SnapshotReader:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def get_snapshot_handler(reader: SnapshotReader) -> LoadingHandler:
+    """
+    Get a handler for loading configuration data from a snapshot.
+
+    :param reader: The snapshot reader.
+    :type reader: SnapshotReader
+    :return: A callable that takes a dictionary containing the "name" of the configuration, and returns a dictionary
+             containing the configuration data under the KEY_RESULT key.
+    :rtype: LoadingHandler
+    """
+    get_name = get_argument_getter('name')
+
+    def handler(params: dict) -> dict:
+        params['full_path'] = reader.path
+        params[KEY_RESULT] = reader.read(get_name(params))
+        return params
+
+    return handler
@@ -0,0 +1,210 @@
+import json
+import mmap
+import re
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Union
+
+from .backends import Parser, get_parser
+from .exceptions import critical, ConfigurationNotFoundError
+from .frozen import PATH_SEPARATOR
+
+KeyPath = Union[str, list[str], tuple[str, ...]]
+"""
+The key path of a subtree: a dotted string (e.g. "routing.eu") or a sequence of keys.
+"""
+
+STREAMING_EXTENSIONS = ['.json']
+"""
+The file extensions whose subtrees are read without parsing the whole file. The other formats are fully parsed.
+"""
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+_FLAT = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.DOTALL)
+
+_BRACKET = re.compile(rb'[\[\]{}]')
+
+_SCALAR_END = re.compile(rb'[,\]}\s]')
+
+
+def split_key_path(path: KeyPath) -> tuple[str, ...]:
+    """
+    Get the keys of a key path.
+
+    :param path: The key path.
+    :type path: KeyPath
+    :return: The keys.
+    :rtype: tuple[str, ...]
+    """
+    if isinstance(path, str):
+        return tuple(path.split(PATH_SEPARATOR))
+    return tuple(path)
+
+
+def _not_found(path: tuple[str, ...], depth: int, file_path: Path):
+    critical(f'Key path "{PATH_SEPARATOR.join(path[:depth + 1])}" cannot be found in "{file_path}".',
+             ConfigurationNotFoundError)
+
+
+def select_subtree(item: Any, path: KeyPath, file_path: Path = None) -> Any:
+    """
+    Get the subtree of a parsed configuration at a key path.
+
+    :param item: The parsed configuration.
+    :type item: Any
+    :param path: The key path.
+    :type path: KeyPath
+    :param file_path: The file the configuration comes from, for the error message.
+    :type file_path: Path, optional
+    :return: The subtree.
+    :rtype: Any
+    :raises ConfigurationNotFoundError: If the key path does not exist.
+    """
+    path = split_key_path(path)
+    for depth, key in enumerate(path):
+        if not isinstance(item, Mapping) or key not in item:
+            _not_found(path, depth, file_path)
+        item = item[key]
+    return item
+
+
+def _skip_whitespace(buffer: Any, position: int) -> int:
+    return _WHITESPACE.match(buffer, position).end()
+
+
+def _value_end(buffer: Any, position: int) -> int:
+    """
+    Find the end of the JSON value that starts at a position, without decoding it, so the skipped values are not
+    validated.
+
+    In a container, the scan jumps from bracket to bracket. A bracket is structural when the text since the previous
+    one holds an even number of quotes and no escape, which is the common case. Otherwise, the text is matched string
+    by string to find the next structural bracket.
+
+    :param buffer: The JSON document.
+    :type buffer: Any
+    :param position: The position of the first character of the value.
+    :type position: int
+    :return: The position after the last character of the value.
+    :rtype: int
+    :raises ValueError: If the document ends before the value.
+    """
+    first = buffer[position:position + 1]
+    if first == b'"':
+        match = _STRING.match(buffer, position)
+        if match is None:
+            raise ValueError(f'Unterminated string starting at {position}.')
+        return match.end()
+    if first in (b'{', b'['):
+        start = position
+        depth = 0
+        while True:
+            match = _BRACKET.search(buffer, position)
+            if match is None:
+                raise ValueError(f'Unterminated container starting at {start}.')
+            text = buffer[position:match.start()]
+            if b'\\' in text or text.count(b'"') % 2:
+                position = _FLAT.match(buffer, position).end()
+            else:
+                position = match.start()
+            bracket = buffer[position:position + 1]
+            if bracket in (b'{', b'['):
+                depth += 1
+            elif bracket in (b'}', b']'):
+                depth -= 1
+                if depth == 0:
+                    return position + 1
+            else:
+                raise ValueError(f'Unterminated container starting at {start}.')
+            position += 1
+    match = _SCALAR_END.search(buffer, position)
+    return len(buffer) if match is None else match.start()
+
+
+def _expect(buffer: Any, position: int, character: bytes) -> int:
+    if buffer[position:position + 1] != character:
+        raise ValueError(f'Expecting {character.decode()!r} at {position}.')
+    return _skip_whitespace(buffer, position + 1)
+
+
+def _find_json_subtree(buffer: Any, path: tuple[str, ...], file_path: Path, parse: Parser = json.loads) -> Any:
+    """
+    Decode the subtree of a JSON document at a key path. The keys of the objects along the path are scanned and the
+    values of their siblings are skipped, so only the requested subtree is decoded.
+
+    :param buffer: The JSON document, as a bytes-like object.
+    :type buffer: Any
+    :param path: The keys.
+    :type path: tuple[str, ...]
+    :param file_path: The path of the file, for the error messages.
+    :type file_path: Path
+    :param parse: The JSON parser of the keys and of the subtree. Defaults to `json.loads`.
+    :type parse: Parser, optional
+    :return: The subtree.
+    :rtype: Any
+    :raises ConfigurationNotFoundError: If the key path does not exist.
+    :raises ValueError: If the scanned part of the document is not valid JSON.
+    """
+    position = _skip_whitespace(buffer, len(_UTF8_BOM) if buffer[:len(_UTF8_BOM)] == _UTF8_BOM else 0)
+    for depth, key in enumerate(path):
+        if buffer[position:position + 1] != b'{':
+            _not_found(path, depth, file_path)
+        position = _skip_whitespace(buffer, position + 1)
+        while True:
+            if buffer[position:position + 1] == b'}':
+                _not_found(path, depth, file_path)
+            end = _value_end(buffer, position)
+            name = parse(buffer[position:end])
+            position = _expect(buffer, _skip_whitespace(buffer, end), b':')
+            if name == key:
+                break
+            position = _skip_whitespace(buffer, _value_end(buffer, position))
+            if buffer[position:position + 1] == b',':
+                position = _skip_whitespace(buffer, position + 1)
+    return parse(buffer[position:_value_end(buffer, position)])
+
+
+def load_subtree(file_path: Path,
+                 path: KeyPath,
+                 load: Callable[[Path], Any],
+                 backends: dict[str, str] = None
+                 ) -> Any:
+    """
+    Load only the subtree at a key path from a configuration file.
+
+    A JSON file is memory-mapped and scanned: the values outside the key path are skipped without being decoded or
+    copied, so the time and the memory depend on the size of the subtree more than on the size of the file. When an
+    object has the same key several times, the first one is used. The subtree is decoded by the selected JSON backend.
+    The other formats, and the JSON files parsed by gemtoolsio, are fully parsed with `load`.
+
+    :param file_path: The path of the configuration file.
+    :type file_path: Path
+    :param path: The key path.
+    :type path: KeyPath
+    :param load: The function that fully parses a file, for the formats that are not streamed.
+    :type load: Callable[[Path], Any]
+    :param backends: The backend to use by format (see `backends.get_parser`). Defaults to the fastest installed ones.
+    :type backends: dict[str, str], optional
+    :return: The subtree.
+    :rtype: Any
+    :raises ConfigurationNotFoundError: If the key path does not exist.
+    """
+    path = split_key_path(path)
+    if file_path.suffix.lower() not in STREAMING_EXTENSIONS:
+        return select_subtree(load(file_path), path, file_path)
+    parse = get_parser('.json', backends)
+    if getattr(parse, 'gemtoolsio', False) is True:
+        return select_subtree(load(file_path), path, file_path)
+
+    with open(file_path, 'rb') as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return _find_json_subtree(b'', path, file_path, parse)
+        with buffer:
+            return _find_json_subtree(buffer, path, file_path, parse)
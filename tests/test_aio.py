@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import Mock
+
+from gemtoolsconfig.aio import AsyncConfigurationLoader, AsyncConfigurationLoaderBuilder
+from gemtoolsconfig.configurations import Configurations
+from gemtoolsconfig.exceptions import ArgumentError, ConfigurationHandlerError, ConfigurationNotFoundError
+from gemtoolsconfig.handlers import KEY_RESULT
+from gemtoolsconfig.instrumentation import Instrumentation
+from gemtoolsconfig.loader import ConfigurationLoaderBuilder
+
+
+class TestAsyncConfigurationLoader(unittest.IsolatedAsyncioTestCase):
+    async def test_handlers(self):
+        threads = []
+
+        def blocking_handler(params: dict) -> dict:
+            threads.append(threading.current_thread())
+            params['path'] = params['name'] + '.toml'
+            return params
+
+        async def async_handler(params: dict) -> dict:
+            threads.append(threading.current_thread())
+            params[KEY_RESULT] = {'path': params['path']}
+            return params
+
+        loader = AsyncConfigurationLoaderBuilder() \
+            .add_lazy_handler(blocking_handler) \
+            .add_loading_handler(async_handler) \
+            .build()
+        self.assertIsInstance(loader, AsyncConfigurationLoader)
+        self.assertEqual({'path': 'config.toml'}, await loader.lazy_load('config'))
+        self.assertIsNot(threading.current_thread(), threads[0])
+        self.assertIs(threading.current_thread(), threads[1])
+
+    async def test_invalid_result(self):
+        loader = AsyncConfigurationLoader([], [])
+        with self.assertRaises(ConfigurationHandlerError):
+            await loader.load(invalid_key={})
+
+    async def test_from_loader(self):
+        def handler(params: dict) -> dict:
+            params[KEY_RESULT] = {'key': 'value'}
+            return params
+
+        loader = AsyncConfigurationLoader.from_loader(ConfigurationLoaderBuilder().add_loading_handler(handler).build())
+        self.assertEqual({'key': 'value'}, await loader.load())
+
+    async def test_builder(self):
+        # Setup
+        def handler(params: dict) -> dict:
+            params[KEY_RESULT] = {'key': 'value'}
+            return params
+
+        builder = AsyncConfigurationLoaderBuilder().add_loading_handler(handler).set_name_lister(lambda: ['config'])
+        loader = builder.build()
+        builder.add_loading_handler(Mock(side_effect=RuntimeError))
+
+        # Test
+        self.assertEqual({'key': 'value'}, await loader.load())
+        self.assertEqual(['config'], loader.list_names())
+        with self.assertRaises(ArgumentError):
+            builder.set_instrumentation(Instrumentation())
+        with self.assertRaises(ArgumentError):
+            AsyncConfigurationLoader.from_loader(ConfigurationLoaderBuilder().set_instrumentation(Instrumentation())
+                                                 .build())
+
+
+class TestConfigurationsAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        Configurations.clear()
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+
+    async def test_aget_config_single_load(self):
+        calls = []
+
+        async def handler(params: dict) -> dict:
+            calls.append(params['name'])
+            await asyncio.sleep(0.01)
+            params[KEY_RESULT] = {'name': params['name']}
+            return params
+
+        Configurations.add_loader(AsyncConfigurationLoaderBuilder().add_loading_handler(handler).build())
+        results = await asyncio.gather(*(Configurations.aget_config() for _ in range(10)))
+        self.assertEqual(['config'], calls)
+        for result in results:
+            self.assertIs(Configurations.get_config(), result)
+
+    async def test_aget_config_loaded_during_await(self):
+        # Setup
+        release = asyncio.Event()
+        callback = Mock()
+
+        async def handler(params: dict) -> dict:
+            await release.wait()
+            params[KEY_RESULT] = {'source': 'loader'}
+            return params
+
+        Configurations.add_loader(AsyncConfigurationLoaderBuilder().add_loading_handler(handler).build())
+        Configurations.subscribe('config', None, callback)
+
+        # Test
+        task = asyncio.create_task(Configurations.aget_config())
+        await asyncio.sleep(0)
+        added = Configurations.add_config({'source': 'added'})
+        release.set()
+        self.assertIs(added, await task)
+        self.assertIs(added, Configurations.get_config())
+        callback.assert_not_called()
+
+    async def test_aget_config_regular_loader(self):
+        loader = Mock()
+        loader.lazy_load.return_value = {'key': 'value'}
+        Configurations.add_loader(loader)
+        self.assertEqual({'key': 'value'}, await Configurations.aget_config('other'))
+        self.assertTrue(Configurations.is_configuration_loaded('other'))
+
+    async def test_aget_config_lazy_load_not_allowed(self):
+        with self.assertRaises(ConfigurationNotFoundError):
+            await Configurations.aget_config(allow_lazy_load=False)
+
+    async def test_aload_config(self):
+        loader = Mock()
+        loader.load.return_value = {'key': 'value'}
+        Configurations.add_loader(loader)
+        self.assertEqual({'key': 'value'}, await Configurations.aload_config('other', path='other.toml'))
+        loader.load.assert_called_once_with(path='other.toml')
+        self.assertEqual({'key': 'value'}, Configurations.get_config('other'))
+
+    async def test_sync_paths_reject_async_loader(self):
+        # Setup
+        Configurations.add_loader(AsyncConfigurationLoaderBuilder().set_name_lister(lambda: ['config']).build())
+
+        # Test
+        with self.assertRaises(ArgumentError):
+            Configurations.get_config()
+        with self.assertRaises(ArgumentError):
+            Configurations.load_config()
+        with self.assertRaises(ArgumentError):
+            Configurations.load_many(['config'])
+        with self.assertRaises(ArgumentError):
+            Configurations.warmup(freeze_gc=False)
+        self.assertFalse(Configurations.is_configuration_loaded('config'))
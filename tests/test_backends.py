@@ -0,0 +1,152 @@
+import datetime
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from gemtoolsconfig import backends
+from gemtoolsconfig.backends import GEMTOOLSIO, GEMTOOLSIO_BACKENDS, get_backends, get_parser, parse, register_backend
+from gemtoolsconfig.exceptions import ArgumentError
+from gemtoolsconfig.handlers import get_file_handler, KEY_RESULT
+from gemtoolsconfig.presets import preset_file_loader
+
+TEMP_DIR = Path('tmp_backends')
+
+CORPUS = {
+    '.json': [
+        '{}',
+        '[]',
+        '{"name": "\\u00e9t\\u00e9 \\ud83d\\ude00", "escaped": "a\\"b\\\\c\\n", "raw": "été"}',
+        '{"int": 9223372036854775807, "negative": -42, "float": 1.5e-07, "zero": -0.0, "exponent": 2E+3}',
+        '{"enabled": true, "disabled": false, "missing": null}',
+        '{"nested": {"list": [1, [2, [3, {}]], {"key": []}]}, "duplicate": 1, "duplicate": 2}',
+        ' \n\t{ "spaces" : [ 1 , 2 ] } \n',
+        '{"nan": NaN, "infinity": Infinity, "big": 123456789012345678901234567890}',
+    ],
+    '.toml': [
+        '',
+        'name = "été"\nescaped = "a\\"b\\\\c\\n\\u00e9"\nliteral = \'C:\\path\'\n',
+        'int = 9_223_372_036_854_775_807\nhex = 0xff\nfloat = 1.5e-07\ninf = inf\nbool = true\n',
+        'date = 2024-01-02\ntime = 03:04:05.123456\nlocal = 2024-01-02T03:04:05\n'
+        'offset = 2024-01-02T03:04:05+02:00\nutc = 2024-01-02T03:04:05Z\n',
+        'multiline = """\nfirst\n  second"""\nraw = \'\'\'\nno \\escape\'\'\'\n',
+        '[server]\nhost = "localhost"\nports = [80, 443]\n\n[server.tls]\nenabled = false\n',
+        '[[servers]]\nname = "a"\n\n[[servers]]\nname = "b"\ninline = { key = "value", list = [[1], []] }\n',
+    ],
+    '.yaml': [
+        'name: été\nquoted: "a\\"b\\\\c\\n"\nsingle: \'it\'\'s\'\n',
+        'int: 42\nfloat: 1.5e-07\ninf: .inf\nbool: yes\noff: off\nnull: ~\nempty:\n',
+        'date: 2024-01-02\ndatetime: 2024-01-02T03:04:05Z\nstring_date: "2024-01-02"\n',
+        'list:\n  - 1\n  - [2, 3]\n  - {key: value}\nnested:\n  deep:\n    deeper: []\n',
+        'base: &base\n  key: value\n  other: 1\nderived:\n  <<: *base\n  other: 2\n',
+        'folded: >\n  first\n  second\nliteral: |\n  first\n  second\n',
+        '- item\n- 2\n',
+    ],
+}
+
+REFERENCES = {'.json': 'json', '.toml': 'tomllib', '.yaml': 'yaml'}
+"""
+The reference backend of each format, whose output the other backends must match. Without it, the last installed
+backend is the reference.
+"""
+
+
+class TestBackends(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_parity(self):
+        for file_format, documents in CORPUS.items():
+            names = [name for name in get_backends(file_format) if name != GEMTOOLSIO]
+            reference = REFERENCES[file_format] if REFERENCES[file_format] in names else names[-1]
+            for name in names:
+                for document in documents:
+                    with self.subTest(backend=name, document=document):
+                        expected = get_parser(file_format, {file_format: reference})(document)
+                        self.assertEqual(expected, parse(document, file_format, {file_format: name}))
+                        self.assertEqual(expected, parse(document.encode(), file_format, {file_format: name}))
+                        self.assertEqual(expected, parse(memoryview(b'\xef\xbb\xbf' + document.encode()),
+                                                         file_format, {file_format: name}))
+
+    def test_yaml_types(self):
+        # Test
+        result = parse('date: 2024-01-02\nbool: yes', '.yml')
+        self.assertEqual({'date': datetime.date(2024, 1, 2), 'bool': True}, result)
+        with self.assertRaises(Exception):
+            parse('value: !!python/tuple [1, 2]', '.yaml')
+
+    def test_default_backends(self):
+        # Test
+        self.assertEqual('json', get_backends('.json')[-2])
+        self.assertEqual([GEMTOOLSIO], get_backends('.ini'))
+        self.assertIs(get_parser('.json'), get_parser('.json'))
+        self.assertIs(get_parser('.json'), get_parser('.json', {'.json': get_backends('.json')[0]}))
+
+    def test_unknown_backend(self):
+        # Test
+        with self.assertRaises(ArgumentError):
+            get_parser('.toml', {'.toml': 'orjson'})
+        with self.assertRaises(ArgumentError):
+            get_file_handler(TEMP_DIR, backends={'.json': 'unknown'})
+        with self.assertRaises(ArgumentError):
+            preset_file_loader(TEMP_DIR, backends={'.yaml': 'unknown'})
+
+    def test_missing_backend(self):
+        # Setup
+        def missing(file_format):
+            raise ImportError('missing')
+
+        # Test
+        with patch.dict(backends._factories), patch.dict(backends._parsers):
+            register_backend('missing', ['.custom'], missing)
+            register_backend('custom', ['.custom'], lambda file_format: lambda data: {'format': file_format})
+            self.assertEqual(['custom', GEMTOOLSIO], get_backends('.custom'))
+            self.assertEqual({'format': '.custom'}, parse('', '.custom'))
+            with self.assertRaises(ArgumentError):
+                get_parser('.custom', {'.custom': 'missing'})
+
+    def test_preferred_backend(self):
+        # Setup
+        parser = MagicMock(return_value={'key': 'value'})
+
+        # Test
+        with patch.dict(backends._factories), patch.dict(backends._parsers):
+            register_backend('custom', ['.json'], lambda file_format: parser, preferred=True)
+            self.assertEqual('custom', get_backends('.json')[0])
+            self.assertEqual({'key': 'value'}, parse('{}', '.json'))
+        parser.assert_called_once_with('{}')
+        self.assertNotIn('custom', get_backends('.json'))
+
+    def test_file_handler(self):
+        # Setup
+        (TEMP_DIR / 'config.yaml').write_text('key: value\n')
+        (TEMP_DIR / 'config.json').write_text('{"key": "value"}')
+        parser = MagicMock(return_value={'key': 'custom'})
+
+        # Test
+        with patch.dict(backends._factories), patch.dict(backends._parsers):
+            register_backend('custom', ['.json'], lambda file_format: parser)
+            handler = get_file_handler(TEMP_DIR, backends={'.json': 'custom', '.yaml': 'yaml'})
+            self.assertEqual({'key': 'custom'}, handler({'path': 'config.json'})[KEY_RESULT])
+            self.assertEqual({'key': 'value'}, handler({'path': 'config.yaml'})[KEY_RESULT])
+            handler = get_file_handler(TEMP_DIR, memory_map=True, backends={'.json': 'custom'})
+            self.assertEqual({'key': 'custom'}, handler({'path': 'config.json'})[KEY_RESULT])
+        self.assertEqual(2, parser.call_count)
+
+    def test_gemtoolsio_backends(self):
+        # Setup
+        (TEMP_DIR / 'config.json').write_text('{"key": "value"}')
+
+        # Test
+        with patch('gemtoolsio.load_file', return_value={'key': 'gemtoolsio'}) as load:
+            handler = get_file_handler(TEMP_DIR, backends=GEMTOOLSIO_BACKENDS)
+            self.assertEqual({'key': 'gemtoolsio'}, handler({'path': 'config.json'})[KEY_RESULT])
+        load.assert_called_once_with(TEMP_DIR / 'config.json')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import dataclasses
+import datetime
+import enum
+import unittest
+from pathlib import Path
+from typing import Any, Literal, NamedTuple, Optional, Union
+
+from gemtoolsconfig import Configurations, FrozenConfiguration, freeze, preset_source_loader
+from gemtoolsconfig.binding import bind, get_converter
+from gemtoolsconfig.exceptions import ArgumentError, ConfigurationBindingError
+
+
+class Level(enum.Enum):
+    DEBUG = 'debug'
+    INFO = 'info'
+
+
+class Server(NamedTuple):
+    host: str
+    port: int = 80
+
+
+@dataclasses.dataclass(frozen=True)
+class Debug:
+    __slots__ = ('enabled', 'level')
+    enabled: bool
+    level: Level
+
+
+@dataclasses.dataclass(frozen=True)
+class Settings:
+    name: str
+    debug: Debug
+    servers: list[Server]
+    ratio: float = 1.0
+    tags: tuple[str, ...] = ()
+    limits: dict[str, int] = dataclasses.field(default_factory=dict)
+    owner: Optional[str] = None
+    mode: Literal['fast', 'safe'] = 'safe'
+    started: Optional[datetime.date] = None
+    root: Path = Path('.')
+    extra: Any = None
+
+
+@dataclasses.dataclass
+class Node:
+    name: str
+    children: list['Node'] = dataclasses.field(default_factory=list)
+
+
+CONFIG = {
+    'name': 'app',
+    'debug': {'enabled': 'yes', 'level': 'info'},
+    'servers': [{'host': 'eu'}, {'host': 'us', 'port': '8080'}],
+    'ratio': 2,
+    'tags': ['a', 'b'],
+    'limits': {'cpu': 4},
+    'started': '2023-01-31',
+    'root': '/srv',
+    'unknown': 'ignored',
+}
+
+
+class TestBinding(unittest.TestCase):
+    def test_bind(self):
+        # Test
+        settings = bind(CONFIG, Settings)
+        self.assertEqual(Settings(
+            name='app',
+            debug=Debug(True, Level.INFO),
+            servers=[Server('eu'), Server('us', 8080)],
+            ratio=2.0,
+            tags=('a', 'b'),
+            limits={'cpu': 4},
+            started=datetime.date(2023, 1, 31),
+            root=Path('/srv'),
+        ), settings)
+        self.assertIsInstance(settings.ratio, float)
+
+    def test_bind_frozen(self):
+        # Test
+        self.assertIsInstance(freeze(CONFIG), FrozenConfiguration)
+        self.assertEqual(bind(CONFIG, Settings), bind(freeze(CONFIG), Settings))
+
+    def test_converter_cached(self):
+        # Test
+        self.assertIs(get_converter(Settings), get_converter(Settings))
+        self.assertIs(get_converter(list[Server]), get_converter(list[Server]))
+
+    def test_recursive_schema(self):
+        # Test
+        tree = bind({'name': 'root', 'children': [{'name': 'leaf'}]}, Node)
+        self.assertEqual(Node('root', [Node('leaf')]), tree)
+
+    def test_union(self):
+        # Test
+        self.assertEqual(3, bind('3', Union[int, str]))
+        self.assertEqual('x', bind('x', Union[int, str]))
+        self.assertIsNone(bind(None, Optional[int]))
+        with self.assertRaises(ConfigurationBindingError):
+            bind([], Union[int, str])
+
+    def test_errors(self):
+        # Test
+        for config, path in [
+            ({**CONFIG, 'servers': [{'host': 'eu'}, {'host': 'us', 'port': 'http'}]}, 'servers[1].port'),
+            ({**CONFIG, 'debug': {'enabled': True}}, 'debug.level'),
+            ({**CONFIG, 'debug': {'enabled': 'maybe', 'level': 'info'}}, 'debug.enabled'),
+            ({**CONFIG, 'limits': {'cpu': 'many'}}, 'limits.cpu'),
+            ({**CONFIG, 'mode': 'slow'}, 'mode'),
+            ({**CONFIG, 'name': 1}, 'name'),
+            ([], '<root>'),
+        ]:
+            with self.subTest(path=path), self.assertRaises(ConfigurationBindingError) as context:
+                bind(config, Settings)
+            self.assertEqual(path, context.exception.path)
+            self.assertIn(f'"{path}"', str(context.exception))
+
+    def test_unsupported(self):
+        # Test
+        with self.assertRaises(ArgumentError):
+            get_converter(bytes)
+
+
+class TestConfigurationsBinding(unittest.TestCase):
+    def setUp(self) -> None:
+        Configurations.clear()
+        Configurations.add_loader(preset_source_loader())
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+
+    def test_get_config_schema(self):
+        # Setup
+        Configurations.add_config(CONFIG, 'settings')
+
+        # Test
+        settings = Configurations.get_config('settings', schema=Settings)
+        self.assertEqual('app', settings.name)
+        self.assertIs(settings, Configurations.get_config('settings', schema=Settings))
+        self.assertEqual(Debug(True, Level.INFO), Configurations.get_config('settings', schema=Settings).debug)
+        Configurations.add_config({**CONFIG, 'name': 'reloaded'}, 'settings', allow_overwrite=True)
+        self.assertEqual('reloaded', Configurations.get_config('settings', schema=Settings).name)
+
+    def test_get_config_schema_error(self):
+        # Setup
+        Configurations.add_config({'name': 'app'}, 'settings')
+
+        # Test
+        with self.assertRaises(ConfigurationBindingError) as context:
+            Configurations.get_config('settings', schema=Settings)
+        self.assertEqual('debug', context.exception.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from gemtoolsconfig.configurations import Configurations
+
+THREAD_COUNT = 16
+
+
+class TestConfigurationsConcurrency(unittest.TestCase):
+    def setUp(self) -> None:
+        Configurations.clear()
+        self.loader = Mock()
+        Configurations.add_loader(self.loader)
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+
+    def _get_concurrently(self, names: list[str]) -> list:
+        barrier = threading.Barrier(THREAD_COUNT)
+        results = [None] * THREAD_COUNT
+
+        def target(index: int):
+            barrier.wait()
+            try:
+                results[index] = Configurations.get_config(names[index % len(names)])
+            except Exception as error:  # NOQA
+                results[index] = error
+
+        threads = [threading.Thread(target=target, args=(index,)) for index in range(THREAD_COUNT)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_single_load_per_name(self):
+        def lazy_load(name):
+            time.sleep(0.05)
+            return {'name': name}
+
+        self.loader.lazy_load.side_effect = lazy_load
+        results = self._get_concurrently(['first', 'second'])
+
+        self.assertEqual(2, self.loader.lazy_load.call_count)
+        self.assertEqual(['first', 'second'], sorted(call.args[0] for call in self.loader.lazy_load.call_args_list))
+        for index, result in enumerate(results):
+            self.assertIs(Configurations.get_config(result['name']), result)
+
+    def test_error_shared_with_waiters(self):
+        def lazy_load(name):
+            time.sleep(0.05)
+            raise FileNotFoundError(name)
+
+        self.loader.lazy_load.side_effect = lazy_load
+        results = self._get_concurrently(['missing'])
+
+        self.assertEqual(1, self.loader.lazy_load.call_count)
+        for result in results:
+            self.assertIsInstance(result, FileNotFoundError)
+        self.assertFalse(Configurations.is_configuration_loaded('missing'))
+
+    def test_retry_after_error(self):
+        self.loader.lazy_load.side_effect = [FileNotFoundError('config'), {'key': 'value'}]
+        with self.assertRaises(FileNotFoundError):
+            Configurations.get_config()
+        self.assertEqual({'key': 'value'}, Configurations.get_config())
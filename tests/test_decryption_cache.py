@@ -0,0 +1,71 @@
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gemtoolsconfig import handlers
+from gemtoolsconfig.cache import DecryptionCache
+from gemtoolsconfig.handlers import get_file_handler, KEY_RESULT
+
+TEMP_DIR = Path('tmp_decryption_cache')
+
+
+class TestDecryptionCache(unittest.TestCase):
+    def test_get_put(self):
+        cache = DecryptionCache()
+        self.assertIsNone(cache.get(b'ciphertext'))
+        cache.put(b'ciphertext', {'key': 'value'})
+        self.assertEqual({'key': 'value'}, cache.get(b'ciphertext'))
+        self.assertIsNone(cache.get(b'other'))
+
+    def test_fresh_copies(self):
+        cache = DecryptionCache()
+        cache.put(b'ciphertext', {'section': {'key': 'value'}})
+        result = cache.get(b'ciphertext')
+        result['section']['key'] = 'changed'
+        self.assertEqual({'section': {'key': 'value'}}, cache.get(b'ciphertext'))
+
+    def test_max_entries(self):
+        cache = DecryptionCache(max_entries=2)
+        for index in range(3):
+            cache.put(b'ciphertext%d' % index, {'index': index})
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get(b'ciphertext0'))
+        self.assertEqual({'index': 2}, cache.get(b'ciphertext2'))
+
+    def test_zero_on_evict(self):
+        cache = DecryptionCache(max_entries=1, zero_on_evict=True)
+        cache.put(b'first', {'password': 'secret'})
+        entry = next(iter(cache._entries.values()))
+        cache.put(b'second', {'password': 'other'})
+        self.assertEqual(bytes(len(entry)), bytes(entry))
+
+        entry = next(iter(cache._entries.values()))
+        cache.clear()
+        self.assertEqual(bytes(len(entry)), bytes(entry))
+
+
+class TestDecryptionCacheHandler(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_parse_skipped_on_hit(self):
+        from gemtoolsio import generate_key, encrypt_file
+
+        # Setup
+        (TEMP_DIR / 'config.toml').write_text('key1 = "value1"\n[section]\nkey2 = "value2"')
+        key = generate_key()
+        encrypt_file(TEMP_DIR / 'config.toml', key)
+        cache = DecryptionCache()
+
+        # Test
+        with patch.object(handlers, 'load_string', wraps=handlers.load_string) as load_string:
+            handler = get_file_handler(TEMP_DIR, key, decryption_cache=cache)
+            for _ in range(3):
+                result = handler({'path': 'config.toml'})
+                self.assertEqual({'key1': 'value1', 'section': {'key2': 'value2'}}, result[KEY_RESULT])
+        self.assertEqual(1, load_string.call_count)
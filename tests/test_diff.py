@@ -0,0 +1,152 @@
+import copy
+import pickle
+import unittest
+from unittest.mock import Mock, call
+
+from gemtoolsconfig.configurations import Configurations
+from gemtoolsconfig.diff import diff_configurations
+from gemtoolsconfig.frozen import freeze
+
+CONFIGURATION = {
+    'app': {'name': 'MyApp', 'version': '1.0.0'},
+    'db': {'host': 'localhost', 'pool': {'size': 10, 'timeout': 5.0}},
+    'routes': [{'path': '/'}, {'path': '/api'}],
+}
+
+
+def changed(**changes) -> dict:
+    config = copy.deepcopy(CONFIGURATION)
+    for path, value in changes.items():
+        *parents, key = path.split('__')
+        item = config
+        for parent in parents:
+            item = item[parent]
+        if value is None:
+            del item[key]
+        else:
+            item[key] = value
+    return config
+
+
+class TestDiff(unittest.TestCase):
+    def setUp(self) -> None:
+        Configurations.clear()
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+
+    def test_diff(self):
+        # Setup
+        new = changed(db__pool__size=20, db__host=None, db__port=5432, routes=[{'path': '/'}], app={'name': 'App'})
+
+        # Test
+        for old, new in ((CONFIGURATION, new), (freeze(CONFIGURATION), freeze(new))):
+            diff = diff_configurations(old, new)
+            self.assertCountEqual([('db', 'pool', 'size'), ('routes',), ('app', 'name')], diff.changed)
+            self.assertEqual([('db', 'port')], diff.added)
+            self.assertCountEqual([('db', 'host'), ('app', 'version')], diff.removed)
+            self.assertTrue(diff.affects('db'))
+            self.assertTrue(diff.affects('db.pool'))
+            self.assertTrue(diff.affects(('db', 'pool', 'size')))
+            self.assertTrue(diff.affects('routes.0.path'))
+            self.assertFalse(diff.affects('db.pool.timeout'))
+            self.assertTrue(diff.affects(None))
+
+    def test_no_changes(self):
+        # Test
+        self.assertFalse(diff_configurations(CONFIGURATION, CONFIGURATION))
+        self.assertFalse(diff_configurations(CONFIGURATION, copy.deepcopy(CONFIGURATION)))
+        self.assertFalse(diff_configurations(freeze(CONFIGURATION), freeze(CONFIGURATION)))
+        self.assertEqual([()], diff_configurations(CONFIGURATION, [1]).changed)
+        self.assertFalse(diff_configurations(1, 1.0))
+        self.assertFalse(diff_configurations(freeze(CONFIGURATION), copy.deepcopy(CONFIGURATION)))
+        self.assertFalse(diff_configurations(copy.deepcopy(CONFIGURATION), freeze(CONFIGURATION)))
+        self.assertFalse(diff_configurations(freeze([CONFIGURATION]), [CONFIGURATION]))
+
+    def test_frozen_hash(self):
+        # Setup
+        config = freeze(CONFIGURATION)
+        other = freeze(copy.deepcopy(CONFIGURATION))
+
+        # Test
+        self.assertEqual(hash(config), hash(other))
+        self.assertEqual(config, other)
+        self.assertEqual(config['db'], CONFIGURATION['db'])
+        self.assertNotEqual(config, freeze(changed(db__pool__size=20)))
+        self.assertNotEqual(config['db'], config['app'])
+        self.assertEqual(config, pickle.loads(pickle.dumps(config)))
+        self.assertIsNone(pickle.loads(pickle.dumps(config))._hash)  # NOQA
+        self.assertEqual({config: 1}[other], 1)
+        unhashable = freeze({'values': {1, 2}})
+        with self.assertRaises(TypeError):
+            hash(unhashable)
+        self.assertEqual(unhashable, freeze({'values': {1, 2}}))
+
+    def test_subscribe(self):
+        # Setup
+        pool, host, routes, root, missing = Mock(), Mock(), Mock(), Mock(), Mock()
+        Configurations.subscribe(None, 'db.pool', pool)
+        Configurations.subscribe('config', ('db', 'host'), host)
+        Configurations.subscribe('config', 'routes', routes)
+        Configurations.subscribe('config', None, root)
+        Configurations.subscribe('config', 'db.pool.missing', missing)
+        new = changed(db__pool__size=20, db__host=None)
+
+        # Test
+        Configurations.add_config(CONFIGURATION)
+        Configurations.add_config(copy.deepcopy(CONFIGURATION), allow_overwrite=True)
+        Configurations.add_config(new, allow_overwrite=True)
+        pool.assert_called_once_with('config', CONFIGURATION['db']['pool'], new['db']['pool'])
+        host.assert_called_once_with('config', 'localhost', None)
+        root.assert_called_once_with('config', CONFIGURATION, new)
+        routes.assert_not_called()
+        missing.assert_not_called()
+
+    def test_frozen_replacement(self):
+        # Setup
+        callback = Mock()
+        Configurations.subscribe('config', 'routes', callback)
+        Configurations.subscribe('config', None, callback)
+        Configurations.add_config(freeze(CONFIGURATION))
+
+        # Test
+        Configurations.add_config(copy.deepcopy(CONFIGURATION), allow_overwrite=True)
+        callback.assert_not_called()
+
+    def test_unsubscribe(self):
+        # Setup
+        callback = Mock()
+        other = Mock()
+        Configurations.subscribe('config', 'app', callback)
+        Configurations.subscribe('config', 'app', other)
+        Configurations.add_config({'app': 1})
+
+        # Test
+        Configurations.unsubscribe('config', 'app', callback)
+        Configurations.add_config({'app': 2}, allow_overwrite=True)
+        callback.assert_not_called()
+        other.assert_called_once_with('config', 1, 2)
+        with self.assertRaises(ValueError):
+            Configurations.unsubscribe('config', 'app', callback)
+        Configurations.clear()
+        Configurations.add_config({'app': 1})
+        Configurations.add_config({'app': 3}, allow_overwrite=True)
+        other.assert_called_once()
+
+    def test_failing_callback(self):
+        # Setup
+        failing = Mock(side_effect=ValueError('failure'))
+        callback = Mock()
+        Configurations.subscribe('config', 'app', failing)
+        Configurations.subscribe('config', 'app', callback)
+        Configurations.add_config({'app': 1})
+
+        # Test
+        with self.assertLogs(level='ERROR'):
+            Configurations.add_config({'app': 2}, allow_overwrite=True)
+        self.assertEqual([call('config', 1, 2)], callback.call_args_list)
+        self.assertEqual({'app': 2}, Configurations.get_config())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import asyncio
+import shutil
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gemtoolsconfig.cache import EvictionPolicy, estimate_size
+from gemtoolsconfig.configurations import Configurations
+from gemtoolsconfig.presets import preset_file_loader
+
+TEMP_DIR = Path('tmp_eviction')
+
+
+class TestEvictionPolicy(unittest.TestCase):
+    def test_max_entries(self):
+        # Setup
+        policy = EvictionPolicy(max_entries=2)
+
+        # Test
+        self.assertEqual([], policy.add('first', {}))
+        self.assertEqual([], policy.add('second', {}))
+        self.assertTrue(policy.hit('first'))
+        self.assertEqual(['second'], policy.add('third', {}))
+        self.assertIn('first', policy)
+        self.assertEqual({'hits': 1, 'misses': 3, 'evictions': 1, 'entries': 2, 'bytes': 0}, policy.statistics())
+
+    def test_max_bytes(self):
+        # Setup
+        item = {'key': 'x' * 1000}
+        policy = EvictionPolicy(max_bytes=estimate_size(item) * 2)
+
+        # Test
+        policy.add('first', item)
+        policy.add('second', item)
+        self.assertEqual(['first'], policy.add('third', item))
+        self.assertEqual(estimate_size(item) * 2, policy.statistics()['bytes'])
+        self.assertEqual(['second', 'third'], policy.add('big', {'key': 'x' * 10_000}))
+        self.assertIn('big', policy)
+
+    def test_ttl(self):
+        # Setup
+        policy = EvictionPolicy(ttl=10)
+
+        # Test
+        with patch('time.monotonic', return_value=100.0):
+            policy.add('tenant', {})
+        with patch('time.monotonic', return_value=109.0):
+            self.assertTrue(policy.hit('tenant'))
+        with patch('time.monotonic', return_value=111.0):
+            self.assertFalse(policy.hit('tenant'))
+        self.assertNotIn('tenant', policy)
+        self.assertEqual(1, policy.statistics()['evictions'])
+
+    def test_ttl_sweep(self):
+        # Setup
+        policy = EvictionPolicy(ttl=10)
+
+        # Test
+        with patch('time.monotonic', return_value=100.0):
+            policy.add('idle', {})
+            policy.add('active', {})
+        with patch('time.monotonic', return_value=105.0):
+            policy.add('active', {})
+        with patch('time.monotonic', return_value=111.0):
+            self.assertEqual(['idle'], policy.add('new', {}))
+        self.assertEqual(2, len(policy))
+
+    def test_pinned(self):
+        # Setup
+        policy = EvictionPolicy(max_entries=1, pinned=['config', 'critical'])
+
+        # Test
+        policy.add('config', {})
+        policy.add('critical', {})
+        policy.add('tenant', {})
+        self.assertEqual([], policy.add('tenant', {}))
+        self.assertTrue(policy.is_pinned('config'))
+        self.assertEqual(1, len(policy))
+
+    def test_estimate_size(self):
+        # Setup
+        shared = ['x' * 1000]
+
+        # Test
+        self.assertLess(estimate_size({'a': shared, 'b': shared}), estimate_size({'a': shared, 'b': list(shared)}))
+        self.assertGreater(estimate_size({'a': [1, 2, {'b': shared}]}), 1000)
+        self.assertGreater(estimate_size('x' * 1000), 1000)
+
+
+    def test_concurrent_hits(self):
+        # Setup
+        policy = EvictionPolicy(max_entries=8)
+        names = [f'tenant{index}' for index in range(16)]
+        errors = []
+
+        def hit():
+            try:
+                for _ in range(20):
+                    for name in names:
+                        policy.hit(name)
+            except Exception as error:  # NOQA
+                errors.append(error)
+
+        # Test
+        threads = [threading.Thread(target=hit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(20):
+            for name in names:
+                policy.add(name, {})
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertEqual(8, len(policy))
+        self.assertEqual(4 * 20 * len(names), policy.statistics()['hits'])
+
+class TestConfigurationsEviction(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        for name in ['config', 'tenant0', 'tenant1', 'tenant2']:
+            (TEMP_DIR / f'{name}.toml').write_text(f'name = "{name}"')
+        Configurations.clear()
+        Configurations.add_loader(preset_file_loader(TEMP_DIR))
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_evict_and_reload(self):
+        # Setup
+        policy = EvictionPolicy(max_entries=2)
+        Configurations.set_eviction_policy(policy)
+
+        # Test
+        Configurations.get_config()
+        for name in ['tenant0', 'tenant1', 'tenant2']:
+            Configurations.get_config(name)
+        self.assertTrue(Configurations.is_configuration_loaded('config'))
+        self.assertFalse(Configurations.is_configuration_loaded('tenant0'))
+        self.assertEqual({'name': 'tenant0'}, Configurations.get_config('tenant0'))
+        self.assertFalse(Configurations.is_configuration_loaded('tenant1'))
+        Configurations.get_config('tenant2')
+        self.assertEqual({'hits': 1, 'misses': 5, 'evictions': 2, 'entries': 2, 'bytes': 0}, policy.statistics())
+
+    def test_expired(self):
+        # Setup
+        Configurations.set_eviction_policy(EvictionPolicy(ttl=10))
+        with patch('time.monotonic', return_value=100.0):
+            first = Configurations.get_config('tenant0')
+
+        # Test
+        with patch('time.monotonic', return_value=105.0):
+            self.assertIs(first, Configurations.try_get_config('tenant0'))
+        with patch('time.monotonic', return_value=111.0):
+            self.assertIsNot(first, Configurations.get_config('tenant0'))
+            self.assertEqual(first, Configurations.get_config('tenant0'))
+
+    def test_added_configurations_are_kept(self):
+        # Setup
+        Configurations.set_eviction_policy(EvictionPolicy(max_entries=1))
+        Configurations.get_config('tenant0')
+        Configurations.add_config({'name': 'manual'}, 'tenant0', allow_overwrite=True)
+
+        # Test
+        Configurations.get_config('tenant1')
+        Configurations.get_config('tenant2')
+        self.assertEqual({'name': 'manual'}, Configurations.get_config('tenant0'))
+        self.assertFalse(Configurations.is_configuration_loaded('tenant1'))
+
+    def test_load_many_and_async(self):
+        # Setup
+        Configurations.set_eviction_policy(EvictionPolicy(max_entries=1))
+
+        # Test
+        self.assertEqual({'name': 'tenant0'}, Configurations.load_many(['tenant0', 'tenant1'])['tenant0'])
+        self.assertEqual(1, len(Configurations.eviction))
+        self.assertEqual({'name': 'tenant2'}, asyncio.run(Configurations.aget_config('tenant2')))
+        self.assertEqual(['tenant2'], [name for name in ['tenant0', 'tenant1', 'tenant2']
+                                       if Configurations.is_configuration_loaded(name)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import shutil
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gemtoolsconfig import handlers
+from gemtoolsconfig.cache import FileCache
+from gemtoolsconfig.exceptions import ArgumentError
+from gemtoolsconfig.handlers import get_file_handler, KEY_RESULT
+from gemtoolsconfig.presets import preset_file_loader
+
+TEMP_DIR = Path('tmp_file_cache')
+CACHE_DIR = TEMP_DIR / '.gemtoolscache'
+
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        (TEMP_DIR / 'config.toml').write_text('key1 = "value1"\n[section]\nkey2 = "value2"')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def _load(self, cache: FileCache):
+        with patch.object(handlers, 'load_file', wraps=handlers.load_file) as load_file:
+            handler = get_file_handler(TEMP_DIR, cache=cache)
+            result = handler({'path': 'config.toml'})
+        return result[KEY_RESULT], load_file.call_count
+
+    def test_parse_skipped_on_hit(self):
+        expected_result = {'key1': 'value1', 'section': {'key2': 'value2'}}
+
+        result, parse_count = self._load(FileCache(CACHE_DIR))
+        self.assertEqual(expected_result, result)
+        self.assertEqual(1, parse_count)
+
+        result, parse_count = self._load(FileCache(CACHE_DIR))
+        self.assertEqual(expected_result, result)
+        self.assertEqual(0, parse_count)
+
+    def test_invalidated_on_change(self):
+        cache = FileCache(CACHE_DIR)
+        self._load(cache)
+
+        # Setup
+        (TEMP_DIR / 'config.toml').write_text('key1 = "changed"')
+        stat = os.stat(TEMP_DIR / 'config.toml')
+        os.utime(TEMP_DIR / 'config.toml', ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        # Test
+        result, parse_count = self._load(cache)
+        self.assertEqual({'key1': 'changed'}, result)
+        self.assertEqual(1, parse_count)
+
+    def test_touched_file_hits_by_hash(self):
+        cache = FileCache(CACHE_DIR)
+        self._load(cache)
+
+        # Setup
+        stat = os.stat(TEMP_DIR / 'config.toml')
+        os.utime(TEMP_DIR / 'config.toml', ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        # Test
+        _, parse_count = self._load(cache)
+        self.assertEqual(0, parse_count)
+
+    def test_concurrent_writers(self):
+        # Setup
+        cache = FileCache(CACHE_DIR)
+        barrier = threading.Barrier(2, timeout=5)
+        replace = os.replace
+        errors = []
+
+        def synchronized_replace(source, destination):
+            barrier.wait()
+            replace(source, destination)
+
+        def put():
+            try:
+                cache.put(TEMP_DIR / 'config.toml', {'key1': 'value1'})
+            except Exception as error:  # NOQA
+                errors.append(error)
+
+        # Test
+        with patch('os.replace', synchronized_replace):
+            threads = [threading.Thread(target=put) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual([], errors)
+        self.assertEqual({'key1': 'value1'}, cache.get(TEMP_DIR / 'config.toml'))
+        self.assertEqual([], list(CACHE_DIR.glob('*.tmp')))
+
+    def test_invalidate(self):
+        cache = FileCache(CACHE_DIR)
+        self._load(cache)
+        cache.invalidate(TEMP_DIR / 'config.toml')
+        self.assertIsNone(cache.get(TEMP_DIR / 'config.toml'))
+
+        self._load(cache)
+        cache.invalidate()
+        self.assertEqual([], list(CACHE_DIR.iterdir()))
+
+    def test_eviction(self):
+        # Setup
+        for index in range(5):
+            (TEMP_DIR / f'config{index}.toml').write_text(f'key = "{"x" * 1000}"')
+
+        # Test
+        cache = FileCache(CACHE_DIR, max_size=2500)
+        for index in range(5):
+            path = TEMP_DIR / f'config{index}.toml'
+            cache.put(path, {'key': 'x' * 1000})
+        self.assertLessEqual(sum(entry.stat().st_size for entry in CACHE_DIR.iterdir()), 2500)
+        self.assertIsNotNone(cache.get(TEMP_DIR / 'config4.toml'))
+        self.assertIsNone(cache.get(TEMP_DIR / 'config0.toml'))
+
+    def test_encrypted_not_allowed(self):
+        with self.assertRaises(ArgumentError):
+            get_file_handler(TEMP_DIR, key=b'key', cache=FileCache(CACHE_DIR))
+
+    def test_preset_file_loader(self):
+        loader = preset_file_loader(TEMP_DIR, cache_directory=CACHE_DIR)
+        self.assertEqual({'key1': 'value1', 'section': {'key2': 'value2'}}, loader.lazy_load('config'))
+        self.assertEqual(1, len(list(CACHE_DIR.iterdir())))
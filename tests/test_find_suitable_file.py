@@ -1,6 +1,9 @@
+import os
 import shutil
+import time
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from gemtoolsconfig.handlers import _find_suitable_file
 
@@ -34,3 +37,37 @@ class TestFindSuitableFile(unittest.TestCase):
     def test_no_suitable_file(self):
         with self.assertRaises(FileNotFoundError):
             _find_suitable_file(TEMP_DIR, 'not_found')
+
+    def test_priority(self):
+        # Setup
+        for filename in ['app.yaml', 'app.json', 'app.toml', 'other.json', 'other.yml', 'other.cfg']:
+            (TEMP_DIR / filename).write_text('azerty')
+
+        # Test
+        self.assertEqual('app.toml', _find_suitable_file(TEMP_DIR, 'app'))
+        self.assertEqual('other.yml', _find_suitable_file(TEMP_DIR, 'other'))
+        self.assertEqual('other.cfg', _find_suitable_file(TEMP_DIR, 'other.cfg'))
+
+    def test_index_reused(self):
+        # Setup
+        (TEMP_DIR / 'config.toml').write_text('azerty')
+        os.utime(TEMP_DIR, (time.time() - 60, time.time() - 60))
+
+        # Test
+        with patch('os.listdir', wraps=os.listdir) as listdir:
+            _find_suitable_file(TEMP_DIR, 'config')
+            _find_suitable_file(TEMP_DIR, 'config')
+            with self.assertRaises(FileNotFoundError):
+                _find_suitable_file(TEMP_DIR, 'not_found')
+        self.assertEqual(1, listdir.call_count)
+
+    def test_index_invalidated(self):
+        # Setup
+        (TEMP_DIR / 'config.toml').write_text('azerty')
+        os.utime(TEMP_DIR, (time.time() - 60, time.time() - 60))
+        with self.assertRaises(FileNotFoundError):
+            _find_suitable_file(TEMP_DIR, 'new')
+
+        # Test
+        (TEMP_DIR / 'new.json').write_text('azerty')
+        self.assertEqual('new.json', _find_suitable_file(TEMP_DIR, 'new'))
@@ -0,0 +1,84 @@
+import pickle
+import unittest
+
+from gemtoolsconfig.frozen import FrozenConfiguration, freeze, thaw
+from gemtoolsconfig.handlers import KEY_RESULT
+from gemtoolsconfig.loader import ConfigurationLoaderBuilder
+from gemtoolsconfig.presets import preset_source_loader
+
+CONFIGURATION = {
+    'app': {'name': 'MyApp', 'version': '1.0.0'},
+    'debug': {'enabled': True, 'level': 'info', 'filters': [{'name': 'sql'}, 'http']},
+}
+
+
+class TestFrozenConfiguration(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = freeze(CONFIGURATION)
+
+    def test_mapping(self):
+        self.assertIsInstance(self.config, FrozenConfiguration)
+        self.assertEqual(CONFIGURATION, thaw(self.config))
+        self.assertEqual('MyApp', self.config['app']['name'])
+        self.assertEqual(2, len(self.config))
+        self.assertEqual(['app', 'debug'], list(self.config))
+        self.assertIn('debug', self.config)
+        self.assertEqual(({'name': 'sql'}, 'http'), self.config['debug']['filters'])
+
+    def test_equal_to_thawed(self):
+        self.assertEqual(self.config, CONFIGURATION)
+        self.assertEqual(CONFIGURATION, self.config)
+        self.assertEqual(self.config['debug'], {**CONFIGURATION['debug'], 'filters': ({'name': 'sql'}, 'http')})
+        self.assertNotEqual(self.config, {**CONFIGURATION, 'debug': {**CONFIGURATION['debug'], 'filters': ['http']}})
+        self.assertNotEqual(self.config, list(CONFIGURATION))
+
+    def test_immutable(self):
+        with self.assertRaises(TypeError):
+            self.config['app'] = {}  # NOQA
+        with self.assertRaises(TypeError):
+            self.config['app']['name'] = 'Other'  # NOQA
+        with self.assertRaises(AttributeError):
+            self.config.other = 'value'  # NOQA
+
+    def test_dotted_get(self):
+        self.assertEqual('info', self.config.get('debug.level'))
+        self.assertIs(self.config['app'], self.config.get('app'))
+        self.assertEqual('info', self.config['debug'].get('level'))
+        self.assertEqual('sql', self.config.get('debug.filters')[0].get('name'))
+        self.assertIsNone(self.config.get('debug.missing'))
+        self.assertEqual('default', self.config.get('debug.level.missing', 'default'))
+
+    def test_dotted_get_nested(self):
+        nested = freeze({'a': {'b': {'c': 1}}})['a']
+        self.assertEqual(1, nested.get('b.c'))
+        self.assertIsNone(nested.get('b.x'))
+        self.assertIsNone(nested.get('b.c.d'))
+
+    def test_interned_keys(self):
+        other = freeze({''.join(['ap', 'p']): {}})
+        self.assertIs(next(iter(self.config)), next(iter(other)))
+
+    def test_freeze_list(self):
+        self.assertEqual(({'key': 'value'},), freeze([{'key': 'value'}]))
+
+    def test_freeze_frozen(self):
+        self.assertIs(self.config, freeze(self.config))
+
+    def test_pickle(self):
+        self.assertEqual(self.config, pickle.loads(pickle.dumps(self.config)))
+
+
+class TestFrozenLoader(unittest.TestCase):
+    def test_builder(self):
+        def handler(params: dict) -> dict:
+            params[KEY_RESULT] = {'debug': {'level': 'info'}}
+            return params
+
+        loader = ConfigurationLoaderBuilder().add_loading_handler(handler).set_frozen().build()
+        result = loader.load()
+        self.assertIsInstance(result, FrozenConfiguration)
+        self.assertEqual('info', result.get('debug.level'))
+
+    def test_preset(self):
+        result = preset_source_loader(frozen=True).load(text='[debug]\nlevel = "info"', format='.toml')
+        self.assertEqual('info', result.get('debug.level'))
@@ -1,5 +1,5 @@
 import unittest
-from gemtoolsconfig.handlers import get_argument
+from gemtoolsconfig.handlers import get_argument, get_argument_getter
 from gemtoolsconfig.exceptions import ArgumentError
 
 
@@ -22,3 +22,31 @@ class TestGetArgument(unittest.TestCase):
         kwargs = {'name': 'Charlie'}
         with self.assertRaises(ArgumentError):
             get_argument(kwargs, 'name', choices=['Alice', 'Bob'])
+
+    def test_get_argument_getter(self):
+        # Test a required argument
+        getter = get_argument_getter('name')
+        self.assertEqual(getter({'name': 'Alice'}), 'Alice')
+        with self.assertRaises(ArgumentError):
+            getter({'age': 30})
+
+        # Test an argument with a default value
+        getter = get_argument_getter('name', default='Bob')
+        self.assertEqual(getter({'age': 30}), 'Bob')
+
+        # Test an argument with choices, hashable or not
+        getter = get_argument_getter('name', default='Alice', choices=['Alice', 'Bob'])
+        self.assertEqual(getter({'name': 'Bob'}), 'Bob')
+        with self.assertRaises(ArgumentError):
+            getter({'name': 'Charlie'})
+        with self.assertRaises(ArgumentError):
+            getter({'name': ['Alice']})
+        getter = get_argument_getter('name', choices=[['Alice'], 'Bob'])
+        self.assertEqual(getter({'name': ['Alice']}), ['Alice'])
+
+    def test_error_lists_keys(self):
+        # Test that the error message lists the argument names, not their values
+        with self.assertRaises(ArgumentError) as context:
+            get_argument({'password': 'secret'}, 'name')
+        self.assertNotIn('secret', str(context.exception))
+        self.assertIn('password', str(context.exception))
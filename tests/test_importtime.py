@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+TEMP_DIR = Path('tmp_importtime')
+
+IMPORT_BUDGET = 2.0
+"""
+The time budget of `import gemtoolsconfig`, in seconds. It is many times the usual import time, so only a regression
+fails it, not a slow or busy machine.
+"""
+
+QUICK_SETUP_BUDGET = 3.0
+"""
+The time budget of the import and a `quick_setup()` on a tiny configuration, in seconds.
+"""
+
+DEFERRED_MODULES = ['gemtoolsio', 'yaml', 'cryptography', 'asyncio', 'multiprocessing', 'concurrent.futures',
+                    'inspect', 'dataclasses', 'hashlib']
+"""
+The modules imported only on the first use of a feature that needs them.
+"""
+
+SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import gemtoolsconfig
+imported = time.perf_counter()
+modules = sorted(sys.modules)
+if sys.argv[1] == 'quick_setup':
+    gemtoolsconfig.quick_setup(sys.argv[2])
+print(json.dumps({'import': imported - start, 'total': time.perf_counter() - start, 'modules': modules}))
+'''
+
+
+def run_script(*arguments: str) -> dict:
+    """
+    Run the measure in a fresh interpreter, so the imports of the other tests are not reused.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    output = subprocess.run([sys.executable, '-c', SCRIPT, *arguments], env=env, check=True, capture_output=True,
+                            text=True).stdout
+    return json.loads(output)
+
+
+class TestImportTime(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        (TEMP_DIR / 'config.toml').write_text('[debug]\nenabled = true\n')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_deferred_modules(self):
+        # Setup
+        result = run_script('import')
+
+        # Test
+        self.assertEqual([], [name for name in DEFERRED_MODULES if name in result['modules']])
+
+    def test_import_budget(self):
+        # Setup
+        result = run_script('import')
+
+        # Test
+        self.assertLess(result['import'], IMPORT_BUDGET)
+
+    def test_quick_setup_budget(self):
+        # Setup
+        result = run_script('quick_setup', str(TEMP_DIR))
+
+        # Test
+        self.assertLess(result['total'], QUICK_SETUP_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import logging
+import shutil
+import unittest
+from pathlib import Path
+
+from gemtoolsconfig.handlers import get_file_handler, get_find_suitable_file_handler
+from gemtoolsconfig.instrumentation import Instrumentation, HandlerStatistics, STAGE_LAZY, STAGE_LOADING, \
+    get_logging_hook, write_prometheus
+from gemtoolsconfig.lazy import LazyConfiguration
+from gemtoolsconfig.loader import ConfigurationLoaderBuilder
+
+TEMP_DIR = Path('tmp_instrumentation')
+
+
+def failing(params: dict) -> dict:
+    raise ValueError('broken')
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        (TEMP_DIR / 'app.json').write_text('{"key": "value", "section": {"items": [1, 2]}}')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_hooks(self):
+        # Setup
+        calls = []
+        events = []
+        instrumentation = Instrumentation([lambda stage, name, params: calls.append((stage, name))], [events.append])
+        loader = (ConfigurationLoaderBuilder()
+                  .add_lazy_handler(get_find_suitable_file_handler(TEMP_DIR))
+                  .add_loading_handler(get_file_handler(TEMP_DIR))
+                  .set_instrumentation(instrumentation)
+                  .build())
+
+        # Test
+        self.assertEqual({'key': 'value', 'section': {'items': [1, 2]}}, loader.lazy_load('app'))
+        self.assertEqual([(STAGE_LAZY, 'get_find_suitable_file_handler.<locals>.handler'),
+                          (STAGE_LOADING, 'get_file_handler.<locals>.handler')], calls)
+        lazy, loading = events
+        self.assertEqual('app', lazy.config_name)
+        self.assertIsNone(lazy.bytes_read)
+        self.assertIsNone(lazy.result_size)
+        self.assertEqual((TEMP_DIR / 'app.json').stat().st_size, loading.bytes_read)
+        self.assertEqual(3, loading.result_size)
+        self.assertGreater(loading.elapsed_ns, 0)
+        self.assertIsNone(loading.error)
+
+    def test_lazy_result(self):
+        # Setup
+        events = []
+        loader = (ConfigurationLoaderBuilder()
+                  .add_lazy_handler(get_find_suitable_file_handler(TEMP_DIR))
+                  .add_loading_handler(get_file_handler(TEMP_DIR, lazy=True))
+                  .set_instrumentation(Instrumentation(post_hooks=[events.append]))
+                  .build())
+
+        # Test
+        config = loader.lazy_load('app')
+        self.assertIsInstance(config, LazyConfiguration)
+        self.assertIsNone(events[-1].result_size)
+        self.assertEqual({}, config._values)  # NOQA
+
+    def test_error(self):
+        # Setup
+        statistics = HandlerStatistics()
+        loader = ConfigurationLoaderBuilder().add_loading_handler(failing).build()
+        loader.instrumentation = Instrumentation(post_hooks=[statistics])
+
+        # Test
+        with self.assertRaises(ValueError):
+            loader.load(name='app')
+        entry = statistics.summary()[('failing', 'app')]
+        self.assertEqual(1, entry['count'])
+        self.assertEqual(1, entry['errors'])
+
+    def test_statistics(self):
+        # Setup
+        statistics = HandlerStatistics(max_samples=100)
+        loader = (ConfigurationLoaderBuilder()
+                  .add_loading_handler(get_file_handler(TEMP_DIR))
+                  .set_instrumentation(Instrumentation(post_hooks=[statistics]))
+                  .build())
+
+        # Test
+        for _ in range(150):
+            loader.load(name='app', path='app.json')
+        entry = statistics.summary()[('get_file_handler.<locals>.handler', 'app')]
+        self.assertEqual(150, entry['count'])
+        self.assertEqual(0, entry['errors'])
+        self.assertLessEqual(entry['p50_ns'], entry['p99_ns'])
+        self.assertGreaterEqual(entry['total_ns'], entry['p99_ns'])
+
+    def test_logging_hook(self):
+        # Setup
+        loader = (ConfigurationLoaderBuilder()
+                  .add_loading_handler(get_file_handler(TEMP_DIR))
+                  .set_instrumentation(Instrumentation(post_hooks=[get_logging_hook(level=logging.INFO)]))
+                  .build())
+
+        # Test
+        with self.assertLogs(level=logging.INFO) as logs:
+            loader.load(name='app', path='app.json')
+        self.assertEqual(1, len(logs.output))
+        self.assertIn('get_file_handler.<locals>.handler of configuration "app"', logs.output[0])
+
+    def test_write_prometheus(self):
+        # Setup
+        statistics = HandlerStatistics()
+        loader = (ConfigurationLoaderBuilder()
+                  .add_loading_handler(get_file_handler(TEMP_DIR))
+                  .set_instrumentation(Instrumentation(post_hooks=[statistics]))
+                  .build())
+        loader.load(name='app', path='app.json')
+
+        # Test
+        write_prometheus(statistics, TEMP_DIR / 'metrics.prom')
+        lines = (TEMP_DIR / 'metrics.prom').read_text().splitlines()
+        labels = 'handler="get_file_handler.<locals>.handler",config="app"'
+        self.assertIn('# TYPE gemtoolsconfig_handler_duration_seconds summary', lines)
+        self.assertIn(f'gemtoolsconfig_handler_duration_seconds_count{{{labels}}} 1', lines)
+        self.assertTrue(any(line.startswith(f'gemtoolsconfig_handler_duration_seconds{{{labels},quantile="0.99"}}')
+                            for line in lines))
+
+    def test_disabled(self):
+        loader = ConfigurationLoaderBuilder().add_loading_handler(get_file_handler(TEMP_DIR)).build()
+        self.assertIsNone(loader.instrumentation)
+        self.assertEqual('value', loader.load(path='app.json')['key'])
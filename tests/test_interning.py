@@ -0,0 +1,207 @@
+import asyncio
+import datetime
+import json
+import pickle
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gemtoolsconfig import interning
+from gemtoolsconfig.cache import EvictionPolicy
+from gemtoolsconfig.configurations import Configurations
+from gemtoolsconfig.frozen import FrozenConfiguration, freeze
+from gemtoolsconfig.interning import InternTable
+from gemtoolsconfig.presets import preset_file_loader
+
+TEMP_DIR = Path('tmp_interning')
+
+DEFAULTS = {'timeout': 30, 'features': ['search', 'export'], 'db': {'host': 'localhost', 'port': 5432}}
+
+
+class TestInternTable(unittest.TestCase):
+    def test_shared_sections(self):
+        # Setup
+        table = InternTable()
+        first = table.intern({'name': 'first', 'defaults': json.loads(json.dumps(DEFAULTS))})
+        second = table.intern({'name': 'second', 'defaults': json.loads(json.dumps(DEFAULTS))})
+
+        # Test
+        self.assertIsInstance(first, FrozenConfiguration)
+        self.assertEqual({'name': 'first', 'defaults': DEFAULTS}, first.thaw())
+        self.assertIs(first['defaults'], second['defaults'])
+        self.assertIsInstance(first['defaults']['features'], tuple)
+        self.assertIsNot(first, second)
+        self.assertIs(first, table.intern(first))
+
+    def test_shared_strings(self):
+        # Setup
+        table = InternTable()
+        first = table.intern({'owner': ''.join(['ad', 'min'])})
+        second = table.intern({'owner': ''.join(['ad', 'min']), 'other': True})
+
+        # Test
+        self.assertIs(first['owner'], second['owner'])
+        self.assertIs(next(iter(first)), next(iter(second)))
+
+    def test_identical_values_only(self):
+        # Setup
+        table = InternTable()
+        items = [{'value': 1}, {'value': True}, {'value': 1.0}, {'value': 0.0}, {'value': -0.0},
+                 {'value': datetime.datetime(2024, 1, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=1)))},
+                 {'value': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)}]
+        interned = [table.intern({'section': item}) for item in items]
+
+        # Test
+        for item, config in zip(items, interned):
+            with self.subTest(item=item):
+                value = config['section']['value']
+                self.assertIs(type(item['value']), type(value))
+                self.assertEqual(repr(item['value']), repr(value))
+        self.assertEqual(0, table.statistics()['hits'])
+
+    def test_frozen_input(self):
+        # Setup
+        table = InternTable()
+        first = table.intern(freeze({'defaults': DEFAULTS}))
+        second = table.intern({'defaults': DEFAULTS})
+
+        # Test
+        self.assertIs(first['defaults'], second['defaults'])
+        self.assertEqual(DEFAULTS['db'], first['defaults']['db'].thaw())
+        self.assertEqual(5432, first.get('defaults.db.port'))
+
+    def test_unhashable_values(self):
+        # Setup
+        table = InternTable()
+        first = table.intern({'tags': {'a'}, 'db': {'host': 'localhost'}})
+        second = table.intern({'tags': {'a'}, 'db': {'host': 'localhost'}})
+
+        # Test
+        self.assertEqual({'a'}, first['tags'])
+        self.assertIsNot(first, second)
+        self.assertIs(first['db'], second['db'])
+
+    def test_statistics(self):
+        # Setup
+        table = InternTable()
+        table.intern({'defaults': json.loads(json.dumps(DEFAULTS))})
+        entries = len(table)
+        table.intern({'defaults': json.loads(json.dumps(DEFAULTS))})
+
+        # Test
+        statistics = table.statistics()
+        self.assertEqual(entries, statistics['entries'])
+        self.assertGreater(statistics['hits'], 0)
+        self.assertGreater(statistics['saved_bytes'], 0)
+        table.clear()
+        self.assertEqual({'entries': 0, 'hits': 0, 'saved_bytes': 0}, table.statistics())
+
+    def test_prune(self):
+        # Setup
+        table = InternTable()
+        first = table.intern({'name': 'first', 'defaults': json.loads(json.dumps(DEFAULTS))})
+        second = table.intern({'name': 'second', 'defaults': json.loads(json.dumps(DEFAULTS))})
+        entries = len(table)
+
+        # Test
+        del first
+        self.assertGreater(table.prune(), 0)
+        self.assertLess(len(table), entries)
+        self.assertIs(second['defaults'], table.intern({'defaults': DEFAULTS})['defaults'])
+        self.assertEqual({'name': 'second', 'defaults': DEFAULTS}, second.thaw())
+
+    def test_pickle(self):
+        # Setup
+        table = InternTable()
+        config = table.intern({'first': DEFAULTS, 'second': DEFAULTS})
+
+        # Test
+        copy = pickle.loads(pickle.dumps(config))
+        self.assertEqual(config, copy)
+        self.assertIs(copy['first'], copy['second'])
+
+    def test_other_items(self):
+        # Setup
+        table = InternTable()
+        item = object()
+
+        # Test
+        self.assertIs(item, table.intern(item))
+        self.assertEqual(0, len(table))
+
+
+class TestConfigurationsInterning(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        for name in ['tenant0', 'tenant1', 'tenant2']:
+            (TEMP_DIR / f'{name}.json').write_text(json.dumps({'name': name, 'defaults': DEFAULTS}))
+        Configurations.clear()
+        Configurations.add_loader(preset_file_loader(TEMP_DIR))
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_lazy_load(self):
+        # Setup
+        table = InternTable()
+        Configurations.set_intern_table(table)
+
+        # Test
+        first = Configurations.get_config('tenant0')
+        self.assertIs(first, Configurations.get_config('tenant0'))
+        self.assertIs(first['defaults'], Configurations.get_config('tenant1')['defaults'])
+        loaded = Configurations.load_many(['tenant1', 'tenant2'])
+        self.assertIs(first['defaults'], loaded['tenant2']['defaults'])
+        self.assertIs(loaded['tenant2'], Configurations.get_config('tenant2'))
+        self.assertGreater(table.statistics()['saved_bytes'], 0)
+
+    def test_add_and_load_config(self):
+        # Setup
+        Configurations.set_intern_table(InternTable())
+
+        # Test
+        added = Configurations.add_config({'defaults': DEFAULTS}, 'manual')
+        self.assertIs(added, Configurations.get_config('manual'))
+        loaded = Configurations.load_config('tenant0', path='tenant0.json')
+        self.assertIs(loaded, Configurations.get_config('tenant0'))
+        self.assertIs(added['defaults'], loaded['defaults'])
+        config = asyncio.run(Configurations.aget_config('tenant1'))
+        self.assertIs(added['defaults'], config['defaults'])
+
+    def test_evict_and_reload(self):
+        # Setup
+        for index in range(3, 60):
+            (TEMP_DIR / f'tenant{index}.json').write_text(json.dumps({'name': f'tenant{index}', 'defaults': DEFAULTS}))
+        patcher = patch.object(interning, 'MIN_PRUNE_ENTRIES', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        table = InternTable()
+        Configurations.set_intern_table(table)
+        Configurations.set_eviction_policy(EvictionPolicy(max_entries=2))
+
+        # Test
+        sizes = []
+        for index in range(60):
+            Configurations.get_config(f'tenant{index}')
+            Configurations.add_config({'reload': f'value{index}', 'defaults': DEFAULTS}, 'reloaded',
+                                      allow_overwrite=True)
+            sizes.append(len(table))
+        self.assertLess(max(sizes[30:]), 2 * max(sizes[:5]))
+        self.assertEqual(DEFAULTS, Configurations.get_config('tenant59')['defaults'].thaw())
+
+    def test_without_table(self):
+        # Setup
+        Configurations.set_intern_table(None)
+
+        # Test
+        self.assertIsInstance(Configurations.get_config('tenant0'), dict)
+        Configurations.set_intern_table(InternTable())
+        Configurations.clear()
+        self.assertIsNone(Configurations.interning)
+
+
+if __name__ == '__main__':
+    unittest.main()
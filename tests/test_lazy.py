@@ -0,0 +1,200 @@
+import json
+import pickle
+import shutil
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from gemtoolsconfig import Configurations
+from gemtoolsconfig import backends, lazy
+from gemtoolsconfig.backends import GEMTOOLSIO_BACKENDS, register_backend
+from gemtoolsconfig.cache import FileCache
+from gemtoolsconfig.handlers import get_file_handler, KEY_RESULT
+from gemtoolsconfig.lazy import LazyConfiguration, LazyList, load_lazy
+from gemtoolsconfig.presets import preset_file_loader
+
+TEMP_DIR = Path('tmp_lazy')
+
+DOCUMENT = {
+    'name': 'é',
+    'escaped "key"': 'a \\"quoted\\" [value]',
+    'items': [1, 2.5, True, None, {'key': [[]]}, 'x'],
+    'section': {'key': 'value', 'nested': {'level': 3}, 'empty': {}},
+    'empty': [],
+}
+
+
+class TestLazy(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        (TEMP_DIR / 'config.json').write_text(json.dumps(DOCUMENT, ensure_ascii=False, indent=2), encoding='utf-8')
+        Configurations.clear()
+        patcher = patch.object(lazy, 'EAGER_SIZE', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_load_lazy(self):
+        # Setup
+        load = MagicMock()
+        config = load_lazy(TEMP_DIR / 'config.json', load)
+
+        # Test
+        load.assert_not_called()
+        self.assertIsInstance(config, LazyConfiguration)
+        self.assertEqual(DOCUMENT, config)
+        self.assertEqual(DOCUMENT, config.thaw())
+        self.assertEqual(list(DOCUMENT), list(config))
+        self.assertEqual(len(DOCUMENT), len(config))
+        self.assertIsInstance(config['items'], LazyList)
+        self.assertEqual(DOCUMENT['items'], config['items'])
+        self.assertEqual('x', config['items'][-1])
+        self.assertEqual([2.5, True], config['items'][1:3])
+
+    def test_scan_on_access(self):
+        # Setup
+        config = load_lazy(TEMP_DIR / 'config.json', MagicMock())
+
+        # Test
+        self.assertEqual('é', config['name'])
+        self.assertNotIn('items', config._offsets)  # NOQA
+        self.assertEqual(3, config.get('section.nested.level'))
+        self.assertNotIn('items', config._values)  # NOQA
+        with patch('json.loads', wraps=json.loads) as loads:
+            self.assertEqual('é', config['name'])
+            self.assertIs(config['section'], config['section'])
+        loads.assert_not_called()
+        self.assertEqual('value', config.get('section.missing', 'value'))
+        self.assertNotIn('missing', config)
+        with self.assertRaises(KeyError):
+            _ = config['missing']
+        with self.assertRaises(IndexError):
+            _ = config['items'][6]
+
+    def test_eager_size(self):
+        # Setup
+        data = {'small': [1, 2], 'large': {'small': {'level': 3}, 'padding': 'x' * 64}}
+        (TEMP_DIR / 'sizes.json').write_text(json.dumps(data))
+        config = load_lazy(TEMP_DIR / 'sizes.json', MagicMock())
+
+        # Test
+        with patch.object(lazy, 'EAGER_SIZE', 64):
+            self.assertIs(list, type(config['small']))
+            self.assertIsInstance(config['large'], LazyConfiguration)
+            self.assertIs(dict, type(config['large']['small']))
+            self.assertEqual(3, config.get('large.small.level'))
+
+    def test_other_formats(self):
+        # Setup
+        (TEMP_DIR / 'config.toml').write_text('key = "value"')
+        (TEMP_DIR / 'list.json').write_text('[1, 2]')
+        load = MagicMock(return_value={'key': 'value'})
+
+        # Test
+        self.assertEqual({'key': 'value'}, load_lazy(TEMP_DIR / 'config.toml', load))
+        self.assertEqual([1, 2], load_lazy(TEMP_DIR / 'list.json', load))
+        load.assert_called_once()
+
+    def test_invalid(self):
+        # Setup
+        (TEMP_DIR / 'invalid.json').write_text('{"valid": 1, "invalid": [1 2]}')
+        config = load_lazy(TEMP_DIR / 'invalid.json', MagicMock())
+
+        # Test
+        self.assertEqual(1, config['valid'])
+        with self.assertRaises(ValueError):
+            list(config['invalid'])
+
+    def test_malformed_keys(self):
+        # Setup
+        documents = [b'{"' + b'a' * 10_000 + b'" 1}', b'{"' + b'a\\"' * 5_000 + b'" 1}', b'{"' + b'a' * 10_000]
+
+        # Test
+        for document in documents:
+            with self.subTest(document=document[:10]):
+                (TEMP_DIR / 'malformed.json').write_bytes(document)
+                config = load_lazy(TEMP_DIR / 'malformed.json', MagicMock())
+                start = time.perf_counter()
+                with self.assertRaises(ValueError):
+                    config['a']
+                self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_pickle(self):
+        # Setup
+        config = load_lazy(TEMP_DIR / 'config.json', MagicMock())
+
+        # Test
+        copy = pickle.loads(pickle.dumps(config))
+        self.assertIs(dict, type(copy))
+        self.assertEqual(DOCUMENT, copy)
+
+    def test_selected_backend(self):
+        # Setup
+        parser = MagicMock(side_effect=json.loads)
+        load = MagicMock(return_value={'key': 'gemtoolsio'})
+
+        # Test
+        with patch.dict(backends._factories), patch.dict(backends._parsers):
+            register_backend('custom', ['.json'], lambda file_format: parser)
+            config = load_lazy(TEMP_DIR / 'config.json', MagicMock(), {'.json': 'custom'})
+            self.assertEqual(DOCUMENT, config)
+        self.assertGreater(parser.call_count, 0)
+        self.assertEqual({'key': 'gemtoolsio'}, load_lazy(TEMP_DIR / 'config.json', load, GEMTOOLSIO_BACKENDS))
+        load.assert_called_once_with(TEMP_DIR / 'config.json')
+
+    def test_file_cache(self):
+        # Setup
+        (TEMP_DIR / 'config.toml').write_text('key = "value"')
+        handler = get_file_handler(TEMP_DIR, cache=FileCache(TEMP_DIR / 'cache'), lazy=True)
+
+        # Test
+        for _ in range(2):
+            self.assertIsInstance(handler({'path': 'config.json'})[KEY_RESULT], LazyConfiguration)
+            self.assertEqual({'key': 'value'}, handler({'path': 'config.toml'})[KEY_RESULT])
+        self.assertEqual(1, len(list((TEMP_DIR / 'cache').iterdir())))
+
+    def test_threads(self):
+        # Setup
+        document = {'items': [{'i': index} for index in range(3000)], 'other': {'key': 'value'}}
+        (TEMP_DIR / 'items.json').write_text(json.dumps(document))
+        errors = []
+
+        def read(config: LazyConfiguration, offset: int):
+            try:
+                for index in range(offset, 3000, 7):
+                    if config['items'][index]['i'] != index:
+                        errors.append(index)
+                if len(config) != 2 or 'other' not in config:
+                    errors.append('keys')
+            except Exception as error:  # NOQA
+                errors.append(error)
+
+        # Test
+        for _ in range(10):
+            config = load_lazy(TEMP_DIR / 'items.json', MagicMock())
+            threads = [threading.Thread(target=read, args=(config, offset)) for offset in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(3000, len(config['items']))
+        self.assertEqual([], errors)
+
+    def test_preset(self):
+        # Setup
+        Configurations.add_loader(preset_file_loader(TEMP_DIR, lazy=True))
+
+        # Test
+        config = Configurations.get_config()
+        self.assertIsInstance(config, LazyConfiguration)
+        self.assertEqual('value', config['section']['key'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import shutil
+import threading
+import unittest
+from pathlib import Path
+
+from gemtoolsconfig.configurations import Configurations
+from gemtoolsconfig.exceptions import ArgumentError, ConfigurationBulkLoadingError
+from gemtoolsconfig.presets import preset_file_loader
+
+TEMP_DIR = Path('tmp_load_many')
+
+
+class TestLoadMany(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        self.names = [f'tenant{index}' for index in range(10)]
+        for index, name in enumerate(self.names):
+            (TEMP_DIR / f'{name}.toml').write_text(f'index = {index}')
+        Configurations.clear()
+        Configurations.add_loader(preset_file_loader(TEMP_DIR))
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_thread(self):
+        result = Configurations.load_many(self.names, workers=4)
+        self.assertEqual({name: {'index': index} for index, name in enumerate(self.names)}, result)
+        for index, name in enumerate(self.names):
+            self.assertEqual({'index': index}, Configurations.get_config(name, allow_lazy_load=False))
+
+    def test_process(self):
+        result = Configurations.load_many(self.names, workers=2, mode='process')
+        self.assertEqual({name: {'index': index} for index, name in enumerate(self.names)}, result)
+        self.assertEqual({'index': 3}, Configurations.get_config('tenant3', allow_lazy_load=False))
+
+    def test_already_loaded(self):
+        Configurations.add_config({'index': 'loaded'}, 'tenant0')
+        result = Configurations.load_many(self.names[:2])
+        self.assertEqual({'index': 'loaded'}, result['tenant0'])
+
+        result = Configurations.load_many(self.names[:2], allow_overwrite=True)
+        self.assertEqual({'index': 0}, result['tenant0'])
+
+    def test_callbacks_without_lock(self):
+        # Setup
+        def callback(config_name, old_value, new_value):
+            thread = threading.Thread(target=lambda: found.append(Configurations.get_config('tenant1')))
+            thread.start()
+            thread.join(timeout=5)
+            unblocked.append(not thread.is_alive())
+
+        found = []
+        unblocked = []
+        Configurations.add_config({'index': 'loaded'}, 'tenant0')
+        Configurations.subscribe('tenant0', 'index', callback)
+
+        # Test
+        Configurations.load_many(self.names[:1], allow_overwrite=True)
+        self.assertEqual([True], unblocked)
+        self.assertEqual([{'index': 1}], found)
+
+    def test_failures(self):
+        (TEMP_DIR / 'invalid.toml').write_text('index = ')
+        with self.assertRaises(ConfigurationBulkLoadingError) as context:
+            Configurations.load_many(self.names + ['invalid', 'missing'])
+        self.assertEqual({'invalid', 'missing'}, set(context.exception.errors))
+        self.assertIsInstance(context.exception.errors['missing'], FileNotFoundError)
+        self.assertEqual(set(self.names), set(context.exception.loaded))
+        self.assertTrue(all(Configurations.is_configuration_loaded(name) for name in self.names))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ArgumentError):
+            Configurations.load_many(self.names, mode='fiber')
@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 from gemtoolsconfig.exceptions import ConfigurationHandlerError
-from gemtoolsconfig.loader import ConfigurationLoader, KEY_RESULT
+from gemtoolsconfig.loader import ConfigurationLoader, ConfigurationLoaderBuilder, KEY_RESULT, compile_handlers
 
 
 class TestConfigurationLoader(unittest.TestCase):
@@ -44,3 +44,17 @@ class TestConfigurationLoader(unittest.TestCase):
 
         with patch.object(self.loader, 'load', MagicMock(return_value=configuration)):
             self.assertEqual(self.loader.lazy_load(name), configuration)
+
+    def test_compile_handlers(self):
+        # Test that the compiled pipeline calls the handlers in order, for any number of handlers.
+        for count in range(5):
+            handlers = [lambda params, index=index: {**params, 'calls': params['calls'] + [index]}
+                        for index in range(count)]
+            self.assertEqual(compile_handlers(handlers)({'calls': []}), {'calls': list(range(count))})
+
+    def test_builder_snapshot(self):
+        # Test that the handlers added to a builder after build() do not change the built loader.
+        builder = ConfigurationLoaderBuilder().add_loading_handler(lambda params: {**params, KEY_RESULT: {}})
+        loader = builder.build()
+        builder.add_loading_handler(lambda params: {**params, KEY_RESULT: 42})
+        self.assertEqual(loader.load(), {})
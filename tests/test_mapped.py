@@ -0,0 +1,48 @@
+import json
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from gemtoolsconfig.handlers import get_file_handler, KEY_RESULT
+from gemtoolsconfig.mapped import load_mapped
+
+TEMP_DIR = Path('tmp_mapped')
+
+DOCUMENT = {'name': 'é', 'items': [1, 2.5, True, None], 'section': {'key': 'value'}}
+
+
+class TestMapped(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        (TEMP_DIR / 'config.json').write_text(json.dumps(DOCUMENT, ensure_ascii=False), encoding='utf-8')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_load_mapped(self):
+        load = MagicMock()
+        self.assertEqual(DOCUMENT, load_mapped(TEMP_DIR / 'config.json', load))
+        self.assertEqual(DOCUMENT, load_mapped(TEMP_DIR / 'config.json', load, {'.json': 'json'}))
+        load.assert_not_called()
+
+    def test_bom(self):
+        (TEMP_DIR / 'bom.json').write_bytes(b'\xef\xbb\xbf' + json.dumps(DOCUMENT).encode())
+        self.assertEqual(DOCUMENT, load_mapped(TEMP_DIR / 'bom.json', MagicMock()))
+
+    def test_invalid(self):
+        (TEMP_DIR / 'empty.json').write_bytes(b'')
+        (TEMP_DIR / 'invalid.json').write_bytes(b'{"key": ')
+        for filename in ('empty.json', 'invalid.json'):
+            with self.assertRaises(ValueError):
+                load_mapped(TEMP_DIR / filename, MagicMock())
+
+    def test_fallback(self):
+        load = MagicMock(return_value=DOCUMENT)
+        self.assertEqual(DOCUMENT, load_mapped(TEMP_DIR / 'config.toml', load))
+        load.assert_called_once_with(TEMP_DIR / 'config.toml')
+
+    def test_file_handler(self):
+        handler = get_file_handler(TEMP_DIR, memory_map=True)
+        self.assertEqual(DOCUMENT, handler({'path': 'config.json'})[KEY_RESULT])
@@ -0,0 +1,147 @@
+import os
+import random
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gemtoolsconfig.exceptions import ArgumentError
+from gemtoolsconfig.handlers import get_file_handler, get_environ_handler, KEY_RESULT
+from gemtoolsconfig.loader import ConfigurationLoaderBuilder
+from gemtoolsconfig.merge import ConfigurationMerger, get_merge_handler
+
+TEMP_DIR = Path('tmp_merge')
+
+
+def random_tree(rng: random.Random, depth: int = 0) -> dict:
+    tree = {}
+    for key in rng.sample('abcdef', rng.randint(0, 4)):
+        kind = rng.random()
+        if kind < 0.4 and depth < 3:
+            tree[key] = random_tree(rng, depth + 1)
+        elif kind < 0.6:
+            tree[key] = [rng.randint(0, 3) for _ in range(rng.randint(0, 3))]
+        else:
+            tree[key] = rng.randint(0, 3)
+    return tree
+
+
+class TestConfigurationMerger(unittest.TestCase):
+    def test_merge(self):
+        merger = ConfigurationMerger(['base', 'env', 'host'])
+        merger.set_layer('base', {'db': {'host': 'localhost', 'pool': {'size': 5}}, 'tags': ['a']})
+        merger.set_layer('env', {'db': {'pool': {'size': 20}}, 'debug': False})
+        merger.set_layer('host', {'db': {'host': 'db.local'}, 'tags': ['b']})
+
+        self.assertEqual({'db': {'host': 'db.local', 'pool': {'size': 20}}, 'tags': ['b'], 'debug': False},
+                         merger.result)
+        self.assertEqual('host', merger.get_provenance('db.host'))
+        self.assertEqual('env', merger.get_provenance('db.pool.size'))
+        self.assertEqual('host', merger.get_provenance('tags'))
+        self.assertIsNone(merger.get_provenance('db'))
+        self.assertIsNone(merger.get_provenance('missing'))
+
+    def test_strategies(self):
+        merger = ConfigurationMerger(['base', 'env'], list_strategy='append', dict_strategy='replace')
+        merger.set_layer('base', {'db': {'host': 'localhost', 'port': 5432}, 'tags': ['a', 'b']})
+        merger.set_layer('env', {'db': {'host': 'db.local'}, 'tags': ['b', 'c']})
+        self.assertEqual({'db': {'host': 'db.local'}, 'tags': ['a', 'b', 'b', 'c']}, merger.result)
+        self.assertEqual('env', merger.get_provenance('db.host'))
+
+        merger = ConfigurationMerger(['base', 'env'], list_strategy='unique')
+        merger.set_layer('base', {'tags': ['a', 'b']})
+        merger.set_layer('env', {'tags': ['b', 'c']})
+        self.assertEqual({'tags': ['a', 'b', 'c']}, merger.result)
+
+    def test_invalid_strategy(self):
+        with self.assertRaises(ArgumentError):
+            ConfigurationMerger(['base'], list_strategy='shuffle')
+        with self.assertRaises(ArgumentError):
+            ConfigurationMerger(['base']).set_layer('unknown', {})
+
+    def test_incremental_shares_unchanged_subtrees(self):
+        merger = ConfigurationMerger(['base', 'env'])
+        merger.set_layer('base', {'db': {'host': 'localhost'}, 'cache': {'size': 1}})
+        merger.set_layer('env', {'db': {'port': 5432}})
+        previous = merger.result
+
+        merger.set_layer('env', {'db': {'port': 6543}})
+        self.assertEqual({'db': {'host': 'localhost', 'port': 6543}, 'cache': {'size': 1}}, merger.result)
+        self.assertIs(previous['cache'], merger.result['cache'])
+        self.assertEqual(5432, previous['db']['port'])
+
+    def test_incremental_matches_full_merge(self):
+        rng = random.Random(42)
+        names = ['base', 'env', 'host']
+        for strategies in [('replace', 'merge'), ('append', 'merge'), ('unique', 'replace')]:
+            merger = ConfigurationMerger(names, *strategies)
+            for _ in range(300):
+                merger.set_layer(rng.choice(names), random_tree(rng))
+                full = ConfigurationMerger(names, *strategies)
+                for name in names:
+                    if merger.get_layer(name) is not None:
+                        full.set_layer(name, merger.get_layer(name))
+                self.assertEqual(full.merge(), merger.result)
+                for path in ['a', 'a.b', 'b.c.d', 'c.a']:
+                    self.assertEqual(full.get_provenance(path), merger.get_provenance(path))
+
+
+class TestMergeHandler(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        (TEMP_DIR / 'base.toml').write_text('[db]\nhost = "localhost"\nport = 5432')
+        (TEMP_DIR / 'prod.toml').write_text('[db]\nhost = "db.prod"')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_layers(self):
+        file_handler = get_file_handler(TEMP_DIR)
+        loader = ConfigurationLoaderBuilder().add_merge_handler([
+            ('base', file_handler, {'path': 'base.toml'}),
+            ('env', file_handler, {'path': 'prod.toml'}),
+            ('environ', get_environ_handler('TEST_MERGE_'), {}),
+        ]).build()
+
+        with patch.dict(os.environ, {'TEST_MERGE_DB__PORT': '6543'}):
+            result = loader.load()
+        self.assertEqual({'db': {'host': 'db.prod', 'port': '6543'}}, result)
+        self.assertEqual('environ', loader._loading_handlers[0].get_merger().get_provenance('db.port'))
+
+    def test_separate_results(self):
+        # Setup
+        file_handler = get_file_handler(TEMP_DIR)
+        handler = get_merge_handler([
+            ('base', file_handler, {'path': 'base.toml'}),
+            ('env', file_handler, {'path': 'prod.toml'}),
+        ])
+        first = handler({})[KEY_RESULT]
+        first['db']['port'] = 99
+
+        # Test
+        second = handler({})[KEY_RESULT]
+        self.assertIsNot(first, second)
+        self.assertEqual({'db': {'host': 'db.prod', 'port': 5432}}, second)
+        (TEMP_DIR / 'prod.toml').write_text('[db]\nhost = "db.other"')
+        self.assertEqual({'db': {'host': 'db.other', 'port': 5432}}, handler({})[KEY_RESULT])
+
+    def test_mergers_by_name(self):
+        # Setup
+        def layer_handler(params: dict) -> dict:
+            params[KEY_RESULT] = {'name': params['name']}
+            return params
+
+        handler = get_merge_handler([('base', layer_handler, {})])
+        handler({'name': 'first'})
+        handler({'name': 'second'})
+
+        # Test
+        self.assertIsNot(handler.get_merger('first'), handler.get_merger('second'))
+        self.assertEqual({'name': 'first'}, handler.get_merger('first').result)
+        self.assertIsNone(handler.get_merger())
+
+    def test_environ_handler(self):
+        with patch.dict(os.environ, {'TEST_ENV_APP__NAME': 'MyApp', 'TEST_ENV_DEBUG': 'true'}):
+            result = get_environ_handler('TEST_ENV_')({})[KEY_RESULT]
+        self.assertEqual({'app': {'name': 'MyApp'}, 'debug': 'true'}, result)
@@ -0,0 +1,89 @@
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from gemtoolsconfig.cache import NegativeCache
+from gemtoolsconfig.configurations import Configurations
+from gemtoolsconfig.presets import preset_file_loader
+
+TEMP_DIR = Path('tmp_negative_cache')
+
+
+class TestNegativeCache(unittest.TestCase):
+    def test_add(self):
+        cache = NegativeCache()
+        self.assertNotIn('optional', cache)
+        cache.add('optional')
+        self.assertIn('optional', cache)
+        cache.discard('optional')
+        self.assertNotIn('optional', cache)
+
+    def test_ttl(self):
+        cache = NegativeCache(ttl=10)
+        with patch('time.monotonic', return_value=100.0):
+            cache.add('optional')
+        with patch('time.monotonic', return_value=109.0):
+            self.assertIn('optional', cache)
+        with patch('time.monotonic', return_value=111.0):
+            self.assertNotIn('optional', cache)
+
+    def test_max_entries(self):
+        cache = NegativeCache(max_entries=2)
+        for name in ['first', 'second', 'third']:
+            cache.add(name)
+        self.assertNotIn('first', cache)
+        self.assertIn('third', cache)
+        self.assertEqual(2, len(cache))
+
+    def test_generation(self):
+        generation = Mock(return_value=1)
+        cache = NegativeCache(generation=generation)
+        cache.add('optional')
+        self.assertIn('optional', cache)
+        generation.return_value = 2
+        self.assertNotIn('optional', cache)
+
+
+class TestTryGetConfig(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        (TEMP_DIR / 'config.toml').write_text('key = "value"')
+        Configurations.clear()
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_found(self):
+        Configurations.add_loader(preset_file_loader(TEMP_DIR))
+        self.assertEqual({'key': 'value'}, Configurations.try_get_config())
+
+    def test_missing_probed_once(self):
+        loader = Mock()
+        loader.lazy_load.side_effect = FileNotFoundError('optional')
+        Configurations.add_loader(loader)
+
+        with self.assertNoLogs(level='DEBUG'):
+            self.assertIsNone(Configurations.try_get_config('optional'))
+            self.assertEqual({}, Configurations.try_get_config('optional', {}))
+        self.assertEqual(1, loader.lazy_load.call_count)
+
+    def test_no_loader(self):
+        with self.assertNoLogs(level='DEBUG'):
+            self.assertEqual('default', Configurations.try_get_config('optional', 'default'))
+
+    def test_cleared_when_directory_changes(self):
+        Configurations.add_loader(preset_file_loader(TEMP_DIR))
+        self.assertIsNone(Configurations.try_get_config('optional'))
+        self.assertIn('optional', Configurations.missing)
+
+        (TEMP_DIR / 'optional.toml').write_text('key = "optional"')
+        self.assertEqual({'key': 'optional'}, Configurations.try_get_config('optional'))
+
+    def test_cleared_when_added(self):
+        Configurations.add_loader(preset_file_loader(TEMP_DIR))
+        self.assertIsNone(Configurations.try_get_config('optional'))
+        Configurations.add_config({'key': 'added'}, 'optional')
+        self.assertNotIn('optional', Configurations.missing)
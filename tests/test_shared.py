@@ -0,0 +1,184 @@
+import datetime
+import multiprocessing
+import os
+import threading
+import unittest
+from unittest.mock import Mock
+
+from gemtoolsconfig import Configurations, FrozenConfiguration, freeze
+from gemtoolsconfig.exceptions import ConfigurationLoadingError, ConfigurationNotFoundError
+from gemtoolsconfig.shared import SharedConfiguration, SharedList, SharedSegment
+
+CONFIG = {
+    'name': 'app',
+    'port': 8080,
+    'ratio': 0.5,
+    'debug': False,
+    'extra': None,
+    'servers': ['eu', 'us', {'name': 'ünicode', 'weights': [1, 2]}],
+    'database': {'host': 'localhost', 'options': {'timeout': 30}},
+    'big': 2 ** 70,
+    'date': datetime.date(2023, 1, 31),
+    'codes': {404: 'not found'},
+}
+
+
+def _read_in_child(segment_name: str, queue: multiprocessing.Queue):
+    with SharedSegment.attach(segment_name) as segment:
+        queue.put(segment.root['app'].get('database.options.timeout'))
+
+
+class TestShared(unittest.TestCase):
+    def setUp(self) -> None:
+        Configurations.clear()
+        self.segment = SharedSegment.create({'app': CONFIG, 'list': ['a', 'b']})
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+        self.segment.close()
+
+    def test_round_trip(self):
+        # Setup
+        config = self.segment.root['app']
+
+        # Test
+        self.assertIsInstance(config, SharedConfiguration)
+        self.assertEqual(CONFIG, config)
+        self.assertEqual(CONFIG, config.thaw())
+        self.assertEqual(list(CONFIG), list(config))
+        self.assertEqual(['a', 'b'], self.segment.root['list'])
+        self.assertEqual({404: 'not found'}, config['codes'])
+        self.assertEqual(2 ** 70, config['big'])
+
+    def test_lookup(self):
+        # Setup
+        config = self.segment.root['app']
+
+        # Test
+        self.assertIsInstance(config['servers'], SharedList)
+        self.assertEqual('ünicode', config['servers'][-1]['name'])
+        self.assertEqual(['eu', 'us'], config['servers'][:2])
+        self.assertIs(config['database'], config['database'])
+        self.assertEqual(30, config.get('database.options.timeout'))
+        self.assertEqual('default', config.get('database.missing', 'default'))
+        self.assertNotIn('missing', config)
+        self.assertNotIn(1, config)
+        with self.assertRaises(KeyError):
+            _ = config['missing']
+        with self.assertRaises(IndexError):
+            _ = config['servers'][3]
+
+    def test_frozen(self):
+        # Setup
+        frozen = freeze(CONFIG)
+
+        # Test
+        self.assertIsInstance(frozen, FrozenConfiguration)
+        with SharedSegment.create({'app': frozen}) as segment:
+            self.assertEqual(CONFIG, segment.root['app'].thaw())
+
+    def test_read_only(self):
+        # Setup
+        config = self.segment.root['app']
+
+        # Test
+        with self.assertRaises(TypeError):
+            config['port'] = 0  # NOQA
+        with self.assertRaises(TypeError):
+            self.segment._buffer[0] = 0  # NOQA
+
+    def test_attach(self):
+        # Setup
+        context = multiprocessing.get_context('spawn')
+        queue = context.Queue()
+        process = context.Process(target=_read_in_child, args=(self.segment.name, queue))
+
+        # Test
+        process.start()
+        self.assertEqual(30, queue.get(timeout=60))
+        process.join()
+        self.assertEqual(0, process.exitcode)
+
+    def test_attach_invalid(self):
+        # Setup
+        from multiprocessing import shared_memory
+        memory = shared_memory.SharedMemory(create=True, size=64)
+
+        # Test
+        with self.assertRaises(ConfigurationLoadingError):
+            SharedSegment.attach(memory.name)
+        memory.close()
+        memory.unlink()
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires fork')
+    def test_configurations_share(self):
+        # Setup
+        Configurations.add_config(CONFIG, 'app')
+        Configurations.add_config({'a': 1}, 'other')
+        segment = Configurations.share(['app'])
+
+        # Test
+        self.assertIs(segment, Configurations.shared)
+        self.assertIsInstance(Configurations.get_config('app'), SharedConfiguration)
+        self.assertEqual({'a': 1}, Configurations.get_config('other'))
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if Configurations.get_config('app')['port'] == 8080 else 1)  # NOQA
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(0, os.waitstatus_to_exitcode(status))
+        self.assertEqual(8080, Configurations.get_config('app')['port'])
+        with self.assertRaises(ConfigurationNotFoundError):
+            Configurations.share(['missing'])
+
+    def test_configurations_attach_shared(self):
+        # Setup
+        Configurations.add_config({'a': 1}, 'app')
+        Configurations.attach_shared(self.segment.name)
+
+        # Test
+        self.assertEqual(CONFIG, Configurations.get_config('app'))
+        self.assertEqual(['a', 'b'], Configurations.get_config('list'))
+        previous = Configurations.shared
+        Configurations.attach_shared(self.segment.name)
+        self.assertIsNot(previous, Configurations.shared)
+        self.assertEqual('app', Configurations.get_config('app')['name'])
+
+    def test_attach_shared_drops_stale_configurations(self):
+        # Setup
+        other = SharedSegment.create({'list': ['c']})
+        Configurations.attach_shared(self.segment.name)
+        Configurations.get_config('app', schema=dict[str, object])
+
+        # Test
+        try:
+            Configurations.attach_shared(other.name)
+            self.assertEqual(['list'], list(Configurations.configurations))
+            self.assertEqual({}, Configurations._bound)  # NOQA
+        finally:
+            Configurations.clear()
+            other.close()
+
+    def test_attach_shared_notifies_without_lock(self):
+        # Setup
+        def callback(config_name, old_value, new_value):
+            thread = threading.Thread(target=Configurations.add_config, args=({'key': 'value'}, 'other'))
+            thread.start()
+            thread.join(timeout=5)
+            added.append(not thread.is_alive())
+
+        added = []
+        other = Mock()
+        Configurations.add_config({'name': 'previous'}, 'app')
+        Configurations.add_config(['a', 'b'], 'list')
+        Configurations.subscribe('app', 'name', callback)
+        Configurations.subscribe('list', None, other)
+
+        # Test
+        Configurations.attach_shared(self.segment.name)
+        self.assertEqual([True], added)
+        self.assertEqual({'key': 'value'}, Configurations.get_config('other'))
+        other.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
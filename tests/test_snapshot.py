@@ -0,0 +1,96 @@
+import shutil
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from gemtoolsconfig import Configurations
+from gemtoolsconfig.__main__ import main
+from gemtoolsconfig.exceptions import ConfigurationLoadingError, ConfigurationNotFoundError
+from gemtoolsconfig.presets import preset_snapshot_loader
+from gemtoolsconfig.snapshot import SnapshotReader, compile_snapshot
+
+TEMP_DIR = Path('tmp_snapshot')
+
+CONFIG_DIR = TEMP_DIR / 'config'
+
+SNAPSHOT_PATH = TEMP_DIR / 'configurations.snapshot'
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        (CONFIG_DIR / 'app.toml').write_text('name = "app"\n[db]\nport = 5432')
+        (CONFIG_DIR / 'app.json').write_text('{"name": "ignored"}')
+        (CONFIG_DIR / 'tenants.yaml').write_text('- a\n- b')
+        (CONFIG_DIR / 'secret.key').write_text('not a configuration')
+        (CONFIG_DIR / 'nested').mkdir()
+        Configurations.clear()
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_compile_snapshot(self):
+        self.assertEqual(['app', 'tenants'], compile_snapshot(CONFIG_DIR, SNAPSHOT_PATH))
+        with SnapshotReader(SNAPSHOT_PATH) as reader:
+            self.assertEqual(['app', 'tenants'], reader.names())
+            self.assertEqual({'name': 'app', 'db': {'port': 5432}}, reader.read('app'))
+            self.assertEqual(['a', 'b'], reader.read('tenants'))
+            with self.assertRaises(ConfigurationNotFoundError):
+                reader.read('secret')
+
+    def test_reads_only_requested_entry(self):
+        compile_snapshot(CONFIG_DIR, SNAPSHOT_PATH)
+        with SnapshotReader(SNAPSHOT_PATH) as reader, patch('pickle.loads', side_effect=lambda data: data) as loads:
+            reader.read('tenants')
+        loads.assert_called_once()
+
+    def test_replaced_snapshot(self):
+        compile_snapshot(CONFIG_DIR, SNAPSHOT_PATH)
+        with SnapshotReader(SNAPSHOT_PATH) as reader:
+            self.assertEqual('app', reader.read('app')['name'])
+            (CONFIG_DIR / 'app.toml').write_text('name = "changed"')
+            (CONFIG_DIR / 'extra.ini').write_text('[section]\nkey = value')
+            compile_snapshot(CONFIG_DIR, SNAPSHOT_PATH)
+            self.assertEqual('changed', reader.read('app')['name'])
+            self.assertEqual({'section': {'key': 'value'}}, reader.read('extra'))
+
+    def test_failed_compilation(self):
+        compile_snapshot(CONFIG_DIR, SNAPSHOT_PATH)
+        (CONFIG_DIR / 'broken.json').write_text('{')
+        with self.assertRaises(ValueError):
+            compile_snapshot(CONFIG_DIR, SNAPSHOT_PATH)
+        self.assertEqual([SNAPSHOT_PATH.name], [path.name for path in TEMP_DIR.iterdir() if path.is_file()])
+        with SnapshotReader(SNAPSHOT_PATH) as reader:
+            self.assertEqual(['app', 'tenants'], reader.names())
+
+    def test_invalid_snapshot(self):
+        SNAPSHOT_PATH.write_text('name = "app"')
+        with self.assertRaises(ConfigurationLoadingError):
+            SnapshotReader(SNAPSHOT_PATH)
+
+    def test_preset_snapshot_loader(self):
+        compile_snapshot(CONFIG_DIR, SNAPSHOT_PATH)
+        Configurations.add_loader(preset_snapshot_loader(SNAPSHOT_PATH))
+        self.assertEqual(5432, Configurations.get_config('app')['db']['port'])
+        self.assertIsNone(Configurations.try_get_config('missing'))
+
+    def test_cli(self):
+        output = StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(0, main(['compile', str(CONFIG_DIR), '-o', str(SNAPSHOT_PATH)]))
+        self.assertIn('Compiled 2 configuration(s)', output.getvalue())
+        self.assertEqual(['a', 'b'], preset_snapshot_loader(SNAPSHOT_PATH).lazy_load('tenants'))
+
+    def test_encrypted(self):
+        # Setup
+        from gemtoolsio import encrypt_file, generate_key
+        key = generate_key(CONFIG_DIR / 'dummy.key')
+        encrypt_file(CONFIG_DIR / 'app.toml', key)
+
+        # Test
+        compile_snapshot(CONFIG_DIR, SNAPSHOT_PATH, CONFIG_DIR / 'dummy.key')
+        self.assertEqual('app', preset_snapshot_loader(SNAPSHOT_PATH).lazy_load('app')['name'])
@@ -0,0 +1,104 @@
+import json
+import shutil
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from gemtoolsconfig import backends
+from gemtoolsconfig.backends import GEMTOOLSIO_BACKENDS, register_backend
+from gemtoolsconfig.exceptions import ConfigurationNotFoundError
+from gemtoolsconfig.handlers import get_file_handler, KEY_RESULT
+from gemtoolsconfig.subtree import load_subtree, select_subtree, split_key_path
+
+TEMP_DIR = Path('tmp_subtree')
+
+DOCUMENT = {
+    'name': 'routes, "quoted" {and} [brackets]',
+    'empty': {},
+    'numbers': [1, -2.5e3, True, None, {'nested': ['a', 'b']}],
+    'routing': {
+        'us': {'hosts': ['us1', 'us2'], 'weight': 1},
+        'eu': {'hosts': ['eu1', 'eu\\"2'], 'weight': 2, 'name': 'é'},
+    },
+    'last': 0,
+}
+
+
+class TestSubtree(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        (TEMP_DIR / 'compact.json').write_text(json.dumps(DOCUMENT, separators=(',', ':')), encoding='utf-8')
+        (TEMP_DIR / 'indented.json').write_text(json.dumps(DOCUMENT, indent=4, ensure_ascii=False), encoding='utf-8')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_split_key_path(self):
+        self.assertEqual(('routing', 'eu'), split_key_path('routing.eu'))
+        self.assertEqual(('routing', 'eu.west'), split_key_path(['routing', 'eu.west']))
+
+    def test_json_subtree(self):
+        load = MagicMock()
+        for filename in ('compact.json', 'indented.json'):
+            for path in (['routing', 'eu'], ['routing'], ['numbers'], ['empty'], ['name'], ['last'],
+                         ['routing', 'eu', 'hosts']):
+                self.assertEqual(select_subtree(DOCUMENT, path), load_subtree(TEMP_DIR / filename, path, load))
+        load.assert_not_called()
+
+    def test_json_subtree_not_found(self):
+        for path in ('missing', 'routing.asia', 'name.key', 'routing.eu.weight.value'):
+            with self.assertRaises(ConfigurationNotFoundError):
+                load_subtree(TEMP_DIR / 'indented.json', path, MagicMock())
+
+    def test_truncated_document(self):
+        # Setup
+        documents = [b'{"key": "' + b'a' * 10_000, b'{"key": ["' + b'a\\"' * 5_000, b'{"' + b'a' * 10_000,
+                     b'{"other": {"key": "' + b'a' * 10_000]
+
+        # Test
+        for document in documents:
+            with self.subTest(document=document[:12]):
+                (TEMP_DIR / 'truncated.json').write_bytes(document)
+                start = time.perf_counter()
+                with self.assertRaises(ValueError):
+                    load_subtree(TEMP_DIR / 'truncated.json', 'key', MagicMock())
+                self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_fallback(self):
+        # Setup
+        load = MagicMock(return_value=DOCUMENT)
+
+        # Test
+        self.assertEqual(DOCUMENT['routing']['eu'], load_subtree(TEMP_DIR / 'config.yaml', 'routing.eu', load))
+        load.assert_called_once_with(TEMP_DIR / 'config.yaml')
+
+    def test_file_handler(self):
+        handler = get_file_handler(TEMP_DIR)
+        result = handler({'path': 'indented.json', 'subtree': 'routing.eu'})
+        self.assertEqual(DOCUMENT['routing']['eu'], result[KEY_RESULT])
+        result = handler({'path': 'indented.json'})
+        self.assertEqual(DOCUMENT, result[KEY_RESULT])
+
+    def test_selected_backend(self):
+        # Setup
+        parser = MagicMock(side_effect=json.loads)
+        load = MagicMock(return_value=DOCUMENT)
+
+        # Test
+        with patch.dict(backends._factories), patch.dict(backends._parsers):
+            register_backend('custom', ['.json'], lambda file_format: parser)
+            handler = get_file_handler(TEMP_DIR, backends={'.json': 'custom'})
+            result = handler({'path': 'indented.json', 'subtree': 'routing.eu'})
+            self.assertEqual(DOCUMENT['routing']['eu'], result[KEY_RESULT])
+        self.assertEqual(DOCUMENT['routing']['eu'], json.loads(parser.call_args.args[0]))
+        self.assertEqual(DOCUMENT['routing']['eu'],
+                         load_subtree(TEMP_DIR / 'indented.json', 'routing.eu', load, GEMTOOLSIO_BACKENDS))
+        load.assert_called_once_with(TEMP_DIR / 'indented.json')
+
+    def test_file_handler_fallback(self):
+        (TEMP_DIR / 'routing.toml').write_text('[routing.eu]\nweight = 2\n[routing.us]\nweight = 1\n')
+        handler = get_file_handler(TEMP_DIR)
+        result = handler({'path': 'routing.toml', 'subtree': ['routing', 'eu']})
+        self.assertEqual({'weight': 2}, result[KEY_RESULT])
@@ -0,0 +1,135 @@
+import gc
+import os
+import shutil
+import threading
+import unittest
+from pathlib import Path
+
+from gemtoolsconfig.configurations import Configurations
+from gemtoolsconfig.exceptions import ConfigurationBulkLoadingError, ConfigurationHandlerError
+from gemtoolsconfig.presets import preset_file_loader, preset_snapshot_loader, preset_source_loader
+from gemtoolsconfig.reload import ConfigurationWatcher
+from gemtoolsconfig.snapshot import compile_snapshot
+
+TEMP_DIR = Path('tmp_warmup')
+
+
+def run_in_child(function) -> int:
+    """
+    Fork, run a function in the child and return its exit code: 0 if the function returned True.
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            code = 0 if function() else 1
+        except BaseException:  # NOQA
+            code = 2
+        os._exit(code)  # NOQA
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+
+class TestWarmup(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        (TEMP_DIR / 'app.toml').write_text('name = "app"')
+        (TEMP_DIR / 'db.yaml').write_text('port: 5432')
+        (TEMP_DIR / 'secret.key').write_text('not a configuration')
+        Configurations.clear()
+        Configurations.add_loader(preset_file_loader(TEMP_DIR))
+
+    def tearDown(self) -> None:
+        gc.unfreeze()
+        Configurations.clear()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_list_names(self):
+        # Setup
+        snapshot = TEMP_DIR / 'configurations.snapshot'
+        compile_snapshot(TEMP_DIR, snapshot)
+
+        # Test
+        self.assertEqual(['app', 'db'], Configurations.get_loader().list_names())
+        self.assertEqual(['app', 'db'], preset_snapshot_loader(snapshot).list_names())
+        with self.assertRaises(ConfigurationHandlerError):
+            preset_source_loader().list_names()
+
+    def test_warmup_all(self):
+        # Test
+        self.assertEqual({'app': {'name': 'app'}, 'db': {'port': 5432}}, Configurations.warmup())
+        self.assertEqual({'port': 5432}, Configurations.get_config('db', allow_lazy_load=False))
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+    def test_warmup_names(self):
+        # Test
+        self.assertEqual({'app': {'name': 'app'}}, Configurations.warmup(['app'], freeze_gc=False))
+        self.assertFalse(Configurations.is_configuration_loaded('db'))
+        self.assertEqual(0, gc.get_freeze_count())
+        with self.assertRaises(ConfigurationBulkLoadingError):
+            Configurations.warmup(['missing'])
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires fork')
+    def test_fork_resets_locks(self):
+        # Setup
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with Configurations._lock, Configurations.missing._lock:  # NOQA
+                locked.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        locked.wait()
+
+        def child() -> bool:
+            Configurations.missing.add('missing')
+            return Configurations.get_config('app') == {'name': 'app'}
+
+        # Test
+        try:
+            self.assertEqual(0, run_in_child(child))
+        finally:
+            release.set()
+            thread.join()
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires fork')
+    def test_fork_restarts_watcher(self):
+        # Setup
+        watcher = ConfigurationWatcher(interval=0.01, watch_in_children=True)
+        watcher.watch('app')
+        parent_only = ConfigurationWatcher(interval=0.01)
+        parent_only.watch('db')
+        stopped = ConfigurationWatcher(watch_in_children=True)
+
+        def child() -> bool:
+            return (watcher._thread is not None and watcher._thread.is_alive() and  # NOQA
+                    parent_only._thread is None and stopped._thread is None)  # NOQA
+
+        # Test
+        watcher.start()
+        parent_only.start()
+        try:
+            self.assertEqual(0, run_in_child(child))
+        finally:
+            watcher.stop()
+            parent_only.stop()
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires fork')
+    def test_fork_reopens_snapshot(self):
+        # Setup
+        snapshot = TEMP_DIR / 'configurations.snapshot'
+        compile_snapshot(TEMP_DIR, snapshot)
+        loader = preset_snapshot_loader(snapshot)
+        loader.lazy_load('app')
+
+        # Test
+        self.assertEqual(0, run_in_child(lambda: loader.lazy_load('db') == {'port': 5432}))
+        self.assertEqual({'name': 'app'}, loader.lazy_load('app'))
+
+
+if __name__ == '__main__':
+    unittest.main()
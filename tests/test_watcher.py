@@ -0,0 +1,142 @@
+import os
+import shutil
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from gemtoolsconfig import handlers
+from gemtoolsconfig.configurations import Configurations
+from gemtoolsconfig.exceptions import ConfigurationHandlerError, ConfigurationNotFoundError
+from gemtoolsconfig.presets import preset_file_loader, preset_source_loader
+from gemtoolsconfig.reload import ConfigurationWatcher
+
+TEMP_DIR = Path('tmp_watcher')
+
+
+def write_config(name: str, text: str):
+    path = TEMP_DIR / name
+    previous = os.stat(path).st_mtime_ns if path.exists() else 0
+    path.write_text(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, max(stat.st_mtime_ns, previous + 1_000_000)))
+
+
+class TestConfigurationWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        write_config('config.toml', 'key = "value"')
+        write_config('other.toml', 'key = "other"')
+        Configurations.clear()
+        Configurations.add_loader(preset_file_loader(TEMP_DIR))
+
+    def tearDown(self) -> None:
+        Configurations.clear()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_watch(self):
+        watcher = ConfigurationWatcher(debounce=0)
+        self.assertEqual({'key': 'value'}, watcher.watch())
+        self.assertEqual({'key': 'value'}, Configurations.get_config(allow_lazy_load=False))
+        self.assertTrue(watcher.is_watched('config'))
+        self.assertEqual([], watcher.poll())
+
+    def test_reload_changed_only(self):
+        watcher = ConfigurationWatcher(debounce=0)
+        watcher.watch()
+        watcher.watch('other')
+        old_other = Configurations.get_config('other')
+
+        # Setup
+        write_config('config.toml', 'key = "changed"')
+
+        # Test
+        with patch.object(handlers, 'load_file', wraps=handlers.load_file) as load_file:
+            Configurations.add_loader(preset_file_loader(TEMP_DIR), allow_overwrite=True)
+            self.assertEqual(['config'], watcher.poll())
+        self.assertEqual(1, load_file.call_count)
+        self.assertEqual({'key': 'changed'}, Configurations.get_config())
+        self.assertIs(old_other, Configurations.get_config('other'))
+
+    def test_debounce(self):
+        watcher = ConfigurationWatcher(debounce=3600)
+        watcher.watch()
+        write_config('config.toml', 'key = "changed"')
+        self.assertEqual([], watcher.poll())
+        self.assertEqual({'key': 'value'}, Configurations.get_config())
+
+    def test_callbacks(self):
+        callback = Mock()
+        watcher = ConfigurationWatcher(debounce=0)
+        watcher.watch()
+        watcher.add_callback(callback)
+        write_config('config.toml', 'key = "changed"')
+        watcher.poll()
+        callback.assert_called_once_with('config', {'key': 'value'}, {'key': 'changed'})
+
+    def test_reload_without_lock(self):
+        watcher = ConfigurationWatcher(debounce=0)
+        watcher.watch()
+        watcher.watch('other')
+
+        # Setup
+        def callback(config_name, previous, item):
+            thread = threading.Thread(target=watcher.unwatch, args=('other',))
+            thread.start()
+            thread.join(timeout=5)
+            unwatched.append(not thread.is_alive())
+
+        unwatched = []
+        watcher.add_callback(callback)
+        write_config('config.toml', 'key = "changed"')
+
+        # Test
+        self.assertEqual(['config'], watcher.poll())
+        self.assertEqual([True], unwatched)
+        self.assertFalse(watcher.is_watched('other'))
+
+    def test_invalid_file_keeps_previous(self):
+        watcher = ConfigurationWatcher(debounce=0)
+        watcher.watch()
+        write_config('config.toml', 'key = ')
+        with self.assertLogs(level='ERROR'):
+            self.assertEqual([], watcher.poll())
+        self.assertEqual({'key': 'value'}, Configurations.get_config())
+
+    def test_batch_size(self):
+        watcher = ConfigurationWatcher(debounce=0, batch_size=1)
+        watcher.watch()
+        watcher.watch('other')
+        write_config('config.toml', 'key = "changed"')
+        write_config('other.toml', 'key = "changed"')
+        self.assertEqual(1, len(watcher.poll()))
+        self.assertEqual(1, len(watcher.poll()))
+
+    def test_unwatch(self):
+        watcher = ConfigurationWatcher(debounce=0)
+        watcher.watch()
+        watcher.unwatch()
+        self.assertFalse(watcher.is_watched('config'))
+        with self.assertRaises(ConfigurationNotFoundError):
+            watcher.unwatch()
+
+    def test_not_a_file(self):
+        Configurations.add_loader(preset_source_loader(), 'source')
+        watcher = ConfigurationWatcher()
+        with self.assertRaises(ConfigurationHandlerError):
+            watcher.watch('source', 'source', text='key = "value"', format='.toml')
+
+    def test_background_thread(self):
+        watcher = ConfigurationWatcher(interval=0.01, debounce=0)
+        watcher.watch()
+        watcher.start()
+        try:
+            write_config('config.toml', 'key = "changed"')
+            for _ in range(500):
+                if Configurations.get_config() == {'key': 'changed'}:
+                    break
+                watcher._stop_event.wait(0.01)
+        finally:
+            watcher.stop()
+        self.assertEqual({'key': 'changed'}, Configurations.get_config())